@@ -0,0 +1,117 @@
+"""
+Precompiled flap/no-flap lookup table for a trained network.
+
+A network's decision depends only on the four bounded, normalized inputs, so
+it can be sampled once on a dense grid over (bird_y, velocity, pipe_x, gap_y)
+and stored as one bit per cell. Inference then becomes an O(1) index lookup.
+"""
+
+import numpy as np
+import torch
+from game.vector_env import VectorFlappyBirdEnv
+
+# Normalized input ranges reachable in the game:
+# bird_y: y in [0, 570] / 600; velocity: flap -4.75 up to terminal ~+17 / 10;
+# pipe_x: x in (0, 400] / 400; gap_y: gap in [100, 350] / 600
+DEFAULT_LOW = (0.0, -0.5, 0.0, 100 / 600)
+DEFAULT_HIGH = (0.95, 1.75, 1.0, 350 / 600)
+DEFAULT_BINS = (48, 48, 32, 32)
+
+class DecisionTable:
+    """Bit-packed decision grid with the same predict() interface as NeuralNetwork"""
+    def __init__(self, bits, bins, low=DEFAULT_LOW, high=DEFAULT_HIGH):
+        self.bits = bits
+        self.bins = np.asarray(bins, dtype=np.int64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.scale = self.bins / (self.high - self.low)
+        # Row-major strides for flattening a 4D cell index
+        self.strides = np.cumprod(np.concatenate([self.bins[1:], [1]])[::-1])[::-1]
+        self.disagreement = None
+
+    @classmethod
+    def from_network(cls, network, bins=DEFAULT_BINS, low=DEFAULT_LOW, high=DEFAULT_HIGH, batch_size=1 << 18):
+        """Compile a network by evaluating it at the centre of every grid cell"""
+        bins = np.asarray(bins, dtype=np.int64)
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        axes = [low[d] + (np.arange(bins[d]) + 0.5) * (high[d] - low[d]) / bins[d] for d in range(4)]
+
+        cells = int(np.prod(bins))
+        decisions = np.empty(cells, dtype=bool)
+        with torch.no_grad():
+            for start in range(0, cells, batch_size):
+                index = np.arange(start, min(start + batch_size, cells))
+                coords = np.unravel_index(index, bins)
+                states = np.stack([axes[d][coords[d]] for d in range(4)], axis=1).astype(np.float32)
+                decisions[index] = network(torch.from_numpy(states)).numpy()[:, 0] > 0.5
+        return cls(np.packbits(decisions), bins, low, high)
+
+    def cell_index(self, states):
+        """Flat grid cell of each state in an (N, 4) array"""
+        cells = np.floor((np.asarray(states, dtype=np.float64) - self.low) * self.scale).astype(np.int64)
+        np.clip(cells, 0, self.bins - 1, out=cells)
+        return cells @ self.strides
+
+    def predict_batch(self, states):
+        """Flap decisions for an (N, 4) array of states"""
+        index = self.cell_index(states)
+        return (self.bits[index >> 3] >> (7 - (index & 7))) & 1 == 1
+
+    def predict(self, state):
+        """Return 1.0 to flap or 0.0 not to, like NeuralNetwork.predict"""
+        return 1.0 if self.predict_batch(np.asarray(state)[None])[0] else 0.0
+
+    def measure_disagreement(self, network, states):
+        """Fraction of states where the table and the exact network decide differently"""
+        states = np.asarray(states, dtype=np.float32)
+        with torch.no_grad():
+            exact = network(torch.from_numpy(states)).numpy()[:, 0] > 0.5
+        self.disagreement = float(np.mean(exact != self.predict_batch(states)))
+        return self.disagreement
+
+    def play(self, seeds, max_frames):
+        """Play one game per seed with table lookups; returns (scores, frames) arrays"""
+        env = VectorFlappyBirdEnv(len(seeds), auto_reset=False, max_episode_frames=max_frames)
+        obs = env.reset(list(seeds))
+        while not env.finished.all():
+            obs, _, _, _ = env.step(self.predict_batch(obs))
+        return env.scores.copy(), env.frames.copy()
+
+    def memory_bytes(self):
+        return self.bits.nbytes
+
+    def save(self, filepath):
+        """Save the table to a .npz file"""
+        np.savez_compressed(filepath, bits=self.bits, bins=self.bins, low=self.low, high=self.high,
+                            disagreement=np.nan if self.disagreement is None else self.disagreement)
+
+    @classmethod
+    def load(cls, filepath):
+        """Load a table saved with save()"""
+        data = np.load(filepath)
+        table = cls(data["bits"], data["bins"], data["low"], data["high"])
+        if not np.isnan(data["disagreement"]):
+            table.disagreement = float(data["disagreement"])
+        return table
+
+def trajectory_states(network, seeds=range(32), max_frames=3000):
+    """States visited when the exact network plays, for measuring disagreement where it matters"""
+    env = VectorFlappyBirdEnv(len(seeds), auto_reset=False, max_episode_frames=max_frames)
+    obs = env.reset(list(seeds))
+    visited = []
+    with torch.no_grad():
+        while not env.finished.all():
+            live = ~env.finished
+            visited.append(obs[live])
+            obs, _, _, _ = env.step(network(torch.from_numpy(obs)).numpy()[:, 0] > 0.5)
+    return np.concatenate(visited)
+
+def compile_network(network, bins=DEFAULT_BINS, seeds=range(32), max_frames=3000):
+    """
+    Compile a network into a DecisionTable and measure its disagreement rate
+    on states the network actually visits
+    """
+    table = DecisionTable.from_network(network, bins)
+    table.measure_disagreement(network, trajectory_states(network, seeds, max_frames))
+    return table
@@ -0,0 +1,92 @@
+"""
+Convergence and compute-budget criteria for stopping training runs early.
+
+A run has plateaued when neither its best nor its mean generation fitness has
+beaten the best value seen so far by more than min_delta for `patience`
+generations. Budgets cap wall-clock seconds and simulated game frames; they
+are checked after every generation, so a run overshoots by at most one.
+"""
+
+import time
+
+PLATEAU = "plateau"
+TIME_BUDGET = "time_budget"
+FRAME_BUDGET = "frame_budget"
+BUDGET_REASONS = (TIME_BUDGET, FRAME_BUDGET)
+
+class StoppingCriteria:
+    """Follow one run generation by generation and say why it should stop, if it should"""
+    def __init__(self, patience=None, min_delta=0.0, time_budget=None, frame_budget=None):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.time_budget = time_budget
+        self.frame_budget = frame_budget
+        self.start_time = time.perf_counter()
+        self.generations = 0
+        self.frames = 0
+        self.best = None
+        self.best_mean = None
+        self.since_improvement = 0
+        self.reason = None
+
+    def update(self, best, mean, frames=0):
+        """Record one generation's best and mean fitness; returns the stop reason or None"""
+        self.generations += 1
+        self.frames += frames
+        improved = False
+        if self.best is None or best > self.best + self.min_delta:
+            self.best = best
+            improved = True
+        if self.best_mean is None or mean > self.best_mean + self.min_delta:
+            self.best_mean = mean
+            improved = True
+        self.since_improvement = 0 if improved else self.since_improvement + 1
+
+        if self.patience is not None and self.since_improvement >= self.patience:
+            self.reason = PLATEAU
+        elif self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.reason = TIME_BUDGET
+        elif self.frame_budget is not None and self.frames >= self.frame_budget:
+            self.reason = FRAME_BUDGET
+        return self.reason
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    @property
+    def improving(self):
+        """Improved within the last `patience` generations (the last one without patience)"""
+        return self.generations > 0 and self.since_improvement < (self.patience or 1)
+
+    def describe(self):
+        if self.reason == PLATEAU:
+            return (f"no improvement of more than {self.min_delta} in best or mean fitness "
+                    f"for {self.patience} generations")
+        if self.reason == TIME_BUDGET:
+            return f"time budget of {self.time_budget:.0f}s used ({self.elapsed:.0f}s)"
+        if self.reason == FRAME_BUDGET:
+            return f"frame budget of {self.frame_budget} frames used ({self.frames})"
+        return "running"
+
+    def summary(self):
+        """Everything needed to explain the stop in a training log"""
+        return {
+            "reason": self.reason,
+            "patience": self.patience,
+            "min_delta": self.min_delta,
+            "time_budget": self.time_budget,
+            "frame_budget": self.frame_budget,
+            "generations": self.generations,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "frames": self.frames,
+            "best": self.best,
+            "best_mean": self.best_mean,
+            "generations_since_improvement": self.since_improvement
+        }
+
+def budget_share(total, spent, shares):
+    """Even share of what is left of a budget across `shares` runs (None for no budget)"""
+    if total is None:
+        return None
+    return max(total - spent, 0) / max(shares, 1)
@@ -1,11 +1,14 @@
+import time
 import numpy as np
 import random
 import torch
 from ai.neural_network import NeuralNetwork
+from ai.instrumentation import NULL_INSTRUMENTATION
 
 class EnhancedGeneticAlgorithm:
     def __init__(self, population_size=20, mutation_rate=0.2, elite_size=4, 
-                 mutation_strength=0.3, tournament_size=5, adaptive_mutation=True):
+                 mutation_strength=0.3, tournament_size=5, adaptive_mutation=True,
+                 instrumentation=None, surrogate=None, simulate_fraction=0.5, explore_fraction=0.2):
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.mutation_strength = mutation_strength
@@ -15,6 +18,17 @@ class EnhancedGeneticAlgorithm:
         self.population = []
         self.fitness_scores = []
         self.generation = 0
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        
+        # Optional fitness surrogate: only simulate_fraction of each generation's
+        # children (the best predicted plus a random exploration share) are played;
+        # the rest keep a pessimistic predicted fitness and are listed in skipped
+        self.surrogate = surrogate
+        self.simulate_fraction = simulate_fraction
+        self.explore_fraction = explore_fraction
+        self.predicted_fitness = []
+        self.skipped = []
+        self.screening_stats = None
         
         # Initialize population
         self.initialize_population()
@@ -101,7 +115,8 @@ class EnhancedGeneticAlgorithm:
             self.previous_best = current_best
         
         # Select parents
-        parents = self.select_parents()
+        with self.instrumentation.phase("selection"):
+            parents = self.select_parents()
         
         # Create new population
         new_population = []
@@ -111,15 +126,88 @@ class EnhancedGeneticAlgorithm:
             new_population.append(parents[i])
         
         # Create children through crossover and mutation
-        while len(new_population) < self.population_size:
-            parent1, parent2 = random.sample(parents, 2)
-            child = self.crossover(parent1, parent2)
-            self.mutate(child)
-            new_population.append(child)
+        needed = self.population_size - len(new_population)
+        with self.instrumentation.phase("crossover_mutation"):
+            children = []
+            while len(children) < needed:
+                parent1, parent2 = random.sample(parents, 2)
+                child = self.crossover(parent1, parent2)
+                self.mutate(child)
+                children.append(child)
+        
+        self.predicted_fitness = [None] * len(new_population)
+        self.skipped = []
+        self.screening_stats = None
+        if self.surrogate is not None and self.surrogate.ready:
+            with self.instrumentation.phase("surrogate_screening"):
+                predictions, skipped = self.screen_children(children)
+            self.predicted_fitness += predictions
+            self.skipped = [len(new_population) + i for i in skipped]
+        else:
+            self.predicted_fitness += [None] * len(children)
+        new_population.extend(children)
         
         self.population = new_population
         self.fitness_scores = [0] * self.population_size  # Reset fitness scores
     
+    def screen_children(self, children):
+        """
+        Pick the children worth simulating: the simulate_fraction best by surrogate
+        prediction, part of them swapped for random others so the surrogate keeps learning
+        Returns (predicted fitness of every child, indices of the children to skip)
+        """
+        start = time.perf_counter()
+        predictions = self.surrogate.predict(np.stack([child.get_flat_weights() for child in children]))
+        order = [int(i) for i in np.argsort(-predictions)]
+        simulate = min(max(1, int(round(len(children) * self.simulate_fraction))), len(children))
+        explore = min(int(round(simulate * self.explore_fraction)), len(order) - simulate)
+        chosen = order[:simulate - explore] + random.sample(order[simulate - explore:], explore)
+        skipped = sorted(set(order) - set(chosen))
+        self.screening_stats = {"children": len(children), "simulated": len(chosen),
+                                "simulations_avoided": len(skipped),
+                                "screening_ms": round((time.perf_counter() - start) * 1000, 3)}
+        return [float(p) for p in predictions], skipped
+    
+    def simulate_indices(self):
+        """Population indices that need simulating this generation (everyone but skipped children)"""
+        skipped = set(self.skipped)
+        return [i for i in range(len(self.population)) if i not in skipped]
+    
+    def merge_scores(self, simulated_scores):
+        """
+        Fitness for the whole population from the scores of simulate_indices(); skipped
+        children get their prediction capped at the worst simulated score, so an unplayed
+        genome never outranks a played one
+        """
+        scores = [None] * len(self.population)
+        for i, score in zip(self.simulate_indices(), simulated_scores):
+            scores[i] = score
+        floor = min(simulated_scores)
+        for i in self.skipped:
+            scores[i] = min(self.predicted_fitness[i], floor)
+        return scores
+    
+    def tournament_select(self):
+        """Pick one network by tournament selection on the current fitness scores"""
+        contestants = random.sample(range(len(self.population)), min(self.tournament_size, len(self.population)))
+        return self.population[max(contestants, key=lambda i: self.fitness_scores[i])]
+    
+    def breed_child(self):
+        """Create one mutated child from two tournament winners (steady-state mode)"""
+        child = self.crossover(self.tournament_select(), self.tournament_select())
+        self.mutate(child)
+        return child
+    
+    def replace_worst(self, network, fitness):
+        """
+        Put an evaluated network in place of the current worst individual (steady-state mode)
+        Returns the replaced index
+        """
+        worst = int(np.argmin(self.fitness_scores))
+        self.population[worst] = network
+        self.fitness_scores[worst] = fitness
+        return worst
+    
     def get_best_network(self):
         """Return the best network from the current population"""
         if not self.fitness_scores:
@@ -132,6 +220,41 @@ class EnhancedGeneticAlgorithm:
         """Set fitness scores for the current population"""
         self.fitness_scores = scores
 
+    def save_state(self, path, **extra):
+        """Write the population, its fitness scores and the adaptive mutation state to an .npz file"""
+        np.savez(path,
+                 population=np.stack([network.get_flat_weights() for network in self.population]),
+                 fitness_scores=np.asarray(self.fitness_scores, dtype=np.float64),
+                 mutation_rate=self.mutation_rate,
+                 mutation_strength=self.mutation_strength,
+                 generation=self.generation,
+                 stagnation_counter=getattr(self, 'stagnation_counter', 0),
+                 previous_best=getattr(self, 'previous_best', np.nan),
+                 **extra)
+
+    def load_state(self, path):
+        """
+        Restore a population written by save_state
+        Returns the extra entries that were saved alongside it
+        """
+        with np.load(path) as state:
+            state = {key: state[key] for key in state.files}
+        self.population = []
+        for weights in state.pop("population"):
+            network = NeuralNetwork()
+            network.set_flat_weights(weights)
+            self.population.append(network)
+        self.population_size = len(self.population)
+        self.fitness_scores = state.pop("fitness_scores").tolist()
+        self.mutation_rate = float(state.pop("mutation_rate"))
+        self.mutation_strength = float(state.pop("mutation_strength"))
+        self.generation = int(state.pop("generation"))
+        self.stagnation_counter = int(state.pop("stagnation_counter"))
+        previous_best = float(state.pop("previous_best"))
+        if not np.isnan(previous_best):
+            self.previous_best = previous_best
+        return state
+
 # Example usage
 if __name__ == "__main__":
     ga = EnhancedGeneticAlgorithm()
@@ -0,0 +1,249 @@
+"""
+Batched simulation + inference kernel for headless fitness evaluation.
+
+Runs whole episodes of FlappyBirdGame physics with the NeuralNetwork forward
+pass for many (genome, seed) pairs in one call. Compiled with Numba when it
+is installed, otherwise every episode is stepped together in a
+VectorFlappyBirdEnv. Both produce the same scores and frame counts as
+play_episode with the same seed, max_frames and decision_interval.
+"""
+
+import numpy as np
+from game.flappy_bird import (SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, FLAP_POWER, PIPE_SPEED, PIPE_GAP,
+                              BIRD_X, BIRD_WIDTH, BIRD_HEIGHT, PIPE_WIDTH, PIPE_SPAWN_INTERVAL,
+                              pipe_gap_sequence)
+from game.vector_env import VectorFlappyBirdEnv, _NEXT_AGE_MAX
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# Pipes live for (SCREEN_WIDTH + PIPE_WIDTH) / PIPE_SPEED frames, so at most 2
+# are on screen at once; the ring buffer leaves headroom
+PIPE_BUFFER = 4
+
+def unpack_weights(weights, input_size=4, hidden_size=16, output_size=1):
+    """
+    Split flat weight vectors (from NeuralNetwork.get_flat_weights) into per-layer arrays
+    weights: (batch, num_params); returns W1, b1, W2, b2, W3, b3 with a leading batch axis
+    """
+    weights = np.ascontiguousarray(weights, dtype=np.float32)
+    shapes = [(hidden_size, input_size), (hidden_size,),
+              (hidden_size, hidden_size), (hidden_size,),
+              (output_size, hidden_size), (output_size,)]
+    layers = []
+    offset = 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        layers.append(np.ascontiguousarray(weights[:, offset:offset + size].reshape((len(weights),) + shape)))
+        offset += size
+    if offset != weights.shape[1]:
+        raise ValueError(f"Expected {offset} parameters per genome, got {weights.shape[1]}")
+    return layers
+
+def gap_table(seeds, max_frames):
+    """Gap heights of every pipe each seed can spawn within max_frames, shape (len(seeds), pipes)"""
+    count = max_frames // PIPE_SPAWN_INTERVAL + 2
+    return np.array([pipe_gap_sequence(seed, count) for seed in seeds], dtype=np.int64)
+
+def _next_pipe(frame):
+    """Index of the pipe the bird is heading for (or touching) on a given frame"""
+    return max(0, -((_NEXT_AGE_MAX - frame) // PIPE_SPAWN_INTERVAL))
+
+def _episode_loop(W1, b1, W2, b2, W3, b3, gaps, max_frames, interval, scores, frames, final_y, final_gap, flaps):
+    """Scalar episode loop over every (genome, seed) pair; compiled by Numba when available"""
+    genomes = W1.shape[0]
+    hidden = W1.shape[1]
+    inputs = W1.shape[2]
+    seeds = gaps.shape[0]
+    pipe_x = np.zeros(PIPE_BUFFER, dtype=np.int64)
+    pipe_gap = np.zeros(PIPE_BUFFER, dtype=np.int64)
+    pipe_passed = np.zeros(PIPE_BUFFER, dtype=np.bool_)
+    state = np.zeros(inputs, dtype=np.float32)
+    h1 = np.zeros(hidden, dtype=np.float32)
+    h2 = np.zeros(hidden, dtype=np.float32)
+    one = np.float32(1.0)
+
+    for g in range(genomes):
+        for s in range(seeds):
+            y = float(SCREEN_HEIGHT // 2)
+            velocity = 0.0
+            head = 0
+            count = 1
+            pipe_x[0] = SCREEN_WIDTH
+            pipe_gap[0] = gaps[s, 0]
+            pipe_passed[0] = False
+            spawned = 1
+            timer = 0
+            score = 0
+            frame = 0
+            flap_count = 0
+
+            while frame < max_frames:
+                # The policy only decides every interval frames; in between the bird glides
+                if frame % interval == 0:
+                    # Observation: [bird_y, velocity, next pipe x, next pipe gap], normalized
+                    state[0] = np.float32(y / 600)
+                    state[1] = np.float32(velocity / 10)
+                    state[2] = np.float32(1.0)
+                    state[3] = np.float32(0.5)
+                    for k in range(count):
+                        idx = (head + k) % PIPE_BUFFER
+                        if pipe_x[idx] + PIPE_WIDTH > BIRD_X:
+                            state[2] = np.float32(pipe_x[idx] / 400)
+                            state[3] = np.float32(pipe_gap[idx] / 600)
+                            break
+
+                    # 4-16-16-1 MLP in float32, products summed before the bias like torch's addmm
+                    for j in range(hidden):
+                        acc = W1[g, j, 0] * state[0]
+                        for i in range(1, inputs):
+                            acc += W1[g, j, i] * state[i]
+                        acc += b1[g, j]
+                        h1[j] = acc if acc > 0 else np.float32(0.0)
+                    for j in range(hidden):
+                        acc = W2[g, j, 0] * h1[0]
+                        for i in range(1, hidden):
+                            acc += W2[g, j, i] * h1[i]
+                        acc += b2[g, j]
+                        h2[j] = acc if acc > 0 else np.float32(0.0)
+                    acc = W3[g, 0, 0] * h2[0]
+                    for i in range(1, hidden):
+                        acc += W3[g, 0, i] * h2[i]
+                    acc += b3[g, 0]
+                    if one / (one + np.exp(-acc)) > 0.5:
+                        velocity = float(FLAP_POWER)
+                        flap_count += 1
+
+                # Physics, in the same order as FlappyBirdGame.update
+                frame += 1
+                velocity += GRAVITY
+                y += velocity
+                if y <= 0:
+                    y = 0.0
+                    velocity = 0.0
+                if y >= SCREEN_HEIGHT - BIRD_HEIGHT:
+                    y = float(SCREEN_HEIGHT - BIRD_HEIGHT)
+                    break
+
+                for k in range(count):
+                    pipe_x[(head + k) % PIPE_BUFFER] -= PIPE_SPEED
+                while count > 0 and pipe_x[head] + PIPE_WIDTH < 0:
+                    head = (head + 1) % PIPE_BUFFER
+                    count -= 1
+
+                timer += 1
+                if timer >= PIPE_SPAWN_INTERVAL:
+                    idx = (head + count) % PIPE_BUFFER
+                    pipe_x[idx] = SCREEN_WIDTH
+                    pipe_gap[idx] = gaps[s, spawned]
+                    pipe_passed[idx] = False
+                    spawned += 1
+                    count += 1
+                    timer = 0
+
+                # Collision uses the integer rect pygame would build
+                bird_top = int(y)
+                dead = False
+                for k in range(count):
+                    idx = (head + k) % PIPE_BUFFER
+                    overlaps_x = BIRD_X < pipe_x[idx] + PIPE_WIDTH and pipe_x[idx] < BIRD_X + BIRD_WIDTH
+                    if overlaps_x and (bird_top < pipe_gap[idx] or
+                                       bird_top + BIRD_HEIGHT > pipe_gap[idx] + PIPE_GAP):
+                        dead = True
+                        break
+                    if not pipe_passed[idx] and pipe_x[idx] + PIPE_WIDTH < BIRD_X:
+                        pipe_passed[idx] = True
+                        score += 1
+                if dead:
+                    break
+
+            scores[g, s] = score
+            frames[g, s] = frame
+            final_y[g, s] = y
+            final_gap[g, s] = gaps[s, _next_pipe(frame)]
+            flaps[g, s] = flap_count
+
+if NUMBA_AVAILABLE:
+    _next_pipe = numba.njit(cache=True)(_next_pipe)
+    _episode_loop_jit = numba.njit(cache=True)(_episode_loop)
+
+def _mlp_flap(W1, b1, W2, b2, W3, b3, genome, state):
+    """Flap decisions for a batch of states, each with its own genome's weights"""
+    # Accumulated in the same order as the scalar loop so both paths agree exactly
+    h1 = W1[genome, :, 0] * state[:, 0:1]
+    for i in range(1, state.shape[1]):
+        h1 += W1[genome, :, i] * state[:, i:i + 1]
+    h1 = np.maximum(h1 + b1[genome], np.float32(0.0))
+    h2 = W2[genome, :, 0] * h1[:, 0:1]
+    for i in range(1, h1.shape[1]):
+        h2 += W2[genome, :, i] * h1[:, i:i + 1]
+    h2 = np.maximum(h2 + b2[genome], np.float32(0.0))
+    out = W3[genome, 0, 0] * h2[:, 0]
+    for i in range(1, h2.shape[1]):
+        out += W3[genome, 0, i] * h2[:, i]
+    out += b3[genome, 0]
+    with np.errstate(over="ignore"):
+        return np.float32(1.0) / (np.float32(1.0) + np.exp(-out)) > 0.5
+
+def _run_numpy(layers, seeds, max_frames, decision_interval=1):
+    """Vectorized NumPy path: steps every live episode together in a VectorFlappyBirdEnv"""
+    genomes = layers[0].shape[0]
+    genome_of = np.repeat(np.arange(genomes), len(seeds))
+    env = VectorFlappyBirdEnv(genomes * len(seeds), auto_reset=False, max_episode_frames=max_frames)
+    state = env.reset(np.tile(np.asarray(seeds, dtype=np.int64), genomes))
+    actions = np.zeros(env.num_envs, dtype=bool)
+    flaps = np.zeros(env.num_envs, dtype=np.int64)
+
+    frame = 0
+    while max_frames > 0 and not env.finished.all():
+        # Every episode started together, so live ones all reach decision frames at once
+        actions[:] = False
+        if frame % decision_interval == 0:
+            live = np.flatnonzero(~env.finished)
+            actions[live] = _mlp_flap(*layers, genome_of[live], state[live])
+            flaps += actions
+        state, _, _, _ = env.step(actions)
+        frame += 1
+
+    next_pipe = np.maximum(0, -((_NEXT_AGE_MAX - env.frames) // PIPE_SPAWN_INTERVAL))
+    gaps = gap_table(seeds, max_frames)
+    shape = (genomes, len(seeds))
+    details = {
+        "final_y": env.y.reshape(shape),
+        "final_gap": gaps[np.tile(np.arange(len(seeds)), genomes), next_pipe].reshape(shape),
+        "flaps": flaps.reshape(shape)
+    }
+    return env.scores.reshape(shape), env.frames.reshape(shape), details
+
+def run_episodes(weights, seeds, max_frames, use_numba=None, details=False, decision_interval=1):
+    """
+    Play every genome on every seed
+    decision_interval: query the network every this many frames (1 = every frame)
+    weights: (genomes, num_params) flat weight vectors, or a list of NeuralNetworks
+    Returns (scores, frames), both int arrays of shape (genomes, len(seeds)).
+    With details=True also returns a dict of per-episode end-state arrays:
+    final_y (bird height), final_gap (top of the gap it was heading for) and flaps.
+    """
+    from ai.evaluation import check_decision_interval
+    check_decision_interval(decision_interval)
+    if isinstance(weights, (list, tuple)) and weights and hasattr(weights[0], "get_flat_weights"):
+        weights = np.stack([network.get_flat_weights() for network in weights])
+    layers = unpack_weights(np.atleast_2d(weights))
+    use_numba = NUMBA_AVAILABLE if use_numba is None else use_numba
+
+    if use_numba:
+        if not NUMBA_AVAILABLE:
+            raise ImportError("numba is not installed (pip install numba)")
+        scores = np.zeros((len(layers[0]), len(seeds)), dtype=np.int64)
+        frames = np.zeros_like(scores)
+        extra = {"final_y": np.zeros(scores.shape), "final_gap": np.zeros_like(scores),
+                 "flaps": np.zeros_like(scores)}
+        _episode_loop_jit(*layers, gap_table(seeds, max_frames), max_frames, decision_interval, scores, frames,
+                          extra["final_y"], extra["final_gap"], extra["flaps"])
+    else:
+        scores, frames, extra = _run_numpy(layers, seeds, max_frames, decision_interval)
+    return (scores, frames, extra) if details else (scores, frames)
@@ -0,0 +1,211 @@
+"""
+Headless and rendered game evaluation shared by main.py and auto_train.py
+"""
+
+import time
+from game.flappy_bird import FlappyBirdGame
+from game.timestep import FixedTimestep, FrameTimeStats, RENDER_FPS
+from ai.fitness_cache import genome_hash
+
+def check_decision_interval(decision_interval):
+    """Raise ValueError unless the decision interval is a whole number of frames, at least 1"""
+    if isinstance(decision_interval, bool) or int(decision_interval) != decision_interval or decision_interval < 1:
+        raise ValueError(f"decision_interval must be a positive integer, got {decision_interval!r}")
+
+def load_policy(model_path):
+    """Load a trained model (.pth) or a compiled decision table (.npz)"""
+    # Compiled tables answer with a lookup instead of a forward pass
+    if model_path.endswith(".npz"):
+        from ai.decision_table import DecisionTable
+        return DecisionTable.load(model_path)
+    from ai.neural_network import NeuralNetwork
+    network = NeuralNetwork()
+    network.load(model_path)
+    return network
+
+def play_game_with_ai(network, render=False, seed=None, decision_interval=1):
+    """
+    Play a game using the provided neural network
+    Pass a seed to get a reproducible pipe layout
+    Returns the score achieved
+    """
+    return play_episode(network, render, seed, decision_interval=decision_interval).score
+
+def play_episode(network, render=False, seed=None, instrumentation=None, max_frames=None, on_frame=None,
+                 dirty_rects=False, decision_interval=1):
+    """
+    Play a game using the provided neural network
+    Stops after max_frames physics steps if given
+    decision_interval queries the network every k frames; the bird glides in between
+    dirty_rects repaints only changed screen regions when rendering
+    on_frame(game) is called after every physics step, e.g. to record frames
+    Returns the finished game so callers can read score and frame_count
+    """
+    check_decision_interval(decision_interval)
+    # Per-frame timing is only paid for when instrumentation is enabled
+    timed = instrumentation is not None and instrumentation.enabled
+    if timed:
+        setup_start = time.perf_counter()
+    
+    game = FlappyBirdGame(seed=seed, dirty_rects=dirty_rects)
+    
+    if timed:
+        instrumentation.add_time("game_setup", time.perf_counter() - setup_start)
+        state_time = inference_time = physics_time = 0.0
+    
+    # When rendering, physics runs on a fixed 60 Hz timestep and the display
+    # redraws interpolated positions in between
+    timestep = None
+    if render:
+        import pygame
+        game.screen = pygame.display.set_mode((400, 600))
+        clock = pygame.time.Clock()
+        timestep = FixedTimestep()
+        game.frame_stats = FrameTimeStats()
+        steps_due = timestep.advance()
+    
+    while not game.game_over and (max_frames is None or game.frame_count < max_frames):
+        if timestep is not None:
+            while steps_due == 0:
+                game.interpolation = timestep.alpha
+                with game.frame_stats.time("render"):
+                    game.draw()
+                clock.tick(RENDER_FPS)
+                
+                # Handle events for closing window
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        return game
+                steps_due = timestep.advance()
+            steps_due -= 1
+        
+        if timed:
+            frame_start = state_done = inference_done = time.perf_counter()
+        
+        # The network decides every decision_interval frames; the bird glides in between
+        if game.frame_count % decision_interval == 0:
+            # Get game state
+            bird_y = game.bird.y / 600  # Normalize
+            bird_velocity = game.bird.velocity / 10  # Normalize
+            
+            # Find the next pipe
+            next_pipe = None
+            for pipe in game.pipes:
+                if pipe.x + 50 > game.bird.x:  # Pipe width is 50
+                    next_pipe = pipe
+                    break
+            
+            if next_pipe:
+                pipe_x = next_pipe.x / 400  # Normalize
+                pipe_gap_y = next_pipe.gap_y / 600  # Normalize
+            else:
+                pipe_x = 1.0
+                pipe_gap_y = 0.5
+            
+            # Create state vector
+            state = [bird_y, bird_velocity, pipe_x, pipe_gap_y]
+            
+            if timed:
+                state_done = time.perf_counter()
+            
+            # Get AI decision
+            flap_probability = network.predict(state)
+            
+            if timed:
+                inference_done = time.perf_counter()
+            
+            # Apply action based on probability
+            if flap_probability > 0.5:
+                game.bird.flap()
+        
+        # Update game
+        if timestep is not None:
+            with game.frame_stats.time("update"):
+                game.update()
+        else:
+            game.update()
+        
+        if timed:
+            physics_done = time.perf_counter()
+            state_time += state_done - frame_start
+            inference_time += inference_done - state_done
+            physics_time += physics_done - inference_done
+        
+        if on_frame is not None:
+            on_frame(game)
+    
+    # Show the final state
+    if timestep is not None:
+        game.interpolation = 1.0
+        game.draw()
+    
+    if timed:
+        instrumentation.add_time("state_extraction", state_time)
+        instrumentation.add_time("inference", inference_time)
+        instrumentation.add_time("physics", physics_time)
+    if instrumentation is not None:
+        instrumentation.count("episodes")
+        instrumentation.count("frames", game.frame_count)
+    
+    return game
+
+def compare_decision_intervals(network, intervals=(1, 2, 3, 4, 6), seeds=range(20), max_frames=10000):
+    """
+    Score one network at several decision intervals on the same seeds
+    Returns one dict per interval with mean/min score, frames and network queries per episode
+    """
+    from ai.episode_kernel import run_episodes
+    results = []
+    for interval in intervals:
+        scores, frames = run_episodes([network], list(seeds), max_frames, decision_interval=interval)
+        results.append({
+            "decision_interval": interval,
+            "mean_score": float(scores.mean()),
+            "min_score": int(scores.min()),
+            "mean_frames": float(frames.mean()),
+            # Decisions happen on frames 0, k, 2k, ... of each episode
+            "queries_per_episode": float((-(-frames // interval)).mean())
+        })
+    return results
+
+def play_seed(network, seed, cache=None, instrumentation=None, max_frames=None, decision_interval=1):
+    """
+    Play one seeded game, reusing a cached score when available
+    Returns (score, frames simulated)
+    """
+    if cache is not None:
+        key = genome_hash(network)
+        known, _ = cache.lookup(key, [seed])
+        if known:
+            return known[seed], 0
+    
+    game = play_episode(network, seed=seed, instrumentation=instrumentation, max_frames=max_frames,
+                        decision_interval=decision_interval)
+    if cache is not None:
+        cache.store(key, {seed: game.score})
+    return game.score, game.frame_count
+
+def evaluate_network(network, seeds=None, cache=None, instrumentation=None, max_frames=None, decision_interval=1):
+    """
+    Evaluate a network on a fixed set of seeds
+    Returns the mean score; without seeds a single unseeded game is played
+    """
+    if not seeds:
+        return play_episode(network, instrumentation=instrumentation, max_frames=max_frames,
+                            decision_interval=decision_interval).score
+    
+    seed_scores = {}
+    missing = list(seeds)
+    if cache is not None:
+        key = genome_hash(network)
+        seed_scores, missing = cache.lookup(key, seeds)
+    
+    new_scores = {seed: play_episode(network, seed=seed, instrumentation=instrumentation,
+                                     max_frames=max_frames, decision_interval=decision_interval).score
+                  for seed in missing}
+    if cache is not None and new_scores:
+        cache.store(key, new_scores)
+    seed_scores.update(new_scores)
+    
+    return sum(seed_scores[seed] for seed in seeds) / len(seeds)
@@ -0,0 +1,199 @@
+"""
+OpenAI-style evolution strategies over the NeuralNetwork parameter vector.
+
+Perturbations are slices of one large pre-generated Gaussian noise table in
+shared memory, so a perturbation is fully described by its offset into the
+table. Each worker process keeps its own copy of the parameters and applies
+the same deterministic update as the master; per generation the master only
+sends noise offsets and the previous generation's (offset, weight) pairs,
+and workers only return (offset, fitness) pairs. Communication therefore
+does not grow with network size.
+"""
+
+import multiprocessing as mp
+import numpy as np
+from game.flappy_bird import SCREEN_HEIGHT, BIRD_HEIGHT, PIPE_GAP
+from ai.neural_network import NeuralNetwork
+from ai.shared_arrays import SharedArray
+from ai.episode_kernel import run_episodes
+
+DEFAULT_NOISE_SIZE = 10_000_000  # 40 MB of float32 noise
+
+class SharedNoiseTable:
+    """Read-only table of standard normal noise shared between processes"""
+    def __init__(self, size=DEFAULT_NOISE_SIZE, seed=0, spec=None):
+        if spec is None:
+            self.buffer = SharedArray.create((size,), np.float32)
+            self.buffer.array[:] = np.random.default_rng(seed).standard_normal(size, dtype=np.float32)
+        else:
+            self.buffer = SharedArray.attach(*spec)
+        self.noise = self.buffer.array
+
+    def spec(self):
+        return self.buffer.spec()
+
+    def get(self, offset, dim):
+        return self.noise[offset:offset + dim]
+
+    def sample_offsets(self, rng, dim, count):
+        return rng.integers(0, len(self.noise) - dim + 1, size=count)
+
+    def close(self):
+        self.buffer.close()
+
+def centered_ranks(values):
+    """Map fitness values to ranks scaled into [-0.5, 0.5]; tied values share their mean rank"""
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ravel()
+    ranks = np.empty(flat.size)
+    ranks[flat.argsort(kind="stable")] = np.arange(flat.size)
+    _, groups = np.unique(flat, return_inverse=True)
+    ranks = (np.bincount(groups, ranks) / np.bincount(groups))[groups]
+    return (ranks.reshape(values.shape) / max(values.size - 1, 1) - 0.5).astype(np.float32)
+
+def episode_fitness(scores, frames, details, max_frames):
+    """
+    Pipes passed, plus two shaping terms worth less than one pipe together:
+    how close to the gap centre the bird ended up and how long it survived.
+    Without them nearly every early perturbation scores 0 and ES gets no gradient.
+    """
+    gap_center = details["final_gap"] + PIPE_GAP / 2
+    bird_center = details["final_y"] + BIRD_HEIGHT / 2
+    closeness = 1 - np.abs(bird_center - gap_center) / SCREEN_HEIGHT
+    return scores + 0.5 * closeness + 0.5 * frames / (max_frames + 1)
+
+class OpenAIES:
+    """Antithetic-sampling ES update rule; identical in the master and every worker"""
+    def __init__(self, theta, noise, sigma=0.1, learning_rate=0.03, l2_coeff=0.005):
+        self.theta = np.array(theta, dtype=np.float32)
+        self.noise = noise
+        self.sigma = sigma
+        self.learning_rate = learning_rate
+        self.l2_coeff = l2_coeff
+
+    def perturbed(self, offset):
+        """Return the (+, -) antithetic parameter vectors for a noise offset"""
+        epsilon = self.sigma * self.noise.get(offset, self.theta.size)
+        return self.theta + epsilon, self.theta - epsilon
+
+    def update_weights(self, fitness_pos, fitness_neg):
+        """Per-offset gradient weights from antithetic fitness pairs"""
+        ranks = centered_ranks(np.stack([fitness_pos, fitness_neg]))
+        return ranks[0] - ranks[1]
+
+    def apply_update(self, offsets, weights):
+        """Step theta along the estimated gradient; must be deterministic"""
+        gradient = np.zeros_like(self.theta)
+        for offset, weight in zip(offsets, weights):
+            gradient += weight * self.noise.get(offset, self.theta.size)
+        gradient /= len(offsets) * self.sigma
+        self.theta += self.learning_rate * (gradient - self.l2_coeff * self.theta)
+
+def _evaluate_offsets(es, offsets, seeds, max_frames, decision_interval=1):
+    """Fitness of the + and - perturbation for each offset"""
+    weights = np.empty((2 * len(offsets), es.theta.size), dtype=np.float32)
+    for i, offset in enumerate(offsets):
+        weights[2 * i], weights[2 * i + 1] = es.perturbed(offset)
+    scores, frames, details = run_episodes(weights, seeds, max_frames, details=True,
+                                           decision_interval=decision_interval)
+    fitness = episode_fitness(scores, frames, details, max_frames).mean(axis=1)
+    return fitness[0::2], fitness[1::2]
+
+def _worker_loop(conn, noise_spec, theta, es_kwargs, seeds, max_frames, decision_interval):
+    """Worker process: keep a local theta in sync and evaluate assigned offsets"""
+    noise = SharedNoiseTable(spec=noise_spec)
+    es = OpenAIES(theta, noise, **es_kwargs)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            offsets, last_offsets, last_weights = message
+            if last_offsets is not None:
+                es.apply_update(last_offsets, last_weights)
+            conn.send(_evaluate_offsets(es, offsets, seeds, max_frames, decision_interval))
+    finally:
+        noise.close()
+        conn.close()
+
+class ParallelES:
+    """
+    Run OpenAIES across worker processes that share one noise table.
+
+    workers=0 evaluates in-process, which is handy for small runs and tests.
+    """
+    def __init__(self, pairs=50, sigma=0.1, learning_rate=0.03, l2_coeff=0.005, workers=0,
+                 seeds=(0, 1, 2), max_frames=5000, noise_size=DEFAULT_NOISE_SIZE, seed=0, theta=None,
+                 decision_interval=1):
+        self.pairs = pairs
+        self.seeds = list(seeds)
+        self.max_frames = max_frames
+        self.decision_interval = decision_interval
+        self.rng = np.random.default_rng(seed)
+        self.noise = SharedNoiseTable(noise_size, seed)
+        if theta is None:
+            theta = NeuralNetwork().get_flat_weights()
+        es_kwargs = {"sigma": sigma, "learning_rate": learning_rate, "l2_coeff": l2_coeff}
+        self.es = OpenAIES(theta, self.noise, **es_kwargs)
+        self.generation = 0
+        self.last_update = (None, None)
+
+        self.connections = []
+        self.processes = []
+        for _ in range(workers):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_worker_loop, daemon=True,
+                                 args=(child_conn, self.noise.spec(), self.es.theta, es_kwargs,
+                                       self.seeds, max_frames, decision_interval))
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def step(self):
+        """Run one generation; returns statistics for the log"""
+        offsets = self.noise.sample_offsets(self.rng, self.es.theta.size, self.pairs)
+        if self.connections:
+            chunks = np.array_split(offsets, len(self.connections))
+            last_offsets, last_weights = self.last_update
+            for conn, chunk in zip(self.connections, chunks):
+                conn.send((chunk, last_offsets, last_weights))
+            results = [conn.recv() for conn in self.connections]
+            fitness_pos = np.concatenate([pos for pos, _ in results])
+            fitness_neg = np.concatenate([neg for _, neg in results])
+        else:
+            fitness_pos, fitness_neg = _evaluate_offsets(self.es, offsets, self.seeds, self.max_frames,
+                                                         self.decision_interval)
+
+        weights = self.es.update_weights(fitness_pos, fitness_neg)
+        self.es.apply_update(offsets, weights)
+        self.last_update = (offsets, weights)
+        self.generation += 1
+
+        all_fitness = np.concatenate([fitness_pos, fitness_neg])
+        return {
+            "generation": self.generation,
+            "best_fitness": float(all_fitness.max()),
+            "mean_fitness": float(all_fitness.mean())
+        }
+
+    def evaluate_theta(self, seeds=None):
+        """Mean score of the current (unperturbed) parameters"""
+        scores, _ = run_episodes(self.es.theta[None], seeds or self.seeds, self.max_frames,
+                                 decision_interval=self.decision_interval)
+        return float(scores.mean())
+
+    def get_network(self):
+        network = NeuralNetwork()
+        network.set_flat_weights(self.es.theta)
+        return network
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        self.noise.close()
@@ -0,0 +1,71 @@
+import hashlib
+from collections import OrderedDict
+
+def genome_hash(network):
+    """Return a stable hash of a network's weight vector"""
+    return hashlib.sha1(network.get_flat_weights().tobytes()).hexdigest()
+
+class FitnessCache:
+    """
+    LRU cache of per-seed game scores keyed by genome hash.
+
+    Elites are copied unchanged into the next generation, so with seeded
+    (deterministic) evaluation their scores can be reused instead of replaying
+    the same games. Scores are stored per seed, so a genome that was seen on a
+    different seed set only has to be topped up with the missing seeds.
+    """
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key, seeds):
+        """
+        Look up cached scores for a genome
+        Returns (known scores by seed, list of seeds still to evaluate)
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += len(seeds)
+            return {}, list(seeds)
+
+        self.entries.move_to_end(key)
+        known = {}
+        missing = []
+        for seed in seeds:
+            if seed in entry:
+                known[seed] = entry[seed]
+            else:
+                missing.append(seed)
+        self.hits += len(known)
+        self.misses += len(missing)
+        return known, missing
+
+    def store(self, key, seed_scores):
+        """Record scores for a genome, evicting the least recently used genomes"""
+        entry = self.entries.setdefault(key, {})
+        entry.update(seed_scores)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Return hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        """Drop all cached scores and reset statistics"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
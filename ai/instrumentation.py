@@ -0,0 +1,260 @@
+import os
+import gc
+import sys
+import json
+import time
+import cProfile
+import linecache
+import tracemalloc
+from collections import Counter
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class _NullPhase:
+    """Context manager that does nothing, shared by every disabled phase"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.instrumentation.open_phases.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        self.instrumentation.open_phases.pop()
+        self.instrumentation.add_time(self.name, seconds)
+        return False
+
+class Instrumentation:
+    """
+    Named phase timers and counters for the training loop.
+
+    Disabled instances hand out a shared no-op context manager, so leaving the
+    hooks in place costs one attribute check per call. Counters are always
+    kept since they are bumped once per episode rather than once per frame.
+    
+    Phases opened inside another phase are recorded as "parent/child", e.g.
+    "evolve/selection". Their time is already part of the parent's, so only
+    the top-level timers (names without a slash) add up to the total.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timers = {}
+        self.counters = {}
+        self.open_phases = []
+
+    def phase(self, name):
+        """Time a block: `with instrumentation.phase("selection"): ...`"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add_time(self, name, seconds):
+        """Accumulate seconds spent in a phase, nested under the phases currently open"""
+        if self.open_phases:
+            name = "/".join(self.open_phases) + "/" + name
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        """Increment a named counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """Return timers in milliseconds (nested ones as "parent/child") plus counters"""
+        return {
+            "timers_ms": {name: round(seconds * 1000, 3) for name, seconds in self.timers.items()},
+            "counters": dict(self.counters)
+        }
+
+    def reset(self):
+        """Clear all timers and counters"""
+        self.timers = {}
+        self.counters = {}
+
+# Shared disabled instance for code that was not handed one
+NULL_INSTRUMENTATION = Instrumentation(enabled=False)
+
+class GenerationProfiler:
+    """Capture a cProfile or pyinstrument profile of one block of work"""
+    def __init__(self, kind="cprofile"):
+        if kind not in ("cprofile", "pyinstrument"):
+            raise ValueError(f"Unknown profiler: {kind}")
+        if kind == "pyinstrument" and pyinstrument is None:
+            raise ImportError("pyinstrument is not installed (pip install pyinstrument)")
+        self.kind = kind
+        self.profiler = None
+
+    def start(self):
+        if self.kind == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = pyinstrument.Profiler()
+            self.profiler.start()
+
+    def stop(self, path):
+        """Stop profiling and write the result; returns the path written"""
+        if self.kind == "cprofile":
+            self.profiler.disable()
+            path = path + ".prof"
+            self.profiler.dump_stats(path)
+        else:
+            self.profiler.stop()
+            path = path + ".html"
+            with open(path, 'w') as f:
+                f.write(self.profiler.output_html())
+        self.profiler = None
+        return path
+
+def rss_bytes():
+    """Current resident set size of this process in bytes, or None where it cannot be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _mb(num_bytes):
+    return None if num_bytes is None else round(num_bytes / 2 ** 20, 2)
+
+# Allocations made by the tracker itself (including reading source lines for
+# report tracebacks) or by the import system are noise
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+class MemoryTracker:
+    """
+    Memory footprint tracking for long training runs.
+
+    check() records RSS every generation. Every snapshot_every checks it also
+    takes a tracemalloc snapshot and lists the allocation sites that grew
+    most since the previous snapshot. When RSS first exceeds alarm_mb, a full
+    report (top sites with tracebacks, growth, live object counts by type) is
+    written to report_dir; the alarm re-arms once RSS drops back below it.
+
+    tracemalloc slows allocation-heavy code several-fold, so it only runs when
+    snapshot_every is set, and tracing starts at the first check: imports and
+    setup before it (tracing a torch import alone takes most of a minute) are
+    not traced, which also keeps snapshots small. RSS alone is nearly free.
+    One tracker can be shared by several training sessions, so checks are
+    counted across all of them.
+    """
+    def __init__(self, snapshot_every=10, top=10, alarm_mb=None, report_dir="memory_reports", trace_frames=5):
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.alarm_mb = alarm_mb
+        self.report_dir = report_dir
+        self.previous = None
+        self.alarm_active = False
+        self.trace_frames = trace_frames
+        self.reports = []
+        self.checks = 0
+        self.started_tracing = False
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+    def _growth(self, snapshot, limit):
+        """Allocation sites that grew most since the previous snapshot"""
+        if self.previous is None:
+            return []
+        diffs = [diff for diff in snapshot.compare_to(self.previous, "lineno") if diff.size_diff > 0]
+        return [{
+            "site": str(diff.traceback[0]),
+            "size_kb": round(diff.size / 1024, 1),
+            "size_diff_kb": round(diff.size_diff / 1024, 1),
+            "count_diff": diff.count_diff
+        } for diff in diffs[:limit]]
+
+    def check(self, generation):
+        """Record memory for one generation; returns a dict for the generation log"""
+        self.checks += 1
+        if self.snapshot_every and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self.started_tracing = True
+        rss = rss_bytes()
+        entry = {"rss_mb": _mb(rss), "peak_rss_mb": _mb(peak_rss_bytes())}
+        snapshot = None
+        if tracemalloc.is_tracing():
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            entry["traced_mb"] = _mb(traced)
+            entry["traced_peak_mb"] = _mb(traced_peak)
+            if self.snapshot_every and self.checks % self.snapshot_every == 0:
+                snapshot = self._snapshot()
+                entry["top_growth"] = self._growth(snapshot, self.top)
+
+        over = self.alarm_mb is not None and rss is not None and rss > self.alarm_mb * 2 ** 20
+        if over and not self.alarm_active:
+            if snapshot is None and tracemalloc.is_tracing():
+                snapshot = self._snapshot()
+            entry["alarm"] = self.write_report(generation, entry, snapshot)
+        self.alarm_active = over
+
+        if snapshot is not None:
+            self.previous = snapshot
+        return entry
+
+    def write_report(self, generation, entry, snapshot=None):
+        """Dump everything known about memory use to a JSON file; returns its path"""
+        report = {"generation": generation, "check": self.checks, "time": time.time(), "alarm_mb": self.alarm_mb}
+        report.update({key: value for key, value in entry.items() if key != "top_growth"})
+        if snapshot is not None:
+            report["top_sites"] = [{
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+                "traceback": stat.traceback.format(most_recent_first=True)
+            } for stat in snapshot.statistics("traceback")[:self.top]]
+            report["top_growth"] = self._growth(snapshot, 3 * self.top)
+        # Object counts show accumulating networks, games or surfaces even without tracemalloc
+        report["live_objects"] = dict(Counter(type(obj).__name__ for obj in gc.get_objects()).most_common(25))
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(self.report_dir, f"memory_report_{self.checks}_gen_{generation}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.reports.append(path)
+        return path
+
+    def stop(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.previous = None
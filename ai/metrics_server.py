@@ -0,0 +1,86 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRIC_PREFIX = "flappy_"
+
+# name: (type, help text)
+METRICS = {
+    "generation": ("gauge", "Current generation number"),
+    "best_fitness": ("gauge", "Best fitness in the last evaluated generation"),
+    "best_fitness_overall": ("gauge", "Best fitness seen so far in this run"),
+    "mean_fitness": ("gauge", "Mean fitness in the last evaluated generation"),
+    "frames_per_second": ("gauge", "Simulated frames per second during the last generation's evaluation"),
+    "frames_total": ("counter", "Frames simulated since the run started"),
+    "evaluation_queue_depth": ("gauge", "Networks still waiting to be evaluated this generation "
+                                        "(batched and parallel evaluation lower it per chunk or per worker)"),
+    "mutation_rate": ("gauge", "Current adaptive mutation rate"),
+    "mutation_strength": ("gauge", "Current adaptive mutation strength"),
+    "stagnation_counter": ("gauge", "Generations without improvement in best fitness"),
+}
+
+class MetricsServer:
+    """
+    Serve live training metrics in Prometheus text format from a background thread.
+
+    The training loop only assigns into a dict; rendering happens on the
+    server thread when a scrape arrives, so the hot loop pays nothing extra.
+    """
+    def __init__(self, port=9100, host="127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.values = {}
+        self.server = None
+        self.thread = None
+
+    def set(self, name, value):
+        """Set a metric value"""
+        self.values[name] = value
+
+    def update(self, **values):
+        """Set several metric values at once"""
+        self.values.update(values)
+
+    def render(self):
+        """Return all known metrics in Prometheus text exposition format"""
+        values = dict(self.values)
+        lines = []
+        for name, value in values.items():
+            metric_type, help_text = METRICS.get(name, ("gauge", name))
+            full_name = METRIC_PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            lines.append(f"{full_name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Start serving /metrics; returns the bound port"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the training output
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        """Stop the server thread"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.thread = None
@@ -27,7 +27,18 @@ class NeuralNetwork(nn.Module):
             state_tensor = torch.FloatTensor(state).unsqueeze(0)
             output = self.network(state_tensor)
             return output.item()
-    
+
+    def get_flat_weights(self):
+        """Return all parameters concatenated into a single float32 numpy vector"""
+        with torch.no_grad():
+            return torch.nn.utils.parameters_to_vector(self.parameters()).numpy().copy()
+
+    def set_flat_weights(self, weights):
+        """Load parameters from a flat vector produced by get_flat_weights"""
+        with torch.no_grad():
+            vector = torch.as_tensor(np.asarray(weights, dtype=np.float32))
+            torch.nn.utils.vector_to_parameters(vector, self.parameters())
+
     def save(self, filepath):
         """Save the model to a file"""
         torch.save(self.state_dict(), filepath)
@@ -0,0 +1,139 @@
+"""
+Novelty search archive over behavior descriptors.
+
+A genome's behavior is summarized by where it died (how far it got and at
+what height) and how often it flapped, each normalized to [0, 1]. Novelty
+is the mean distance to the k nearest descriptors in an archive that grows
+every generation.
+
+The archive is indexed by a uniform grid: inserting is O(1) and a k-NN
+query only visits the cells around the query, expanding ring by ring until
+no unvisited cell can hold a closer point. Each cell stores at most
+cell_capacity points; behaviors that common already have near-zero
+novelty, so dropping further copies changes nothing but keeps every query
+bounded as the archive grows to hundreds of thousands of entries.
+"""
+
+import numpy as np
+from game.flappy_bird import SCREEN_HEIGHT, BIRD_HEIGHT
+
+DESCRIPTOR_NAMES = ("progress", "death_height", "flap_rate")
+
+def behavior_descriptors(frames, details, max_frames):
+    """
+    (genomes, 3) descriptors from run_episodes(..., details=True) output, averaged over seeds:
+    fraction of max_frames survived, height at death, and flaps per frame
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    progress = frames / max_frames
+    height = details["final_y"] / (SCREEN_HEIGHT - BIRD_HEIGHT)
+    flap_rate = details["flaps"] / np.maximum(frames, 1)
+    return np.stack([progress, height, flap_rate], axis=-1).mean(axis=1)
+
+class GridIndex:
+    """Incremental uniform-grid nearest-neighbor index over points in [0, 1]^dims"""
+    def __init__(self, dims, cell_size=0.05, cell_capacity=64):
+        self.dims = dims
+        self.cell_size = cell_size
+        self.bins = int(np.ceil(1 / cell_size))
+        self.cell_capacity = cell_capacity
+        self.points = np.empty((1024, dims))
+        self.size = 0
+        self.dropped = 0
+        self.cells = {}
+
+    def __len__(self):
+        return self.size
+
+    def _cell(self, point):
+        return tuple(np.clip((point / self.cell_size).astype(int), 0, self.bins - 1))
+
+    def add(self, point):
+        """Insert one point; returns False if its cell is already full"""
+        point = np.asarray(point, dtype=np.float64)
+        members = self.cells.setdefault(self._cell(point), [])
+        if len(members) >= self.cell_capacity:
+            self.dropped += 1
+            return False
+        if self.size == len(self.points):
+            self.points = np.concatenate([self.points, np.empty_like(self.points)])
+        self.points[self.size] = point
+        members.append(self.size)
+        self.size += 1
+        return True
+
+    def _ring(self, center, radius):
+        """Occupied cells at Chebyshev distance exactly `radius` from center"""
+        if radius == 0:
+            return [center] if center in self.cells else []
+        ring = []
+        for cell in self.cells:
+            if max(abs(c - o) for c, o in zip(cell, center)) == radius:
+                ring.append(cell)
+        return ring
+
+    def _ring_offsets(self, center, radius):
+        """Cells of a ring, enumerated directly while that is cheaper than scanning occupied cells"""
+        span = range(-radius, radius + 1)
+        offsets = np.array(np.meshgrid(*[span] * self.dims, indexing="ij")).reshape(self.dims, -1).T
+        offsets = offsets[np.abs(offsets).max(axis=1) == radius]
+        cells = offsets + np.array(center)
+        cells = cells[((cells >= 0) & (cells < self.bins)).all(axis=1)]
+        return [cell for cell in map(tuple, cells) if cell in self.cells]
+
+    def knn_distances(self, point, k):
+        """Distances to the k nearest indexed points (fewer if the index is smaller), ascending"""
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, self.size)
+        if k == 0:
+            return np.empty(0)
+        center = self._cell(point)
+        best = np.empty(0)
+        for radius in range(self.bins):
+            # Enumerating (2r+1)^d cells gets expensive for big rings; scan occupied cells instead
+            if (2 * radius + 1) ** self.dims <= 4 * len(self.cells):
+                cells = self._ring_offsets(center, radius)
+            else:
+                cells = self._ring(center, radius)
+            if cells:
+                members = np.concatenate([self.cells[cell] for cell in cells])
+                distances = np.linalg.norm(self.points[members] - point, axis=1)
+                best = np.concatenate([best, distances])
+                if len(best) > k:
+                    best = np.partition(best, k - 1)[:k]
+            # Anything outside the rings searched so far is at least radius cells away
+            if len(best) >= k and best.max() <= radius * self.cell_size:
+                break
+        return np.sort(best)
+
+class NoveltyArchive:
+    """Growing archive of behavior descriptors with k-NN novelty scores"""
+    def __init__(self, k=15, cell_size=0.05, cell_capacity=64, dims=len(DESCRIPTOR_NAMES)):
+        self.k = k
+        self.index = GridIndex(dims, cell_size, cell_capacity)
+
+    def __len__(self):
+        return len(self.index)
+
+    def novelty(self, descriptors):
+        """
+        Novelty of each descriptor: mean distance to its k nearest neighbours
+        among the archive plus the other descriptors in this batch
+        """
+        descriptors = np.atleast_2d(np.asarray(descriptors, dtype=np.float64))
+        scores = np.empty(len(descriptors))
+        for i, descriptor in enumerate(descriptors):
+            nearest = self.index.knn_distances(descriptor, self.k)
+            # The current batch counts as neighbours too, so a crowd of identical newcomers is not novel
+            batch = np.linalg.norm(np.delete(descriptors, i, axis=0) - descriptor, axis=1)
+            nearest = np.sort(np.concatenate([nearest, batch]))[:self.k]
+            scores[i] = nearest.mean() if len(nearest) else 0.0
+        return scores
+
+    def add(self, descriptors):
+        """Add descriptors to the archive; returns how many were stored"""
+        return sum(self.index.add(descriptor) for descriptor in np.atleast_2d(descriptors))
+
+    def stats(self):
+        return {"archive_size": len(self.index), "dropped": self.index.dropped,
+                "occupied_cells": len(self.index.cells)}
@@ -0,0 +1,100 @@
+"""
+Beam-search lookahead planner over GameState snapshots.
+
+Each decision expands every node in the beam into a flap and a glide child,
+steps all children at once with NumPy, drops the ones that died and keeps the
+beam_width best (most pipes passed, then closest to the next gap's centre),
+for depth frames. The first action of the best node is played.
+
+Every node in the beam sits on the same frame, so which pipe can be hit or
+scored is a scalar per depth step and only bird height and velocity are
+arrays. Pipe layouts come from the snapshot's RNG state, so the planner sees
+the pipes it will meet: it is an oracle baseline for what evolved networks
+could score, and a throughput stress test for simulation.
+"""
+
+import time
+import numpy as np
+from game.flappy_bird import (SCREEN_HEIGHT, GRAVITY, FLAP_POWER, PIPE_GAP, BIRD_HEIGHT,
+                              PIPE_SPAWN_INTERVAL, FlappyBirdGame)
+from game.vector_env import _HIT_AGE_MIN, _HIT_AGE_MAX, _NEXT_AGE_MAX, _PASS_AGE
+
+class BeamSearchPlanner:
+    """Pick flap/glide by searching beam_width futures depth frames ahead"""
+    def __init__(self, beam_width=64, depth=60):
+        self.beam_width = beam_width
+        self.depth = depth
+        self.decisions = 0
+        self.simulated_steps = 0
+        self.planning_time = 0.0
+
+    def plan(self, state):
+        """Return True to flap on the next frame of the snapshotted game"""
+        start = time.perf_counter()
+        first_pipe, gaps = state.pipe_gaps(self.depth)
+        frame = int(state.frame_count)
+        y = np.array([state.y])
+        velocity = np.array([state.velocity])
+        score = np.zeros(1, dtype=np.int64)
+        first_action = np.zeros(1, dtype=bool)
+        best_action = False
+
+        for step in range(self.depth):
+            # Children of every node: flaps first, then glides
+            count = len(y)
+            actions = np.arange(2 * count) < count
+            y = np.concatenate([y, y])
+            velocity = np.concatenate([np.full(count, float(FLAP_POWER)), velocity])
+            score = np.concatenate([score, score])
+            first_action = actions if step == 0 else np.concatenate([first_action, first_action])
+
+            # Same physics and collision rules as VectorFlappyBirdEnv.step
+            velocity += GRAVITY
+            y += velocity
+            ceiling = y <= 0
+            y[ceiling] = 0.0
+            velocity[ceiling] = 0.0
+            frame += 1
+            alive = y < SCREEN_HEIGHT - BIRD_HEIGHT
+            hit_age = (frame - _HIT_AGE_MIN) % PIPE_SPAWN_INTERVAL + _HIT_AGE_MIN
+            hit_pipe = (frame - hit_age) // PIPE_SPAWN_INTERVAL
+            if hit_age <= _HIT_AGE_MAX and hit_pipe >= first_pipe:
+                gap = gaps[hit_pipe - first_pipe]
+                bird_top = y.astype(np.int64)
+                alive &= (bird_top >= gap) & (bird_top + BIRD_HEIGHT <= gap + PIPE_GAP)
+            if frame >= _PASS_AGE and (frame - _PASS_AGE) % PIPE_SPAWN_INTERVAL == 0:
+                score += 1
+            self.simulated_steps += 2 * count
+
+            keep = np.flatnonzero(alive)
+            if len(keep) == 0:
+                break  # Every future dies here; play the longest-lived one
+            next_pipe = max(0, -((_NEXT_AGE_MAX - frame) // PIPE_SPAWN_INTERVAL))
+            target = gaps[min(next_pipe - first_pipe, len(gaps) - 1)] + (PIPE_GAP - BIRD_HEIGHT) / 2
+            order = np.lexsort((np.abs(y[keep] - target), -score[keep]))
+            keep = keep[order[:self.beam_width]]
+            y, velocity, score, first_action = y[keep], velocity[keep], score[keep], first_action[keep]
+            best_action = bool(first_action[0])
+
+        self.decisions += 1
+        self.planning_time += time.perf_counter() - start
+        return best_action
+
+    def stats(self):
+        return {
+            "decisions": self.decisions,
+            "simulated_steps": self.simulated_steps,
+            "steps_per_decision": self.simulated_steps / max(self.decisions, 1),
+            "steps_per_sec": self.simulated_steps / self.planning_time if self.planning_time else 0.0,
+            "ms_per_decision": 1000 * self.planning_time / max(self.decisions, 1),
+        }
+
+def play_planner(planner, seed=None, max_frames=None):
+    """Play one headless game choosing every action with the planner; returns the finished game"""
+    game = FlappyBirdGame(seed=seed)
+    state = game.snapshot()
+    while not game.game_over and (max_frames is None or game.frame_count < max_frames):
+        if planner.plan(game.snapshot_into(state)):
+            game.bird.flap()
+        game.update()
+    return game
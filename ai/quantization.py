@@ -0,0 +1,129 @@
+"""
+Compact population storage with float16 or int8 weights.
+
+A QuantizedPopulation keeps every genome's flat weight vector in one array
+instead of one nn.Module per genome. int8 weights carry one float32 scale per
+layer per genome. Evaluation dequantizes a chunk of genomes at a time and
+runs it through the batched episode kernel, so a float32 copy of the whole
+population never exists at once.
+"""
+
+import tracemalloc
+import numpy as np
+from ai.neural_network import NeuralNetwork
+from ai.episode_kernel import run_episodes
+
+DTYPES = ("float32", "float16", "int8")
+
+def layer_sizes(network=None):
+    """Number of parameters in each tensor of a NeuralNetwork, in flat-vector order"""
+    network = network or NeuralNetwork()
+    return [p.numel() for p in network.parameters()]
+
+def module_bytes_per_genome(samples=50):
+    """Measure the heap cost of one NeuralNetwork module, parameters and overhead included"""
+    # Leave tracing alone if something else (a MemoryTracker) already started it
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    networks = [NeuralNetwork() for _ in range(samples)]
+    after = tracemalloc.get_traced_memory()[0]
+    if started:
+        tracemalloc.stop()
+    # Parameter storage is allocated by torch outside Python's allocator
+    param_bytes = sum(p.numel() * p.element_size() for p in networks[0].parameters())
+    return (after - before) / samples + param_bytes
+
+class QuantizedPopulation:
+    """Population of flat weight vectors stored as float32, float16 or int8 + scale"""
+    def __init__(self, weights, dtype="float16", sizes=None):
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}")
+        weights = np.asarray(weights, dtype=np.float32)
+        self.dtype = dtype
+        self.sizes = sizes or layer_sizes()
+        self.bounds = np.cumsum([0] + self.sizes)
+        self.scales = None
+
+        if dtype == "int8":
+            # Symmetric per-layer scale so each layer uses the full int8 range
+            self.scales = np.empty((len(weights), len(self.sizes)), dtype=np.float32)
+            self.data = np.empty(weights.shape, dtype=np.int8)
+            for layer, (start, stop) in enumerate(zip(self.bounds[:-1], self.bounds[1:])):
+                segment = weights[:, start:stop]
+                scale = np.abs(segment).max(axis=1) / 127
+                scale[scale == 0] = 1.0
+                self.scales[:, layer] = scale
+                self.data[:, start:stop] = np.round(segment / scale[:, None]).astype(np.int8)
+        else:
+            self.data = weights.astype(dtype)
+
+    @classmethod
+    def from_networks(cls, networks, dtype="float16"):
+        return cls(np.stack([network.get_flat_weights() for network in networks]), dtype)
+
+    def __len__(self):
+        return len(self.data)
+
+    def dequantize(self, start=0, stop=None):
+        """Return float32 weights for genomes [start, stop)"""
+        data = self.data[start:stop]
+        if self.dtype != "int8":
+            return data.astype(np.float32)
+        scales = np.repeat(self.scales[start:stop], self.sizes, axis=1)
+        return data.astype(np.float32) * scales
+
+    def to_network(self, index):
+        """Rebuild one genome as a NeuralNetwork"""
+        network = NeuralNetwork()
+        network.set_flat_weights(self.dequantize(index, index + 1)[0])
+        return network
+
+    def bytes_per_genome(self):
+        """Storage bytes per genome, scales included"""
+        scale_bytes = self.scales.shape[1] * self.scales.itemsize if self.scales is not None else 0
+        return self.data.shape[1] * self.data.itemsize + scale_bytes
+
+    def run(self, seeds, max_frames, chunk_size=4096, details=False, decision_interval=1, progress=None):
+        """
+        run_episodes over every genome, dequantizing chunk_size genomes at a time
+        progress(waiting) is called after each chunk with the number of genomes left
+        """
+        results = []
+        for start in range(0, len(self), chunk_size):
+            results.append(run_episodes(self.dequantize(start, start + chunk_size), seeds, max_frames,
+                                        details=details, decision_interval=decision_interval))
+            if progress is not None:
+                progress(max(len(self) - start - chunk_size, 0))
+        scores = np.concatenate([result[0] for result in results])
+        frames = np.concatenate([result[1] for result in results])
+        if not details:
+            return scores, frames
+        extra = {key: np.concatenate([result[2][key] for result in results]) for key in results[0][2]}
+        return scores, frames, extra
+
+    def evaluate(self, seeds, max_frames, chunk_size=4096, decision_interval=1):
+        """Mean score of every genome over the seeds, dequantizing chunk by chunk"""
+        scores, _ = self.run(seeds, max_frames, chunk_size, decision_interval=decision_interval)
+        return scores.mean(axis=1)
+
+def check_fitness_tolerance(networks, seeds, max_frames, dtype="float16", tolerance=1.0, decision_interval=1):
+    """
+    Compare quantized fitness against float32 for a set of networks
+    tolerance is the largest allowed absolute difference in mean score per genome
+    """
+    reference = QuantizedPopulation.from_networks(networks, "float32")
+    quantized = QuantizedPopulation(reference.data, dtype)
+    exact = reference.evaluate(seeds, max_frames, decision_interval=decision_interval)
+    approx = quantized.evaluate(seeds, max_frames, decision_interval=decision_interval)
+    deviation = np.abs(approx - exact)
+    return {
+        "dtype": dtype,
+        "tolerance": tolerance,
+        "within_tolerance": bool(np.all(deviation <= tolerance)),
+        "max_deviation": float(deviation.max()),
+        "mean_deviation": float(deviation.mean()),
+        "bytes_per_genome": quantized.bytes_per_genome(),
+        "float32_bytes_per_genome": reference.bytes_per_genome()
+    }
@@ -0,0 +1,87 @@
+class RacingEvaluator:
+    """
+    Successive-halving fitness evaluation.
+
+    Every individual plays the first few seeds; only the best fraction go on to
+    play more. Survivors of the last cut are ranked on the full seed list.
+    Fitness is the mean score over the seeds an individual actually played,
+    capped just below the lowest fitness of the individuals that outlasted it,
+    so a network cut after a lucky first seed never outranks a finalist.
+
+    episode_fn(network, seed) must return (score, frames_simulated).
+    """
+    def __init__(self, episode_fn, seeds, rounds=(1, 3), keep_fraction=0.5):
+        if not seeds:
+            raise ValueError("RacingEvaluator needs at least one seed")
+        if list(rounds) != sorted(rounds) or any(r > len(seeds) for r in rounds):
+            raise ValueError("rounds must be increasing seed counts no larger than len(seeds)")
+        self.episode_fn = episode_fn
+        self.seeds = list(seeds)
+        # Cumulative seed counts at which a cut is made, finishing on the full list
+        self.rounds = [r for r in rounds if 0 < r < len(self.seeds)] + [len(self.seeds)]
+        self.keep_fraction = keep_fraction
+        self.last_stats = {}
+
+    def evaluate(self, population, progress=None):
+        """
+        Return a fitness score for every network in the population
+        progress(waiting) is called as networks finish: eliminated at a cut or done with every seed
+        """
+        size = len(population)
+        totals = [0.0] * size
+        played = [0] * size
+        frames = [0] * size
+        alive = list(range(size))
+        reached = [0] * size  # Last round each individual played in
+        episodes = 0
+
+        start = 0
+        finished = 0
+        for round_index, stop in enumerate(self.rounds):
+            last_round = round_index == len(self.rounds) - 1
+            for i in alive:
+                reached[i] = round_index
+                for seed in self.seeds[start:stop]:
+                    score, episode_frames = self.episode_fn(population[i], seed)
+                    totals[i] += score
+                    frames[i] += episode_frames
+                    played[i] += 1
+                    episodes += 1
+                if last_round and progress is not None:
+                    finished += 1
+                    progress(size - finished)
+            start = stop
+
+            # Keep the best fraction for the next round
+            if not last_round:
+                alive.sort(key=lambda i: totals[i] / played[i], reverse=True)
+                keep = max(1, int(round(len(alive) * self.keep_fraction)))
+                finished += len(alive) - keep
+                alive = alive[:keep]
+                if progress is not None:
+                    progress(size - finished)
+
+        # Frames an eliminated individual would have spent on its remaining
+        # seeds, extrapolated from its average episode length so far
+        full_budget = len(self.seeds)
+        frames_saved = 0
+        for i in range(size):
+            if played[i] < full_budget:
+                frames_saved += frames[i] / played[i] * (full_budget - played[i])
+
+        self.last_stats = {
+            "episodes": episodes,
+            "episodes_saved": size * full_budget - episodes,
+            "frames_simulated": sum(frames),
+            "frames_saved": int(frames_saved),
+            "finalists": len(alive)
+        }
+        fitness = [totals[i] / played[i] for i in range(size)]
+        # Walk back from the finalists: each round's dropouts stay below everyone who went further
+        floor = float("inf")
+        for round_index in reversed(range(len(self.rounds))):
+            group = [i for i in range(size) if reached[i] == round_index]
+            for i in group:
+                fitness[i] = min(fitness[i], floor - 1e-6)
+            floor = min([floor] + [fitness[i] for i in group])
+        return fitness
@@ -0,0 +1,44 @@
+"""
+NumPy arrays backed by multiprocessing.shared_memory.
+
+The creating process owns the block and unlinks it; worker processes attach
+by name and only close their mapping.
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedArray:
+    """A NumPy array living in a named shared memory block"""
+    def __init__(self, shm, shape, dtype, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape, dtype):
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, name, shape, dtype):
+        # Worker processes share the owner's resource tracker, so attaching
+        # does not make the block outlive (or die with) the worker
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        """Picklable (name, shape, dtype) for attaching from another process"""
+        return self.name, self.shape, self.dtype.str
+
+    def close(self):
+        """Release this process's mapping; the owner also frees the block"""
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,146 @@
+"""
+Population weights and fitness in shared memory for parallel evaluation.
+
+Workers map the weight, fitness and frame-count arrays once at startup.
+Each generation the master writes the new weight vectors in place and sends
+every worker only (generation, start, stop); workers write their rows'
+scores straight into the shared fitness array and reply with the generation
+number. Per-generation IPC is therefore independent of population size and
+network size.
+"""
+
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import numpy as np
+from ai.shared_arrays import SharedArray
+
+class SharedPopulation:
+    """Shared (population, params) float32 weights plus per-genome fitness and frames"""
+    def __init__(self, population_size, num_params, specs=None):
+        if specs is None:
+            self.weights = SharedArray.create((population_size, num_params), np.float32)
+            self.fitness = SharedArray.create((population_size,), np.float64)
+            self.frames = SharedArray.create((population_size,), np.int64)
+        else:
+            self.weights, self.fitness, self.frames = (SharedArray.attach(*spec) for spec in specs)
+
+    def specs(self):
+        return self.weights.spec(), self.fitness.spec(), self.frames.spec()
+
+    def close(self):
+        for buffer in (self.weights, self.fitness, self.frames):
+            buffer.close()
+
+def _evaluate_rows(population, start, stop, seeds, max_frames, use_kernel, network, decision_interval=1):
+    """Score rows [start, stop) of the shared weights into the shared fitness array"""
+    if start >= stop:
+        return
+    weights = population.weights.array[start:stop]
+    if use_kernel:
+        from ai.episode_kernel import run_episodes
+        scores, frames = run_episodes(weights, seeds, max_frames, decision_interval=decision_interval)
+        population.fitness.array[start:stop] = scores.mean(axis=1)
+        population.frames.array[start:stop] = frames.sum(axis=1)
+        return
+    from ai.evaluation import play_episode
+    for row, flat in enumerate(weights, start):
+        network.set_flat_weights(flat)
+        games = [play_episode(network, seed=seed, max_frames=max_frames, decision_interval=decision_interval)
+                 for seed in (seeds or [None])]
+        population.fitness.array[row] = sum(game.score for game in games) / len(games)
+        population.frames.array[row] = sum(game.frame_count for game in games)
+
+def _worker_loop(conn, specs, seeds, max_frames, use_kernel, decision_interval):
+    """Worker process: map the population once, then score whatever rows it is sent"""
+    import torch
+    from ai.neural_network import NeuralNetwork
+    torch.set_num_threads(1)
+    population = SharedPopulation(0, 0, specs=specs)
+    network = NeuralNetwork()  # Reused for every row in the non-kernel path
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            generation, start, stop = message
+            _evaluate_rows(population, start, stop, seeds, max_frames, use_kernel, network, decision_interval)
+            conn.send(generation)
+    finally:
+        population.close()
+        conn.close()
+
+class SharedPopulationEvaluator:
+    """
+    Evaluate a fixed-size population on worker processes through shared memory.
+
+    Each worker owns a contiguous slice of the population. With use_kernel the
+    slice is played by the batched episode kernel (requires seeds and
+    max_frames); otherwise each row plays the normal game. decision_interval
+    is passed through to both.
+    """
+    def __init__(self, population_size, num_params, workers=2, seeds=None, max_frames=None, use_kernel=False,
+                 decision_interval=1):
+        if use_kernel and not (seeds and max_frames):
+            raise ValueError("use_kernel requires seeds and max_frames")
+        self.population_size = population_size
+        self.population = SharedPopulation(population_size, num_params)
+        self.generation = 0
+        bounds = np.linspace(0, population_size, min(workers, population_size) + 1).astype(int)
+        self.slices = list(zip(bounds[:-1], bounds[1:]))
+
+        self.connections = []
+        self.processes = []
+        # Spawned, not forked: a child forked after the parent created a game
+        # deadlocks inside pygame.init
+        context = mp.get_context("spawn")
+        for _ in self.slices:
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_worker_loop, daemon=True,
+                                      args=(child_conn, self.population.specs(),
+                                            list(seeds) if seeds else None, max_frames, use_kernel,
+                                            decision_interval))
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def evaluate(self, weights, progress=None):
+        """
+        Score a (genomes, num_params) weight array, at most population_size rows
+        progress(waiting) is called as each worker finishes, with the number of genomes left
+        Returns (fitness, frames) arrays, one entry per genome
+        """
+        count = len(weights)
+        if count > self.population_size:
+            raise ValueError(f"At most {self.population_size} genomes fit in the shared population")
+        self.population.weights.array[:count] = weights
+        self.generation += 1
+        # With fewer genomes (children skipped by a surrogate) the same slices are cut short
+        rows = {}
+        for conn, (start, stop) in zip(self.connections, self.slices):
+            conn.send((self.generation, int(min(start, count)), int(min(stop, count))))
+            rows[conn] = int(max(min(stop, count) - min(start, count), 0))
+        waiting = count
+        pending = list(self.connections)
+        while pending:
+            for conn in wait(pending):
+                if conn.recv() != self.generation:
+                    raise RuntimeError("Worker replied for the wrong generation")
+                pending.remove(conn)
+                waiting -= rows[conn]
+                if progress is not None:
+                    progress(waiting)
+        return self.population.fitness.array[:count].copy(), self.population.frames.array[:count].copy()
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send(None)
+            except OSError:
+                pass  # Worker already gone (e.g. closing after an error); still free the memory
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        self.population.close()
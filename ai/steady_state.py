@@ -0,0 +1,123 @@
+"""
+Asynchronous steady-state evolution on a process pool.
+
+There are no generation barriers: as soon as any evaluation finishes, its
+network replaces the current worst individual and a freshly bred child is
+sent to the free worker. Long episodes from strong birds therefore never
+leave the other cores idle.
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+def _init_worker():
+    # One torch thread per process; the pool provides the parallelism
+    import torch
+    torch.set_num_threads(1)
+
+def _evaluate_genome(weights, seeds, max_frames, decision_interval=1):
+    """Worker: play a flat weight vector on the seeds; returns (score, frames, busy seconds)"""
+    from ai.neural_network import NeuralNetwork
+    from ai.evaluation import play_episode
+    start = time.perf_counter()
+    network = NeuralNetwork()
+    network.set_flat_weights(weights)
+    games = [play_episode(network, seed=seed, max_frames=max_frames, decision_interval=decision_interval)
+             for seed in (seeds or [None])]
+    score = sum(game.score for game in games) / len(games)
+    frames = sum(game.frame_count for game in games)
+    return score, frames, time.perf_counter() - start
+
+class SteadyStateRunner:
+    """
+    Drive an EnhancedGeneticAlgorithm in steady-state mode.
+
+    The GA's initial population is evaluated first (still asynchronously);
+    after that every finished evaluation calls ga.replace_worst and every
+    free worker gets a child from ga.breed_child.
+    """
+    def __init__(self, ga, workers=None, seeds=None, max_frames=None, decision_interval=1):
+        self.ga = ga
+        self.workers = workers or os.cpu_count() or 1
+        self.seeds = list(seeds) if seeds else None
+        self.max_frames = max_frames
+        self.decision_interval = decision_interval
+        self.evaluations = 0
+        self.frames = 0
+        self.busy_time = 0.0
+        self.start_time = None
+
+    def stats(self):
+        """Throughput so far: evaluations and frames per second, and worker utilization"""
+        elapsed = max(time.perf_counter() - self.start_time, 1e-9) if self.start_time else 0.0
+        return {
+            "evaluations": self.evaluations,
+            "elapsed": elapsed,
+            "evaluations_per_second": self.evaluations / elapsed if elapsed else 0.0,
+            "frames_per_second": self.frames / elapsed if elapsed else 0.0,
+            "worker_utilization": self.busy_time / (elapsed * self.workers) if elapsed else 0.0
+        }
+
+    def run(self, evaluations, callback=None):
+        """
+        Run until `evaluations` networks have been evaluated
+        callback(network, score, stats) is called after each one; return True to stop early
+        """
+        ga = self.ga
+        pending = list(ga.population)
+        ga.population = []
+        ga.fitness_scores = []
+        submitted = 0
+        self.start_time = time.perf_counter()
+
+        def next_network():
+            if pending:
+                return pending.pop(0)
+            if len(ga.population) >= 2:
+                return ga.breed_child()
+            return None
+
+        # Spawned, not forked: a child forked after the parent created a game
+        # deadlocks inside pygame.init
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight = {}
+            stop = False
+            while not stop and (in_flight or submitted < evaluations):
+                while len(in_flight) < self.workers and submitted < evaluations:
+                    network = next_network()
+                    if network is None:
+                        break
+                    future = pool.submit(_evaluate_genome, network.get_flat_weights(), self.seeds, self.max_frames,
+                                         self.decision_interval)
+                    in_flight[future] = network
+                    submitted += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    network = in_flight.pop(future)
+                    score, frames, busy = future.result()
+                    self.evaluations += 1
+                    self.frames += frames
+                    self.busy_time += busy
+                    if len(ga.population) < ga.population_size:
+                        ga.population.append(network)
+                        ga.fitness_scores.append(score)
+                    else:
+                        ga.replace_worst(network, score)
+                    if callback is not None and callback(network, score, self.stats()):
+                        stop = True
+
+            # Stopping early abandons the evaluations still queued; running
+            # episodes finish before the pool shuts down, so bound them with max_frames
+            for future in in_flight:
+                future.cancel()
+
+        # Networks that never got a result keep the population at full size
+        pending = list(in_flight.values()) + pending
+        while len(ga.population) < ga.population_size and pending:
+            ga.population.append(pending.pop(0))
+            ga.fitness_scores.append(0)
+        return self.stats()
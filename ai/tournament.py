@@ -0,0 +1,112 @@
+"""
+Bulk checkpoint tournament.
+
+Every checkpoint plays the same seeds with a frame cap. Checkpoints are
+loaded straight into flat weight vectors and evaluated in batches by the
+episode kernel, with batches spread over worker processes. The ranked
+leaderboard file is rewritten as each batch finishes.
+"""
+
+import os
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+def find_checkpoints(pattern):
+    """Checkpoint paths from a directory (every .pth inside) or a glob pattern, sorted"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.pth")
+    return sorted(glob.glob(pattern))
+
+def load_flat_weights(path):
+    """Read a saved NeuralNetwork state dict directly into a flat float32 vector"""
+    import torch
+    state = torch.load(path, map_location="cpu", weights_only=True)
+    # state_dict order matches parameters() order, so this matches get_flat_weights
+    return np.concatenate([tensor.numpy().ravel() for tensor in state.values()]).astype(np.float32)
+
+def _evaluate_batch(paths, seeds, max_frames, decision_interval=1):
+    """Worker: load a batch of checkpoints and play them all in one kernel call"""
+    from ai.episode_kernel import run_episodes
+    from ai.quantization import layer_sizes
+    expected = sum(layer_sizes())
+    weights, loaded, errors = [], [], {}
+    for path in paths:
+        try:
+            flat = load_flat_weights(path)
+        except Exception as e:
+            errors[path] = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+            continue
+        if flat.size != expected:
+            errors[path] = f"Expected {expected} parameters, got {flat.size}"
+            continue
+        weights.append(flat)
+        loaded.append(path)
+    if not loaded:
+        return [], None, None, errors
+    scores, frames = run_episodes(np.stack(weights), seeds, max_frames, decision_interval=decision_interval)
+    return loaded, scores, frames, errors
+
+def summarize(path, scores, frames):
+    """Leaderboard entry for one checkpoint's per-seed scores"""
+    entry = {
+        "path": path,
+        "mean": float(np.mean(scores)),
+        "min": int(np.min(scores)),
+        "max": int(np.max(scores)),
+        "std": float(np.std(scores)),
+        "mean_frames": float(np.mean(frames))
+    }
+    for q, value in zip(PERCENTILES, np.percentile(scores, PERCENTILES)):
+        entry[f"p{q}"] = float(value)
+    return entry
+
+def rank(entries):
+    """Sort by mean score, then worst case, then median; best first"""
+    return sorted(entries, key=lambda e: (e["mean"], e["min"], e["p50"]), reverse=True)
+
+def write_leaderboard(path, entries, errors, config):
+    """Write the leaderboard atomically so readers never see a partial file"""
+    leaderboard = {
+        "config": config,
+        "evaluated": len(entries),
+        "leaderboard": [dict(entry, rank=i + 1) for i, entry in enumerate(entries)],
+        "errors": errors
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(leaderboard, f, indent=2)
+    os.replace(temp_path, path)
+
+def run_tournament(checkpoints, seeds=range(20), max_frames=10000, output="leaderboard.json",
+                   workers=None, batch_size=64, callback=None, decision_interval=1):
+    """
+    Evaluate checkpoints on shared seeds and keep a ranked leaderboard file up to date
+    callback(done, total) is called after each batch
+    Returns the ranked leaderboard entries
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    config = {"seeds": seeds, "max_frames": max_frames, "decision_interval": decision_interval,
+              "checkpoints": len(checkpoints)}
+    batches = [checkpoints[i:i + batch_size] for i in range(0, len(checkpoints), batch_size)]
+    entries, errors = [], {}
+    start = time.time()
+    write_leaderboard(output, entries, errors, config)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_evaluate_batch, batch, seeds, max_frames, decision_interval) for batch in batches]
+        for future in as_completed(futures):
+            paths, scores, frames, batch_errors = future.result()
+            entries.extend(summarize(path, scores[i], frames[i]) for i, path in enumerate(paths))
+            errors.update(batch_errors)
+            entries = rank(entries)
+            config["elapsed"] = time.time() - start
+            write_leaderboard(output, entries, errors, config)
+            if callback is not None:
+                callback(len(entries) + len(errors), len(checkpoints))
+    return entries
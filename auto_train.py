@@ -3,78 +3,24 @@ Auto-training script for Flappy Bird AI
 This script provides enhanced automation for training the AI
 """
 
-import pygame
 import sys
 import os
-import torch
-import random
 import time
 import json
 from datetime import datetime
-from game.flappy_bird import FlappyBirdGame, Bird, Pipe, PIPE_GAP
-from ai.neural_network import NeuralNetwork
-from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm as GeneticAlgorithm
 
 # Ensure we can import from subdirectories
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def play_game_with_ai(network, render=False):
-    """
-    Play a game using the provided neural network
-    Returns the score achieved
-    """
-    game = FlappyBirdGame()
-    
-    # If rendering, we need to handle events differently
-    clock = None
-    if render:
-        game.screen = pygame.display.set_mode((400, 600))
-        clock = pygame.time.Clock()
-    
-    while not game.game_over:
-        # Get game state
-        bird_y = game.bird.y / 600  # Normalize
-        bird_velocity = game.bird.velocity / 10  # Normalize
-        
-        # Find the next pipe
-        next_pipe = None
-        for pipe in game.pipes:
-            if pipe.x + 50 > game.bird.x:  # Pipe width is 50
-                next_pipe = pipe
-                break
-        
-        if next_pipe:
-            pipe_x = next_pipe.x / 400  # Normalize
-            pipe_gap_y = next_pipe.gap_y / 600  # Normalize
-        else:
-            pipe_x = 1.0
-            pipe_gap_y = 0.5
-        
-        # Create state vector
-        state = [bird_y, bird_velocity, pipe_x, pipe_gap_y]
-        
-        # Get AI decision
-        flap_probability = network.predict(state)
-        
-        # Apply action based on probability
-        if flap_probability > 0.5:
-            game.bird.flap()
-        
-        # Update game
-        game.update()
-        
-        # Render if requested
-        if render and clock:
-            game.draw()
-            clock.tick(60)
-            
-            # Handle events for closing window
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return game.score
-    
-    return game.score
+# pygame, torch and the training modules are imported inside the commands that
+# use them, so the usage message and light subcommands start quickly
+
+def __getattr__(name):
+    """Keep the evaluation helpers importable from here without loading them eagerly"""
+    if name in ("play_game_with_ai", "play_episode", "play_seed", "evaluate_network"):
+        from ai import evaluation
+        return getattr(evaluation, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def auto_train_ai(
     generations=100,
@@ -83,7 +29,30 @@ def auto_train_ai(
     elite_size=4,
     target_score=None,
     save_frequency=10,
-    log_file="training_log.json"
+    log_file="training_log.json",
+    eval_seeds=None,
+    fitness_cache_size=0,
+    racing_rounds=None,
+    racing_keep_fraction=0.5,
+    instrument=False,
+    profile_generation=None,
+    profiler="cprofile",
+    metrics_port=None,
+    max_frames=None,
+    use_kernel=False,
+    weight_dtype="float32",
+    weight_tolerance=1.0,
+    workers=0,
+    novelty_weight=0.0,
+    novelty_k=15,
+    surrogate=False,
+    surrogate_simulate_fraction=0.5,
+    surrogate_explore=0.2,
+    decision_interval=1,
+    memory_tracker=None,
+    stopping=None,
+    state_file=None,
+    resume_state=None
 ):
     """
     Automatically train the AI with enhanced logging and control
@@ -96,16 +65,126 @@ def auto_train_ai(
         target_score: Stop training if this score is reached (None for no limit)
         save_frequency: Save progress every N generations
         log_file: File to log training progress
+        eval_seeds: Seeds to average each network's fitness over (None for one unseeded game)
+        fitness_cache_size: Number of genomes to keep in the fitness cache (0 disables it);
+            only used with eval_seeds, since unseeded games are not repeatable
+        racing_rounds: Cumulative seed counts for successive-halving evaluation, e.g. (1, 3);
+            requires eval_seeds, which is the full budget finalists are ranked on
+        racing_keep_fraction: Fraction of individuals kept after each racing round
+        instrument: Record per-phase timings and counters in each generation's log entry; phases
+            inside another phase are logged as "parent/child" and are included in the parent's time
+        profile_generation: Capture a full profile of this generation (1-based, None for no profile)
+        profiler: "cprofile" or "pyinstrument" for profile_generation
+        metrics_port: Serve Prometheus-style metrics on http://127.0.0.1:<port>/metrics (None to disable)
+        max_frames: Cap on frames per evaluation game (None for unbounded games)
+        use_kernel: Evaluate the whole population with the batched episode kernel
+            (Numba-compiled when available); requires eval_seeds and max_frames
+        weight_dtype: "float32", "float16" or "int8" weights for kernel evaluation
+        weight_tolerance: Largest allowed difference in mean score between quantized and float32
+            weights; checked on the first generation and every save_frequency generations, and
+            training falls back to float32 when it is exceeded
+        workers: Evaluate on this many worker processes through a shared-memory
+            population buffer (0 evaluates in this process)
+        novelty_weight: Add this many points per unit of behavioral novelty to each
+            network's selection fitness (0 disables novelty search); requires use_kernel
+        novelty_k: Neighbours used for novelty scores
+        surrogate: Pre-screen offspring with an online fitness model: "knn" or "ridge"
+            (True means "knn"; False disables screening)
+        surrogate_simulate_fraction: Fraction of each generation's children simulated once the
+            surrogate is trained; the rest get a pessimistic predicted fitness instead
+        surrogate_explore: Fraction of simulated children picked at random instead of by prediction
+        decision_interval: Query each network every N frames and let the bird glide in between;
+            play trained models back with the same interval
+        memory_tracker: An ai.instrumentation.MemoryTracker; records RSS (and tracemalloc
+            growth) in each generation's log entry and dumps a report past its alarm threshold
+        stopping: An ai.early_stopping.StoppingCriteria; ends the run once fitness plateaus or
+            its time or frame budget is used, recording the reason in the log
+        state_file: Where the evaluated population is saved when the run ends, so it can be
+            resumed (None saves to "<log_file>_state.npz" only when stopping is set)
+        resume_state: Continue from a population saved by an earlier run's state_file
     """
+    import numpy as np
+    from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm as GeneticAlgorithm
+    from ai.neural_network import NeuralNetwork
+    from ai.fitness_cache import FitnessCache
+    from ai.racing import RacingEvaluator
+    from ai.instrumentation import Instrumentation, GenerationProfiler
+    from ai.metrics_server import MetricsServer
+    from ai.quantization import QuantizedPopulation, check_fitness_tolerance, module_bytes_per_genome
+    from ai.evaluation import play_seed, evaluate_network
+    from ai.shared_population import SharedPopulationEvaluator
+    from ai.novelty import NoveltyArchive, behavior_descriptors
+    from ai.surrogate import SURROGATES, prediction_accuracy
+    
     print("Starting automatic AI training...")
     print(f"Parameters: generations={generations}, population={population_size}, mutation={mutation_rate}")
     
+    # Phase timers are no-ops unless instrument is set
+    instrumentation = Instrumentation(enabled=instrument)
+    generation_profiler = GenerationProfiler(profiler) if profile_generation else None
+    
+    # Surrogate learns from every simulated genome and screens the next generation's children
+    fitness_model = None
+    if surrogate:
+        fitness_model = SURROGATES["knn" if surrogate is True else surrogate](min_samples=2 * population_size)
+    
     # Create genetic algorithm
-    ga = GeneticAlgorithm(population_size=population_size, mutation_rate=mutation_rate, elite_size=elite_size)
+    ga = GeneticAlgorithm(population_size=population_size, mutation_rate=mutation_rate, elite_size=elite_size,
+                          instrumentation=instrumentation, surrogate=fitness_model,
+                          simulate_fraction=surrogate_simulate_fraction, explore_fraction=surrogate_explore)
+    
+    # A saved population was already evaluated, so a resumed run breeds its next generation first
+    resumed = None
+    if resume_state:
+        resumed = ga.load_state(resume_state)
+        ga.evolve()
+        population_size = ga.population_size
+        print(f"Resumed {population_size} networks from {resume_state} (best score {float(resumed['best_score'])})")
+    if state_file is None and stopping is not None:
+        state_file = os.path.splitext(log_file)[0] + "_state.npz"
+    
+    # Elites survive unchanged, so seeded scores can be reused across generations
+    fitness_cache = None
+    if eval_seeds and fitness_cache_size > 0:
+        fitness_cache = FitnessCache(max_size=fitness_cache_size)
+    
+    if use_kernel and not (eval_seeds and max_frames):
+        raise ValueError("use_kernel requires eval_seeds and max_frames")
+    if weight_dtype != "float32" and not use_kernel:
+        raise ValueError("weight_dtype other than float32 requires use_kernel")
+    
+    if workers and (racing_rounds or fitness_cache_size):
+        raise ValueError("workers cannot be combined with racing_rounds or fitness_cache_size")
+    # The kernel plays every genome on every seed in one call, so it bypasses both
+    if use_kernel and (racing_rounds or fitness_cache_size):
+        raise ValueError("use_kernel cannot be combined with racing_rounds or fitness_cache_size")
+    
+    # Novelty search rewards new behaviors (where birds die, how often they flap)
+    archive = None
+    if novelty_weight:
+        if not use_kernel or workers:
+            raise ValueError("novelty_weight requires use_kernel without workers")
+        archive = NoveltyArchive(k=novelty_k)
+    
+    # Racing spends the full seed budget only on promising individuals
+    racing = None
+    if racing_rounds:
+        if not eval_seeds:
+            raise ValueError("racing_rounds requires eval_seeds")
+        racing = RacingEvaluator(
+            lambda network, seed: play_seed(network, seed, fitness_cache, instrumentation, max_frames,
+                                            decision_interval),
+            eval_seeds, rounds=racing_rounds, keep_fraction=racing_keep_fraction
+        )
     
     # Training tracking
     best_score = 0
     best_network = None
+    if resumed is not None:
+        best_score = float(resumed["best_score"])
+        best_network = NeuralNetwork()
+        best_network.set_flat_weights(resumed["best_weights"])
+    stop_reason = None
     generation_times = []
     training_log = {
         "start_time": datetime.now().isoformat(),
@@ -113,75 +192,272 @@ def auto_train_ai(
             "generations": generations,
             "population_size": population_size,
             "mutation_rate": mutation_rate,
-            "elite_size": elite_size
+            "elite_size": elite_size,
+            "eval_seeds": list(eval_seeds) if eval_seeds else None,
+            "fitness_cache_size": fitness_cache_size,
+            "racing_rounds": list(racing_rounds) if racing_rounds else None,
+            "racing_keep_fraction": racing_keep_fraction,
+            "instrument": instrument,
+            "max_frames": max_frames,
+            "use_kernel": use_kernel,
+            "weight_dtype": weight_dtype,
+            "weight_tolerance": weight_tolerance,
+            "workers": workers,
+            "novelty_weight": novelty_weight,
+            "surrogate": surrogate,
+            "decision_interval": decision_interval,
+            "stopping": stopping.summary() if stopping is not None else None,
+            "resume_state": resume_state
         },
         "generations": []
     }
     
+    # Memory per genome as evaluated, against one nn.Module per genome
+    if use_kernel:
+        storage = QuantizedPopulation.from_networks(ga.population[:1], weight_dtype)
+        training_log["weight_storage"] = {
+            "dtype": weight_dtype,
+            "bytes_per_genome": storage.bytes_per_genome(),
+            "float32_bytes_per_genome": storage.data.shape[1] * 4,
+            "module_bytes_per_genome": round(module_bytes_per_genome())
+        }
+        print(f"Weights: {weight_dtype}, {training_log['weight_storage']['bytes_per_genome']} bytes per genome "
+              f"(nn.Module: ~{training_log['weight_storage']['module_bytes_per_genome']} bytes)")
+    
     # Ensure models directory exists
     os.makedirs("models", exist_ok=True)
     
+    metrics = None
+    parallel = None
     try:
+        # Live metrics for dashboards
+        if metrics_port is not None:
+            metrics = MetricsServer(port=metrics_port)
+            print(f"Serving metrics on http://127.0.0.1:{metrics.start()}/metrics")
+        
+        # Workers map the population buffer once; each generation only sends index ranges
+        if workers:
+            parallel = SharedPopulationEvaluator(population_size, len(ga.population[0].get_flat_weights()),
+                                                 workers=workers, seeds=eval_seeds, max_frames=max_frames,
+                                                 use_kernel=use_kernel, decision_interval=decision_interval)
+        
+        # A resumed run continues the first run's generation numbering in its log and checkpoints
+        first_generation = ga.generation
         for generation in range(generations):
             gen_start_time = time.time()
-            print(f"\nGeneration {generation + 1}/{generations}")
+            number = first_generation + generation + 1
+            print(f"\nGeneration {number}/{first_generation + generations}")
             
-            # Evaluate each network in the population
-            scores = []
-            for i, network in enumerate(ga.population):
-                score = play_game_with_ai(network)
-                scores.append(score)
-                print(f"  Network {i+1:2d}: Score {score:3d}")
+            profiling = generation_profiler is not None and generation + 1 == profile_generation
+            if profiling:
+                generation_profiler.start()
             
-            # Set fitness scores
-            ga.set_fitness_scores(scores)
+            if metrics is not None:
+                metrics.set("generation", number)
+            # Quantized fitness must stay within weight_tolerance of float32, or training switches back
+            quantization_check = None
+            if weight_dtype != "float32" and (generation == 0 or (generation + 1) % save_frequency == 0):
+                with instrumentation.phase("quantization_check"):
+                    quantization_check = check_fitness_tolerance(ga.population, eval_seeds, max_frames,
+                                                                 weight_dtype, weight_tolerance, decision_interval)
+                if not quantization_check["within_tolerance"]:
+                    print(f"  ⚠️ {weight_dtype} fitness is off by up to {quantization_check['max_deviation']:.2f} "
+                          f"(tolerance {weight_tolerance}) - evaluating with float32 from now on")
+                    weight_dtype = "float32"
+                    training_log["weight_storage"]["dtype"] = weight_dtype
+                    training_log["weight_storage"]["bytes_per_genome"] = quantization_check["float32_bytes_per_genome"]
             
-            # Track best score
-            generation_best = max(scores)
-            generation_avg = sum(scores) / len(scores)
+            eval_start_time = time.perf_counter()
+            frames_before = instrumentation.counters.get("frames", 0)
+            
+            # Evaluate each network in the population, except children the surrogate screened out
+            simulated = ga.simulate_indices()
+            networks = [ga.population[i] for i in simulated]
+            queue_depth = None
+            if metrics is not None:
+                metrics.set("evaluation_queue_depth", len(networks))
+                queue_depth = lambda waiting: metrics.set("evaluation_queue_depth", waiting)
+            with instrumentation.phase("evaluation"):
+                if parallel is not None:
+                    if use_kernel:
+                        weights = QuantizedPopulation.from_networks(networks, weight_dtype).dequantize()
+                    else:
+                        weights = [network.get_flat_weights() for network in networks]
+                    parallel_scores, parallel_frames = parallel.evaluate(weights, progress=queue_depth)
+                    scores = parallel_scores.tolist()
+                    instrumentation.count("episodes", len(scores) * max(len(eval_seeds or []), 1))
+                    instrumentation.count("frames", int(parallel_frames.sum()))
+                elif use_kernel:
+                    # The evaluated copy is kept quantized and dequantized a chunk at a time
+                    population = QuantizedPopulation.from_networks(networks, weight_dtype)
+                    kernel_scores, kernel_frames, details = population.run(eval_seeds, max_frames, details=True,
+                                                                           decision_interval=decision_interval,
+                                                                           progress=queue_depth)
+                    scores = kernel_scores.mean(axis=1).tolist()
+                    instrumentation.count("episodes", kernel_scores.size)
+                    instrumentation.count("frames", int(kernel_frames.sum()))
+                elif racing is not None:
+                    scores = racing.evaluate(networks, progress=queue_depth)
+                else:
+                    scores = []
+                    for i, network in enumerate(networks):
+                        scores.append(evaluate_network(network, eval_seeds, fitness_cache, instrumentation, max_frames,
+                                                       decision_interval))
+                        if queue_depth is not None:
+                            queue_depth(len(networks) - i - 1)
+            simulation_seconds = time.perf_counter() - eval_start_time
+            simulated_scores = scores
+            if ga.skipped:
+                scores = ga.merge_scores(simulated_scores)
+            skipped = set(ga.skipped)
+            for i, score in enumerate(scores):
+                if i in skipped:
+                    print(f"  Network {i+1:2d}: Predicted {score:5.1f} (not played)")
+                else:
+                    print(f"  Network {i+1:2d}: Score {score:5.1f}")
+            
+            # Set fitness scores; with novelty search, selection also favours new behaviors
+            if archive is not None:
+                with instrumentation.phase("novelty"):
+                    descriptors = behavior_descriptors(kernel_frames, details, max_frames)
+                    novelty = np.zeros(len(scores))
+                    novelty[simulated] = archive.novelty(descriptors)
+                    archive.add(descriptors)
+                ga.set_fitness_scores([score + novelty_weight * n for score, n in zip(scores, novelty)])
+            else:
+                ga.set_fitness_scores(scores)
+            
+            # Track best score, from played games only
+            generation_best = max(simulated_scores)
+            generation_avg = sum(simulated_scores) / len(simulated_scores)
+            
+            eval_frames = instrumentation.counters.get("frames", 0) - frames_before
+            if metrics is not None:
+                metrics.update(
+                    best_fitness=generation_best,
+                    best_fitness_overall=max(best_score, generation_best),
+                    mean_fitness=generation_avg,
+                    frames_per_second=eval_frames / max(time.perf_counter() - eval_start_time, 1e-9),
+                    frames_total=metrics.values.get("frames_total", 0) + eval_frames,
+                    evaluation_queue_depth=0
+                )
             
             if generation_best > best_score:
                 best_score = generation_best
                 best_network = ga.get_best_network()
                 # Save the best network
-                model_path = os.path.join("models", f"best_model_gen_{generation+1}_score_{best_score}.pth")
-                best_network.save(model_path)
+                model_path = os.path.join("models", f"best_model_gen_{number}_score_{best_score}.pth")
+                with instrumentation.phase("checkpoint_io"):
+                    best_network.save(model_path)
                 print(f"  🏆 New best score: {best_score} - Model saved")
             
             # Log generation data
             gen_data = {
-                "generation": generation + 1,
+                "generation": number,
                 "best_score": generation_best,
                 "average_score": generation_avg,
-                "scores": scores,
+                # Children the surrogate skipped were never played: null here, predictions listed separately
+                "scores": [None if i in skipped else score for i, score in enumerate(scores)],
                 "time_taken": time.time() - gen_start_time
             }
+            if skipped:
+                gen_data["predicted_scores"] = [score if i in skipped else None for i, score in enumerate(scores)]
+            if fitness_cache is not None:
+                gen_data["fitness_cache"] = fitness_cache.stats()
+            if quantization_check is not None:
+                gen_data["quantization"] = quantization_check
+            if fitness_model is not None:
+                training_start = time.perf_counter()
+                with instrumentation.phase("surrogate_training"):
+                    # Only simulated genomes are ground truth; skipped children's scores are predictions
+                    predictions = ga.predicted_fitness or [None] * len(ga.population)  # Empty before evolve()
+                    screened = [(predictions[i], score) for i, score in zip(simulated, simulated_scores)
+                                if predictions[i] is not None]
+                    accuracy = prediction_accuracy([p for p, _ in screened], [score for _, score in screened])
+                    fitness_model.add([network.get_flat_weights() for network in networks], simulated_scores)
+                training_ms = (time.perf_counter() - training_start) * 1000
+                # Cost of the surrogate against simulation time saved, estimated from this generation's
+                # mean simulation time per genome
+                stats = dict(ga.screening_stats or {"simulations_avoided": 0, "screening_ms": 0.0})
+                saved_ms = 1000 * simulation_seconds / len(networks) * stats["simulations_avoided"]
+                stats.update(training_ms=round(training_ms, 3), simulation_ms=round(1000 * simulation_seconds, 3),
+                             estimated_saved_ms=round(saved_ms, 3),
+                             net_saved_ms=round(saved_ms - stats["screening_ms"] - training_ms, 3))
+                gen_data["surrogate"] = dict(stats, samples=len(fitness_model.y), **accuracy)
+                if ga.screening_stats:
+                    print(f"  🔮 Surrogate: {stats['simulations_avoided']} simulations avoided, "
+                          f"~{stats['net_saved_ms']:.0f} ms saved net of screening and training, "
+                          f"correlation {accuracy['correlation'] if accuracy['correlation'] is not None else 'n/a'}")
+            if memory_tracker is not None:
+                with instrumentation.phase("memory_tracking"):
+                    gen_data["memory"] = memory_tracker.check(number)
+                if "alarm" in gen_data["memory"]:
+                    print(f"  ⚠️ Memory alarm: RSS {gen_data['memory']['rss_mb']:.0f} MB exceeds "
+                          f"{memory_tracker.alarm_mb} MB - report saved to {gen_data['memory']['alarm']}")
+                for site in gen_data["memory"].get("top_growth", [])[:3]:
+                    print(f"  🧠 {site['size_diff_kb']:+.0f} KiB at {site['site']}")
+            if archive is not None:
+                gen_data["novelty"] = dict(archive.stats(), mean=float(novelty.mean()),
+                                           max=float(novelty.max()))
+            if racing is not None:
+                gen_data["racing"] = racing.last_stats
+                print(f"  🏁 Racing: {racing.last_stats['episodes']} episodes, "
+                      f"~{racing.last_stats['frames_saved']} frames saved")
             training_log["generations"].append(gen_data)
             
+            # Check if target score reached, then whether the run has plateaued or used its budget
+            target_reached = target_score and best_score >= target_score
+            if target_reached:
+                stop_reason = "target_score"
+            elif stopping is not None:
+                stop_reason = stopping.update(generation_best, generation_avg, eval_frames)
+                gen_data["generations_since_improvement"] = stopping.since_improvement
+            
+            # Evolve to next generation; the last one stays evaluated so it can be saved and resumed
+            if not stop_reason and generation < generations - 1:
+                with instrumentation.phase("evolve"):
+                    ga.evolve()
+            
+            if metrics is not None:
+                metrics.update(
+                    mutation_rate=ga.mutation_rate,
+                    mutation_strength=ga.mutation_strength,
+                    stagnation_counter=getattr(ga, 'stagnation_counter', 0)
+                )
+            
+            if profiling:
+                gen_data["profile"] = generation_profiler.stop(f"profile_gen_{number}")
+                print(f"  🔬 Profile saved to {gen_data['profile']}")
+            
+            # Phase timings; the log write below is counted in the next generation
+            if instrumentation.enabled:
+                gen_data["phases"] = instrumentation.report()
+                instrumentation.reset()
+            
             # Save log file periodically
-            if (generation + 1) % save_frequency == 0 or generation == generations - 1:
-                with open(log_file, 'w') as f:
-                    json.dump(training_log, f, indent=2)
+            if (generation + 1) % save_frequency == 0 or generation == generations - 1 or stop_reason:
+                with instrumentation.phase("checkpoint_io"):
+                    with open(log_file, 'w') as f:
+                        json.dump(training_log, f, indent=2)
                 print(f"  📝 Progress logged to {log_file}")
             
-            # Check if target score reached
-            if target_score and best_score >= target_score:
+            if target_reached:
                 print(f"🎯 Target score {target_score} reached!")
                 break
-            
-            # Evolve to next generation
-            ga.evolve()
+            if stop_reason:
+                print(f"⏹️ Stopping early: {stopping.describe()}")
+                break
             
             gen_time = time.time() - gen_start_time
             generation_times.append(gen_time)
             
-            print(f"  Generation best: {generation_best:3d} | Average: {generation_avg:5.1f} | Time: {gen_time:4.1f}s")
-            print(f"  Overall best: {best_score:3d}")
+            print(f"  Generation best: {generation_best:5.1f} | Average: {generation_avg:5.1f} | Time: {gen_time:4.1f}s")
+            print(f"  Overall best: {best_score:5.1f}")
         
         print("\n" + "="*50)
         print("Training completed!")
         print(f"Best score achieved: {best_score}")
-        print(f"Average generation time: {sum(generation_times)/len(generation_times):.1f}s")
+        print(f"Average generation time: {sum(generation_times)/max(len(generation_times), 1):.1f}s")
         
         # Save final best network
         if best_network:
@@ -189,13 +465,21 @@ def auto_train_ai(
             best_network.save(final_path)
             print(f"Final model saved to {final_path}")
         
+        if state_file:
+            ga.save_state(state_file, best_score=best_score,
+                          best_weights=(best_network or ga.get_best_network()).get_flat_weights())
+            training_log["state_file"] = state_file
+            print(f"Population saved to {state_file}")
+        
         # Save final log
         training_log["end_time"] = datetime.now().isoformat()
         training_log["best_score"] = best_score
+        training_log["stop_reason"] = stop_reason or "generations"
+        if stopping is not None:
+            training_log["stopping"] = stopping.summary()
         with open(log_file, 'w') as f:
             json.dump(training_log, f, indent=2)
         print(f"Final training log saved to {log_file}")
-        
         return best_network, best_score
         
     except KeyboardInterrupt:
@@ -205,69 +489,519 @@ def auto_train_ai(
             best_network.save(interrupt_path)
             print(f"Current best model saved to {interrupt_path}")
         return best_network, best_score
+    finally:
+        # Any exit, including errors, stops the metrics thread and releases the workers' shared memory
+        if metrics is not None:
+            metrics.stop()
+        if parallel is not None:
+            parallel.close()
 
 def continuous_training_session(
     sessions=5,
     generations_per_session=100,
     population_size=20,
     mutation_rate=0.2,
-    elite_size=4
+    elite_size=4,
+    decision_interval=1,
+    memory_tracker=None,
+    patience=None,
+    min_delta=0.0,
+    time_budget=None,
+    frame_budget=None
 ):
     """
     Run multiple training sessions continuously
+    A memory_tracker is shared by every session, so growth is tracked across them
+    
+    patience and min_delta stop a session once its fitness plateaus. time_budget
+    (seconds) and frame_budget (simulated frames) are totals for all sessions:
+    each session gets an even share of what is left, so budget a plateaued
+    session did not use goes to the sessions after it. Budget still left at the
+    end goes to the sessions that used up their share while still improving,
+    which resume from their saved populations until they plateau or it runs out.
+    Returns the session results
     """
-    print(f"Starting {sessions} continuous training sessions...")
+    from ai.early_stopping import StoppingCriteria, BUDGET_REASONS, budget_share
     
-    for session in range(sessions):
-        print(f"\n{'='*60}")
-        print(f"SESSION {session + 1}/{sessions}")
-        print(f"{'='*60}")
+    early_stopping = patience is not None or time_budget is not None or frame_budget is not None
+    spent = {"seconds": 0.0, "frames": 0}
+    
+    def budget_left():
+        return ((time_budget is None or spent["seconds"] < time_budget) and
+                (frame_budget is None or spent["frames"] < frame_budget))
+    
+    def run_session(result, shares, resume_state=None):
+        session = result["session"]
+        run = result["runs"] + 1
+        stopping = None
+        if early_stopping:
+            share = budget_share(frame_budget, spent["frames"], shares)
+            stopping = StoppingCriteria(patience=patience, min_delta=min_delta,
+                                        time_budget=budget_share(time_budget, spent["seconds"], shares),
+                                        frame_budget=int(share) if share is not None else None)
         
-        # Run training session
         best_network, best_score = auto_train_ai(
             generations=generations_per_session,
             population_size=population_size,
             mutation_rate=mutation_rate,
             elite_size=elite_size,
-            log_file=f"training_log_session_{session+1}.json"
+            log_file=f"training_log_session_{session}.json" if run == 1
+                     else f"training_log_session_{session}_run_{run}.json",
+            decision_interval=decision_interval,
+            memory_tracker=memory_tracker,
+            stopping=stopping,
+            state_file=result["state_file"] if early_stopping else None,
+            resume_state=resume_state
         )
         
-        print(f"\nSession {session + 1} completed with best score: {best_score}")
+        result["runs"] = run
+        result["best_score"] = max(result["best_score"], best_score)
+        result["timestamp"] = datetime.now().isoformat()
+        if stopping is not None:
+            spent["seconds"] += stopping.elapsed
+            spent["frames"] += stopping.frames
+            result["stop_reason"] = stopping.reason or "generations"
+            result["improving"] = stopping.improving
+            result["generations"] = result.get("generations", 0) + stopping.generations
+            result["frames"] = result.get("frames", 0) + stopping.frames
+            result["seconds"] = round(result.get("seconds", 0.0) + stopping.elapsed, 3)
+        if memory_tracker is not None:
+            from ai.instrumentation import rss_bytes
+            rss = rss_bytes()
+            result["rss_mb"] = round(rss / 2 ** 20, 2) if rss is not None else None
         
-        # Save session results
-        session_result = {
-            "session": session + 1,
-            "best_score": best_score,
-            "timestamp": datetime.now().isoformat()
-        }
+        print(f"\nSession {session} completed with best score: {best_score}")
         
-        session_file = f"session_{session+1}_result.json"
+        # Save session results
+        session_file = f"session_{session}_result.json"
         with open(session_file, 'w') as f:
-            json.dump(session_result, f, indent=2)
+            json.dump({key: value for key, value in result.items() if key != "state_file"}, f, indent=2)
         print(f"Session results saved to {session_file}")
+    
+    print(f"Starting {sessions} continuous training sessions...")
+    
+    results = []
+    for session in range(sessions):
+        if not budget_left():
+            print(f"\nTraining budget used up after {session} sessions")
+            break
+        
+        print(f"\n{'='*60}")
+        print(f"SESSION {session + 1}/{sessions}")
+        print(f"{'='*60}")
+        
+        result = {"session": session + 1, "runs": 0, "best_score": 0,
+                  "state_file": f"training_state_session_{session + 1}.npz"}
+        results.append(result)
+        run_session(result, sessions - session)
         
         if session < sessions - 1:
             print("Starting next session in 5 seconds...")
             time.sleep(5)
+    
+    # Hand budget left by plateaued sessions to the ones still improving when their share ran out
+    while early_stopping and budget_left():
+        improving = [result for result in results
+                     if result["stop_reason"] in BUDGET_REASONS and result["improving"]]
+        if not improving:
+            break
+        for i, result in enumerate(improving):
+            if not budget_left():
+                break
+            print(f"\n{'='*60}")
+            print(f"SESSION {result['session']} (extended, run {result['runs'] + 1})")
+            print(f"{'='*60}")
+            run_session(result, len(improving) - i, resume_state=result["state_file"])
+    
+    return results
+
+def steady_state_train(
+    evaluations=2000,
+    population_size=20,
+    mutation_rate=0.2,
+    workers=None,
+    eval_seeds=None,
+    max_frames=None,
+    report_every=50,
+    log_file="steady_state_log.json",
+    decision_interval=1
+):
+    """
+    Train with the asynchronous steady-state GA: no generation barriers,
+    every finished evaluation replaces the worst individual
+    
+    Args:
+        evaluations: Total number of networks to evaluate
+        population_size: Size of the population
+        mutation_rate: Rate of mutation
+        workers: Worker processes (None for one per CPU)
+        eval_seeds: Seeds to average each network's fitness over (None for one unseeded game)
+        max_frames: Episode length cap (None for unbounded episodes)
+        report_every: Log throughput every N evaluations
+        log_file: File to log training progress
+        decision_interval: Query each network every N frames
+    """
+    from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm as GeneticAlgorithm
+    from ai.steady_state import SteadyStateRunner
+    
+    os.makedirs("models", exist_ok=True)
+    ga = GeneticAlgorithm(population_size=population_size, mutation_rate=mutation_rate)
+    runner = SteadyStateRunner(ga, workers=workers, seeds=eval_seeds, max_frames=max_frames,
+                               decision_interval=decision_interval)
+    print(f"Starting steady-state training: {evaluations} evaluations on {runner.workers} workers")
+    
+    training_log = {
+        "start_time": datetime.now().isoformat(),
+        "optimizer": "steady-state-ga",
+        "config": {
+            "evaluations": evaluations,
+            "population_size": population_size,
+            "mutation_rate": mutation_rate,
+            "workers": runner.workers,
+            "eval_seeds": eval_seeds,
+            "max_frames": max_frames,
+            "decision_interval": decision_interval
+        },
+        "reports": []
+    }
+    best = {"score": 0, "network": None}
+    
+    def on_result(network, score, stats):
+        if score > best["score"]:
+            best["score"] = score
+            best["network"] = network
+            model_path = os.path.join("models", f"steady_model_eval_{stats['evaluations']}_score_{score}.pth")
+            network.save(model_path)
+            print(f"  🏆 New best score: {score} - Model saved")
+        if stats["evaluations"] % report_every == 0:
+            report = dict(stats, best_score=best["score"],
+                          average_score=sum(ga.fitness_scores) / len(ga.fitness_scores))
+            training_log["reports"].append(report)
+            print(f"Evaluations: {stats['evaluations']} | {stats['evaluations_per_second']:.1f} evals/s | "
+                  f"Utilization: {stats['worker_utilization']:.0%} | Best: {best['score']}")
+    
+    try:
+        stats = runner.run(evaluations, on_result)
+    except KeyboardInterrupt:
+        print("\n\nTraining interrupted by user")
+        stats = runner.stats()
+    
+    if best["network"]:
+        final_path = os.path.join("models", "steady_final_best_model.pth")
+        best["network"].save(final_path)
+        print(f"Final model saved to {final_path}")
+    training_log["end_time"] = datetime.now().isoformat()
+    training_log["best_score"] = best["score"]
+    training_log["throughput"] = stats
+    with open(log_file, 'w') as f:
+        json.dump(training_log, f, indent=2)
+    print(f"Completed {stats['evaluations']} evaluations at {stats['evaluations_per_second']:.1f} evals/s")
+    return best["network"], best["score"]
+
+def es_train(
+    generations=200,
+    pairs=100,
+    sigma=0.1,
+    learning_rate=0.03,
+    workers=None,
+    eval_seeds=(0, 1, 2),
+    max_frames=5000,
+    save_frequency=10,
+    log_file="es_training_log.json",
+    decision_interval=1
+):
+    """
+    Train with evolution strategies instead of the genetic algorithm
+    
+    Args:
+        generations: Number of ES updates
+        pairs: Antithetic perturbation pairs evaluated per update
+        sigma: Noise standard deviation
+        learning_rate: ES step size
+        workers: Worker processes (None for one per CPU, 0 to evaluate in-process)
+        eval_seeds: Seeds every perturbation is evaluated on
+        max_frames: Episode length cap
+        save_frequency: Save the log every N generations
+        log_file: File to log training progress
+        decision_interval: Query each network every N frames
+    """
+    from ai.evolution_strategies import ParallelES
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    os.makedirs("models", exist_ok=True)
+    
+    print(f"Starting ES training: {pairs} pairs, {workers} workers, sigma {sigma}, lr {learning_rate}")
+    es = ParallelES(pairs=pairs, sigma=sigma, learning_rate=learning_rate, workers=workers,
+                    seeds=eval_seeds, max_frames=max_frames, decision_interval=decision_interval)
+    training_log = {
+        "start_time": datetime.now().isoformat(),
+        "optimizer": "openai-es",
+        "config": {
+            "generations": generations,
+            "pairs": pairs,
+            "sigma": sigma,
+            "learning_rate": learning_rate,
+            "workers": workers,
+            "eval_seeds": list(eval_seeds),
+            "max_frames": max_frames,
+            "decision_interval": decision_interval
+        },
+        "generations": []
+    }
+    best_score = 0
+    best_network = None
+    
+    try:
+        for generation in range(generations):
+            gen_start_time = time.time()
+            gen_data = es.step()
+            score = es.evaluate_theta()
+            gen_data["theta_score"] = score
+            gen_data["time_taken"] = time.time() - gen_start_time
+            training_log["generations"].append(gen_data)
+            
+            if score > best_score:
+                best_score = score
+                best_network = es.get_network()
+                model_path = os.path.join("models", f"es_model_gen_{generation+1}_score_{score:.1f}.pth")
+                best_network.save(model_path)
+                print(f"  🏆 New best score: {score:.1f} - Model saved")
+            
+            print(f"Generation {generation + 1}/{generations} | Theta score: {score:5.1f} | "
+                  f"Mean fitness: {gen_data['mean_fitness']:.2f} | Time: {gen_data['time_taken']:.2f}s")
+            
+            if (generation + 1) % save_frequency == 0 or generation == generations - 1:
+                with open(log_file, 'w') as f:
+                    json.dump(training_log, f, indent=2)
+    except KeyboardInterrupt:
+        print("\n\nTraining interrupted by user")
+    finally:
+        es.close()
+    
+    if best_network:
+        final_path = os.path.join("models", "es_final_best_model.pth")
+        best_network.save(final_path)
+        print(f"Final model saved to {final_path}")
+    training_log["end_time"] = datetime.now().isoformat()
+    training_log["best_score"] = best_score
+    with open(log_file, 'w') as f:
+        json.dump(training_log, f, indent=2)
+    return best_network, best_score
+
+def checkpoint_tournament(pattern, output="leaderboard.json", num_seeds=20, max_frames=10000, workers=None,
+                          decision_interval=1):
+    """Rank every checkpoint matching a glob or directory on the same seeds"""
+    from ai.tournament import find_checkpoints, run_tournament
+    
+    checkpoints = find_checkpoints(pattern)
+    if not checkpoints:
+        print(f"No checkpoints match {pattern}")
+        return []
+    print(f"Evaluating {len(checkpoints)} checkpoints on {num_seeds} seeds (max {max_frames} frames)")
+    
+    start = time.time()
+    entries = run_tournament(checkpoints, seeds=range(num_seeds), max_frames=max_frames, output=output,
+                             workers=workers, decision_interval=decision_interval,
+                             callback=lambda done, total: print(f"  {done}/{total} evaluated", end="\r"))
+    print(f"\nEvaluated {len(checkpoints)} checkpoints in {time.time() - start:.1f}s")
+    for rank, entry in enumerate(entries[:10], 1):
+        print(f"  {rank:2d}. {entry['mean']:7.1f} mean | {entry['min']:4d} min | {entry['p50']:6.1f} p50 | "
+              f"{entry['path']}")
+    print(f"Leaderboard saved to {output}")
+    return entries
+
+def quantization_report(pattern, dtype="int8", num_seeds=20, max_frames=10000, tolerance=1.0, decision_interval=1):
+    """Check that checkpoints keep their fitness with float16/int8 weights and report memory per genome"""
+    from ai.tournament import find_checkpoints
+    from ai.neural_network import NeuralNetwork
+    from ai.quantization import check_fitness_tolerance, module_bytes_per_genome
+    
+    checkpoints = find_checkpoints(pattern)
+    if not checkpoints:
+        print(f"No checkpoints match {pattern}")
+        return None
+    networks = []
+    for path in checkpoints:
+        network = NeuralNetwork()
+        network.load(path)
+        networks.append(network)
+    print(f"Comparing {dtype} against float32 for {len(networks)} checkpoints on {num_seeds} seeds "
+          f"(max {max_frames} frames)")
+    report = check_fitness_tolerance(networks, range(num_seeds), max_frames, dtype, tolerance, decision_interval)
+    report["module_bytes_per_genome"] = round(module_bytes_per_genome())
+    print(f"  Memory per genome: {report['bytes_per_genome']} bytes {dtype}, "
+          f"{report['float32_bytes_per_genome']} bytes float32, ~{report['module_bytes_per_genome']} bytes nn.Module")
+    print(f"  Score deviation: max {report['max_deviation']:.2f}, mean {report['mean_deviation']:.2f} "
+          f"({'within' if report['within_tolerance'] else 'OUTSIDE'} tolerance {tolerance})")
+    return report
+
+def export_episode(model_path, output, seed=None, max_frames=3600, frame_skip=2, scale=1.0, decision_interval=1):
+    """
+    Render one episode offscreen and save it as an animated GIF (output ends in .gif)
+    or a directory of PNG frames; works on headless hosts
+    """
+    # Offscreen rendering: no window, no display server needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from game.recorder import FrameRecorder
+    from ai.evaluation import play_episode, load_policy
+    
+    network = load_policy(model_path)
+    recorder = FrameRecorder(output, frame_skip=frame_skip, scale=scale)
+    
+    def record(game):
+        game.draw()
+        recorder.add_frame(game.screen)
+    
+    start = time.time()
+    try:
+        game = play_episode(network, seed=seed, max_frames=max_frames, on_frame=record,
+                            decision_interval=decision_interval)
+    finally:
+        frames = recorder.close()
+    print(f"Exported {frames} frames (score {game.score}, {game.frame_count} game frames) "
+          f"to {output} in {time.time() - start:.1f}s")
+    return game.score
+
+def planner_baseline(num_seeds=5, max_frames=10000, beam_width=64, depth=60):
+    """Score the beam-search planner on seeds 0..num_seeds-1 as a reference for trained networks"""
+    from ai.planner import BeamSearchPlanner, play_planner
+    
+    planner = BeamSearchPlanner(beam_width=beam_width, depth=depth)
+    print(f"Planning with beam width {beam_width}, depth {depth} on {num_seeds} seeds (max {max_frames} frames)")
+    scores = []
+    for seed in range(num_seeds):
+        game = play_planner(planner, seed=seed, max_frames=max_frames)
+        scores.append(game.score)
+        print(f"  Seed {seed}: score {game.score} in {game.frame_count} frames")
+    stats = planner.stats()
+    print(f"Mean score {sum(scores) / len(scores):.1f}")
+    print(f"  {stats['steps_per_decision']:.0f} simulated steps per decision, "
+          f"{stats['ms_per_decision']:.2f} ms per decision, {stats['steps_per_sec']:,.0f} steps/s")
+    return scores
+
+def decision_interval_report(model_path, intervals=(1, 2, 3, 4, 6), num_seeds=20, max_frames=10000):
+    """Print how a model's score and network queries change with the decision interval"""
+    from ai.evaluation import compare_decision_intervals, load_policy
+    
+    # Intervals are compared in the batched kernel, which needs network weights
+    if model_path.endswith(".npz"):
+        print(f"{model_path} is a compiled decision table; compare intervals on the .pth model it was built from")
+        return None
+    network = load_policy(model_path)
+    print(f"Scoring {model_path} on {num_seeds} seeds (max {max_frames} frames) at decision intervals {intervals}")
+    results = compare_decision_intervals(network, intervals, range(num_seeds), max_frames)
+    baseline = results[0]["mean_score"]
+    for result in results:
+        change = result["mean_score"] - baseline
+        print(f"  k={result['decision_interval']}: mean score {result['mean_score']:6.1f} ({change:+6.1f}) | "
+              f"min {result['min_score']:4d} | {result['queries_per_episode']:8.0f} network queries per episode")
+    return results
+
+def compile_decision_table(model_path, output_path=None):
+    """Compile a trained model into a bit-packed decision table and report its accuracy"""
+    from ai.neural_network import NeuralNetwork
+    from ai.decision_table import compile_network
+    from ai.episode_kernel import run_episodes
+    
+    network = NeuralNetwork()
+    network.load(model_path)
+    output_path = output_path or os.path.splitext(model_path)[0] + "_table.npz"
+    
+    start = time.time()
+    table = compile_network(network)
+    print(f"Compiled {model_path} in {time.time() - start:.1f}s")
+    print(f"  Grid: {' x '.join(str(b) for b in table.bins)} cells, {table.memory_bytes() / 1024:.0f} KiB")
+    print(f"  Disagreement with network on visited states: {table.disagreement:.2%}")
+    
+    seeds = list(range(16))
+    exact_scores, _ = run_episodes([network], seeds, max_frames=10000)
+    table_scores, _ = table.play(seeds, max_frames=10000)
+    print(f"  Mean score over {len(seeds)} seeds: network {exact_scores.mean():.1f}, table {table_scores.mean():.1f}")
+    
+    table.save(output_path)
+    print(f"Decision table saved to {output_path}")
+    return table
+
+def _pop_option(name, default=None):
+    """Remove `name value` from sys.argv and return the value, so positional arguments stay in place"""
+    if name not in sys.argv:
+        return default
+    index = sys.argv.index(name)
+    value = sys.argv[index + 1]
+    del sys.argv[index:index + 2]
+    return value
 
 def main():
     """Main function with auto-training options"""
+    # Applies to every command that plays games; train and play back with the same value
+    decision_interval = int(_pop_option("--decision-interval", 1))
+    if decision_interval < 1:
+        print(f"--decision-interval must be at least 1, got {decision_interval}")
+        return
+    # Memory tracking for long runs: tracemalloc snapshots every N generations, RSS alarm in MB
+    memory_every = _pop_option("--memory-every")
+    memory_alarm_mb = _pop_option("--memory-alarm-mb")
+    memory_tracker = None
+    if memory_every or memory_alarm_mb:
+        from ai.instrumentation import MemoryTracker
+        memory_tracker = MemoryTracker(snapshot_every=int(memory_every) if memory_every else None,
+                                       alarm_mb=float(memory_alarm_mb) if memory_alarm_mb else None)
+    # Early stopping: generations without improvement, and wall-clock / simulated-frame budgets
+    patience = _pop_option("--patience")
+    patience = int(patience) if patience else None
+    min_delta = float(_pop_option("--min-delta", 0.0))
+    time_budget = _pop_option("--time-budget")
+    time_budget = float(time_budget) if time_budget else None
+    frame_budget = _pop_option("--frame-budget")
+    frame_budget = int(float(frame_budget)) if frame_budget else None
+    
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python auto_train.py train [generations]          - Auto train AI")
         print("  python auto_train.py continuous [sessions]        - Run continuous training sessions")
-        print("  python auto_train.py play <model>                 - Play with a trained model")
+        print("  python auto_train.py steady [evaluations] [workers] - Asynchronous steady-state training")
+        print("  python auto_train.py es [generations] [workers]   - Train with evolution strategies")
+        print("  python auto_train.py play <model> [--dirty-rects] - Play with a trained model")
+        print("  python auto_train.py compile <model> [output]     - Compile a model into a decision table")
+        print("  python auto_train.py export <model> <out.gif|dir> [seed] - Render an episode to a GIF or PNGs")
+        print("  python auto_train.py tournament <glob|dir> [output] [seeds] [max_frames] - Rank checkpoints")
+        print("  python auto_train.py plan [seeds] [max_frames]    - Score the beam-search planner baseline")
+        print("  python auto_train.py quantize <glob|dir> [float16|int8] [seeds] - Check quantized checkpoint scores")
+        print("  python auto_train.py intervals <model> [seeds]    - Compare scores across decision intervals")
+        print("Add --decision-interval K to query the network every K frames (train, play, export, tournament)")
+        print("Add --memory-every N and/or --memory-alarm-mb MB to track memory use (train, continuous)")
+        print("Add --patience N [--min-delta X], --time-budget SECONDS and/or --frame-budget FRAMES to stop")
+        print("  early (train, continuous; continuous budgets are shared by all sessions)")
         return
     
     command = sys.argv[1]
     
     if command == "train":
         generations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
-        auto_train_ai(generations=generations)
+        stopping = None
+        if patience is not None or time_budget is not None or frame_budget is not None:
+            from ai.early_stopping import StoppingCriteria
+            stopping = StoppingCriteria(patience=patience, min_delta=min_delta, time_budget=time_budget,
+                                        frame_budget=frame_budget)
+        auto_train_ai(generations=generations, decision_interval=decision_interval, memory_tracker=memory_tracker,
+                      stopping=stopping)
         
     elif command == "continuous":
         sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-        continuous_training_session(sessions=sessions)
+        continuous_training_session(sessions=sessions, decision_interval=decision_interval,
+                                    memory_tracker=memory_tracker, patience=patience, min_delta=min_delta,
+                                    time_budget=time_budget, frame_budget=frame_budget)
+        
+    elif command == "steady":
+        evaluations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        steady_state_train(evaluations=evaluations, workers=workers, decision_interval=decision_interval)
+        
+    elif command == "es":
+        generations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        es_train(generations=generations, workers=workers, decision_interval=decision_interval)
         
     elif command == "play":
         if len(sys.argv) < 3:
@@ -275,11 +1009,57 @@ def main():
             return
         model_path = sys.argv[2]
         
-        # Import play function from main
+        # play_with_ai initializes pygame itself
         from main import play_with_ai
-        # Initialize pygame for rendering
-        pygame.init()
-        play_with_ai(model_path)
+        play_with_ai(model_path, dirty_rects="--dirty-rects" in sys.argv[3:], decision_interval=decision_interval)
+        
+    elif command == "compile":
+        if len(sys.argv) < 3:
+            print("Please specify model path")
+            return
+        compile_decision_table(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        
+    elif command == "export":
+        if len(sys.argv) < 4:
+            print("Please specify model path and output (.gif file or PNG directory)")
+            return
+        export_episode(sys.argv[2], sys.argv[3], seed=int(sys.argv[4]) if len(sys.argv) > 4 else None,
+                       decision_interval=decision_interval)
+        
+    elif command == "tournament":
+        if len(sys.argv) < 3:
+            print("Please specify a checkpoint glob or directory")
+            return
+        checkpoint_tournament(
+            sys.argv[2],
+            output=sys.argv[3] if len(sys.argv) > 3 else "leaderboard.json",
+            num_seeds=int(sys.argv[4]) if len(sys.argv) > 4 else 20,
+            max_frames=int(sys.argv[5]) if len(sys.argv) > 5 else 10000,
+            decision_interval=decision_interval
+        )
+        
+    elif command == "quantize":
+        if len(sys.argv) < 3:
+            print("Please specify a checkpoint glob or directory")
+            return
+        quantization_report(
+            sys.argv[2],
+            dtype=sys.argv[3] if len(sys.argv) > 3 else "int8",
+            num_seeds=int(sys.argv[4]) if len(sys.argv) > 4 else 20,
+            decision_interval=decision_interval
+        )
+        
+    elif command == "plan":
+        planner_baseline(
+            num_seeds=int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+            max_frames=int(sys.argv[3]) if len(sys.argv) > 3 else 10000
+        )
+        
+    elif command == "intervals":
+        if len(sys.argv) < 3:
+            print("Please specify model path")
+            return
+        decision_interval_report(sys.argv[2], num_seeds=int(sys.argv[3]) if len(sys.argv) > 3 else 20)
         
     else:
         print(f"Unknown command: {command}")
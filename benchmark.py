@@ -0,0 +1,260 @@
+"""
+Benchmark suite for Flappy Bird AI
+Measures simulation, inference, evolution and rendering throughput
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+from datetime import datetime
+
+# Render benchmarks must work on headless hosts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Ensure we can import from subdirectories
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_THRESHOLD = 0.10  # Flag changes more than 10% worse than baseline
+EVOLVE_POPULATION_SIZES = (20, 1000, 10000)
+
+def _timed(fn, min_time=1.0):
+    """
+    Call fn repeatedly until min_time seconds have passed
+    fn returns how many units of work it did; returns units per second
+    """
+    units = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        units += fn()
+        elapsed = time.perf_counter() - start
+    return units / elapsed
+
+def bench_game_update(min_time=1.0):
+    """Physics frames per second for FlappyBirdGame.update"""
+    from game.flappy_bird import FlappyBirdGame
+    game = FlappyBirdGame(seed=0)
+
+    def run():
+        for _ in range(1000):
+            # Simple policy that keeps the bird near the next gap
+            if game.bird.y > game.pipes[0].gap_y + 75:
+                game.bird.flap()
+            game.update()
+            if game.game_over:
+                game.restart_game()
+        return 1000
+
+    return _timed(run, min_time)
+
+def bench_headless_play(min_time=1.0):
+    """Frames per second for a headless play_game_with_ai episode"""
+    import torch
+    from ai.neural_network import NeuralNetwork
+    from ai.evaluation import play_episode
+    torch.manual_seed(0)
+    network = NeuralNetwork()
+    seeds = iter(range(10 ** 9))
+    return _timed(lambda: play_episode(network, seed=next(seeds)).frame_count, min_time)
+
+def bench_kernel(min_time=1.0, population_size=100):
+    """Frames per second for the batched episode kernel (Numba when installed)"""
+    import torch
+    from ai.neural_network import NeuralNetwork
+    from ai.episode_kernel import run_episodes
+    torch.manual_seed(0)
+    networks = [NeuralNetwork() for _ in range(population_size)]
+    seeds = [0, 1, 2, 3]
+    run_episodes(networks[:1], seeds[:1], 10)  # Exclude JIT compilation
+
+    def run():
+        _, frames = run_episodes(networks, seeds, max_frames=2000)
+        return int(frames.sum())
+
+    return _timed(run, min_time)
+
+def bench_vector_env(min_time=1.0, num_envs=1024):
+    """Environment steps per second for VectorFlappyBirdEnv with a scripted policy"""
+    from game.vector_env import VectorFlappyBirdEnv
+    env = VectorFlappyBirdEnv(num_envs)
+    obs = env.reset(0)
+
+    def run():
+        nonlocal obs
+        for _ in range(100):
+            obs, _, _, _ = env.step(obs[:, 0] > obs[:, 3] + 0.1)
+        return 100 * num_envs
+
+    return _timed(run, min_time)
+
+def bench_predict(min_time=1.0):
+    """Predictions per second for NeuralNetwork.predict"""
+    from ai.neural_network import NeuralNetwork
+    network = NeuralNetwork()
+    state = [0.5, 0.1, 0.8, 0.6]
+
+    def run():
+        for _ in range(1000):
+            network.predict(state)
+        return 1000
+
+    return _timed(run, min_time)
+
+def bench_evolve(population_size, repeats=3):
+    """Milliseconds per EnhancedGeneticAlgorithm.evolve() call"""
+    from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm
+    rng = random.Random(0)
+    ga = EnhancedGeneticAlgorithm(population_size=population_size,
+                                  elite_size=min(4, population_size // 2))
+    # Large populations are slow enough that one call is representative
+    repeats = 1 if population_size >= 10000 else repeats
+
+    best = float("inf")
+    for _ in range(repeats):
+        ga.set_fitness_scores([rng.randint(0, 100) for _ in range(population_size)])
+        start = time.perf_counter()
+        ga.evolve()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench_draw(min_time=1.0, dirty_rects=False):
+    """Rendered frames per second for FlappyBirdGame.draw under the current SDL driver"""
+    from game.flappy_bird import FlappyBirdGame
+    game = FlappyBirdGame(seed=0, dirty_rects=dirty_rects)
+
+    def run():
+        for _ in range(50):
+            game.update()
+            if game.game_over:
+                game.restart_game()
+            game.draw()
+        return 50
+
+    return _timed(run, min_time)
+
+def bench_planner(min_time=1.0):
+    """Simulated lookahead steps per second for the beam-search planner"""
+    from game.flappy_bird import FlappyBirdGame
+    from ai.planner import BeamSearchPlanner
+    game = FlappyBirdGame(seed=0)
+    planner = BeamSearchPlanner()
+    state = game.snapshot()
+
+    def run():
+        before = planner.simulated_steps
+        for _ in range(10):
+            if planner.plan(game.snapshot_into(state)):
+                game.bird.flap()
+            game.update()
+            if game.game_over:
+                game.restart_game()
+        return planner.simulated_steps - before
+
+    return _timed(run, min_time)
+
+def run_benchmarks(min_time=1.0, population_sizes=EVOLVE_POPULATION_SIZES):
+    """Run every benchmark and return a JSON-serializable report"""
+    results = {}
+
+    def record(name, value, unit, higher_is_better):
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"  {name:28s} {value:12.1f} {unit}")
+
+    print("Running benchmarks...")
+    record("game_update_fps", bench_game_update(min_time), "frames/s", True)
+    record("headless_play_fps", bench_headless_play(min_time), "frames/s", True)
+    record("kernel_fps", bench_kernel(min_time), "frames/s", True)
+    record("vector_env_steps_per_sec", bench_vector_env(min_time), "steps/s", True)
+    record("predict_per_sec", bench_predict(min_time), "predictions/s", True)
+    record("planner_steps_per_sec", bench_planner(min_time), "steps/s", True)
+    for size in population_sizes:
+        record(f"evolve_ms_pop_{size}", bench_evolve(size), "ms", False)
+    record("draw_fps", bench_draw(min_time), "frames/s", True)
+    record("draw_dirty_rects_fps", bench_draw(min_time, dirty_rects=True), "frames/s", True)
+
+    import torch
+    import pygame
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "torch": torch.__version__,
+            "pygame": pygame.version.ver,
+            "sdl_videodriver": os.environ.get("SDL_VIDEODRIVER")
+        },
+        "results": results
+    }
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two benchmark reports
+    Returns a list of (name, baseline value, current value, relative change, regressed)
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        base_value = base["value"]
+        value = current["results"][name]["value"]
+        change = (value - base_value) / base_value if base_value else 0.0
+        # Positive change is always an improvement after this adjustment
+        improvement = change if base["higher_is_better"] else -change
+        rows.append((name, base_value, value, change, improvement < -threshold))
+    return rows
+
+def print_comparison(rows, threshold):
+    """Print a comparison table and return the number of regressions"""
+    print(f"{'benchmark':28s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    regressions = 0
+    for name, base_value, value, change, regressed in rows:
+        flag = "  ⚠️ REGRESSION" if regressed else ""
+        print(f"{name:28s} {base_value:12.1f} {value:12.1f} {change:+7.1%}{flag}")
+        regressions += regressed
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+def main():
+    """Main function with benchmark options"""
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python benchmark.py run [output.json]                       - Run benchmarks and save JSON")
+        print("  python benchmark.py compare <baseline.json> [current.json]  - Compare against a baseline")
+        print("                                                                (runs benchmarks if current is omitted)")
+        print("Set BENCHMARK_THRESHOLD to change the regression threshold (default 0.10)")
+        return
+
+    command = sys.argv[1]
+
+    if command == "run":
+        output = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OUTPUT
+        report = run_benchmarks()
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {output}")
+
+    elif command == "compare":
+        if len(sys.argv) < 3:
+            print("Please specify baseline file")
+            return
+        with open(sys.argv[2]) as f:
+            baseline = json.load(f)
+        if len(sys.argv) > 3:
+            with open(sys.argv[3]) as f:
+                current = json.load(f)
+        else:
+            current = run_benchmarks()
+
+        threshold = float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD))
+        regressions = print_comparison(compare_reports(baseline, current, threshold), threshold)
+        sys.exit(1 if regressions else 0)
+
+    else:
+        print(f"Unknown command: {command}")
+
+if __name__ == "__main__":
+    main()
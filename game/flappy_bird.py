@@ -1,6 +1,11 @@
 import pygame
 import random
 import sys
+from array import array
+try:
+    from game.timestep import FixedTimestep, FrameTimeStats, RENDER_FPS
+except ImportError:  # Run directly as python game/flappy_bird.py
+    from timestep import FixedTimestep, FrameTimeStats, RENDER_FPS
 
 # Game constants
 SCREEN_WIDTH = 400
@@ -12,11 +17,14 @@ PIPE_GAP = 150
 BIRD_WIDTH = 30
 BIRD_HEIGHT = 30
 PIPE_WIDTH = 50
+BIRD_X = 50
+PIPE_SPAWN_INTERVAL = 100  # Frames between new pipes
 
 class Bird:
     def __init__(self):
-        self.x = 50
+        self.x = BIRD_X
         self.y = SCREEN_HEIGHT // 2
+        self.prev_y = self.y  # Position before the last update, for render interpolation
         self.velocity = 0
         self.alive = True
         self.flap_counter = 0
@@ -28,6 +36,7 @@ class Bird:
         self.flap_counter = 5
     
     def update(self):
+        self.prev_y = self.y
         self.velocity += GRAVITY
         self.y += self.velocity
         
@@ -56,9 +65,14 @@ class Bird:
         return self.alive
 
 class Pipe:
-    def __init__(self):
-        self.gap_y = random.randint(100, SCREEN_HEIGHT - 100 - PIPE_GAP)
+    def __init__(self, rng=None, gap_y=None):
+        # Gap positions come from the game's own RNG so seeded games are reproducible
+        if gap_y is None:
+            rng = rng if rng is not None else random
+            gap_y = rng.randint(100, SCREEN_HEIGHT - 100 - PIPE_GAP)
+        self.gap_y = gap_y
         self.x = SCREEN_WIDTH
+        self.prev_x = self.x
         self.passed = False
         self.color = (34, 139, 34)  # Forest green
         self.top_pipe_color = (34, 139, 34)
@@ -66,6 +80,7 @@ class Pipe:
         self.cap_color = (0, 100, 0)
     
     def update(self):
+        self.prev_x = self.x
         self.x -= PIPE_SPEED
     
     def get_rects(self):
@@ -78,8 +93,67 @@ class Pipe:
     def is_off_screen(self):
         return self.x + PIPE_WIDTH < 0
 
+def pipe_gap_sequence(seed, count):
+    """Return the gap positions of the first `count` pipes of a game seeded with `seed`"""
+    rng = random.Random(seed)
+    return [Pipe(rng).gap_y for _ in range(count)]
+
+# GameState.values layout: scalar fields, then PIPE_FIELDS per pipe slot
+STATE_FIELDS = ("y", "prev_y", "velocity", "rotation", "flap_counter", "animation_counter", "alive",
+                "score", "game_over", "pipe_timer", "frame_count", "num_pipes")
+PIPE_FIELDS = ("x", "prev_x", "gap_y", "passed")
+PIPE_SLOTS = 4  # Pipes a snapshot can hold; at most 2 are ever on screen
+
+class GameState:
+    """
+    Array-backed snapshot of everything update() reads or writes: bird, pipe
+    buffer, pipe timer, score and the pipe RNG state.
+    
+    clone() is one flat array copy (the RNG state is an immutable tuple and is
+    shared), and copy_from() overwrites a state in place without allocating.
+    FlappyBirdGame.snapshot_into() and restore() reuse existing objects, so a
+    snapshot/restore loop only allocates the RNG state tuple per snapshot.
+    """
+    __slots__ = ("values", "rng_state")
+    
+    def __init__(self, values, rng_state):
+        self.values = values
+        self.rng_state = rng_state
+    
+    def clone(self):
+        return GameState(self.values[:], self.rng_state)
+    
+    def copy_from(self, other):
+        self.values[:] = other.values
+        self.rng_state = other.rng_state
+    
+    def __getattr__(self, name):
+        # Read-only access to scalar fields, e.g. state.y or state.frame_count
+        try:
+            return self.values[STATE_FIELDS.index(name)]
+        except ValueError:
+            raise AttributeError(name) from None
+    
+    def pipe_gaps(self, frames_ahead):
+        """
+        Gap heights of the pipes on screen plus every pipe spawned in the next
+        frames_ahead frames, as (index of the first pipe, [gap_y, ...]). Pipe k
+        spawns on frame k * PIPE_SPAWN_INTERVAL; future gaps are drawn from a
+        copy of the RNG state, so the snapshot itself is unchanged.
+        """
+        frame = int(self.frame_count)
+        num_pipes = int(self.num_pipes)
+        base = len(STATE_FIELDS)
+        gaps = [int(self.values[base + i * len(PIPE_FIELDS) + 2]) for i in range(num_pipes)]
+        last = frame // PIPE_SPAWN_INTERVAL  # Index of the newest spawned pipe
+        rng = random.Random()
+        rng.setstate(self.rng_state)
+        for _ in range(last + 1, (frame + frames_ahead) // PIPE_SPAWN_INTERVAL + 1):
+            gaps.append(Pipe(rng).gap_y)
+        return last - num_pipes + 1, gaps
+
 class FlappyBirdGame:
-    def __init__(self):
+    def __init__(self, seed=None, dirty_rects=False):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Flappy Bird")
@@ -87,6 +161,10 @@ class FlappyBirdGame:
         self.font = pygame.font.SysFont("Arial", 24, bold=True)
         self.big_font = pygame.font.SysFont("Arial", 36, bold=True)
         
+        # Pipe layout RNG; cosmetic effects (clouds, grass) keep using the global one
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
         self.bird = Bird()
         self.pipes = []
         self.score = 0
@@ -96,10 +174,29 @@ class FlappyBirdGame:
         self.generate_clouds()
         
         # Add initial pipe
-        self.pipes.append(Pipe())
+        self.pipes.append(Pipe(self.rng))
+        # Pipes restore() fills in place instead of building new ones
+        self.pipe_pool = [Pipe(gap_y=0) for _ in range(PIPE_SLOTS)]
         
         # Timer for adding new pipes
         self.pipe_timer = 0
+        
+        # Number of physics steps simulated this episode
+        self.frame_count = 0
+        
+        # Fraction of the way from the previous physics state to the current one
+        # that draw() shows; 1.0 draws the current state as is
+        self.interpolation = 1.0
+        # Rolling update/render times (see run), optionally drawn on screen
+        self.frame_stats = None
+        self.show_frame_stats = False
+        
+        # Dirty-rect mode: static scenery is cached and only the areas sprites
+        # covered last frame or cover now are repainted and presented
+        self.dirty_rects = dirty_rects
+        self.background = None
+        self.ground_layer = None
+        self.dirty = None  # Rects drawn last frame; None forces a full repaint
     
     def generate_clouds(self):
         """Generate initial clouds"""
@@ -123,11 +220,15 @@ class FlappyBirdGame:
                     self.bird.flap()
                 if event.key == pygame.K_r and self.game_over:
                     self.restart_game()
+            if event.type == pygame.VIDEORESIZE:
+                self.background = None
     
     def update(self):
         if self.game_over:
             return
         
+        self.frame_count += 1
+        
         # Update bird
         self.bird.update()
         
@@ -145,8 +246,8 @@ class FlappyBirdGame:
         
         # Add new pipes
         self.pipe_timer += 1
-        if self.pipe_timer >= 100:  # Add a new pipe every 100 frames
-            self.pipes.append(Pipe())
+        if self.pipe_timer >= PIPE_SPAWN_INTERVAL:  # Add a new pipe every 100 frames
+            self.pipes.append(Pipe(self.rng))
             self.pipe_timer = 0
         
         # Check for collisions and scoring
@@ -166,6 +267,11 @@ class FlappyBirdGame:
     
     def draw_background(self):
         """Draw a beautiful sky background with clouds"""
+        self.draw_sky()
+        self.draw_clouds()
+    
+    def draw_sky(self):
+        """Draw the sky gradient and sun"""
         # Sky gradient
         for y in range(SCREEN_HEIGHT):
             color_value = 135 + int(121 * (y / SCREEN_HEIGHT))
@@ -174,19 +280,23 @@ class FlappyBirdGame:
         
         # Draw sun
         pygame.draw.circle(self.screen, (255, 255, 200), (SCREEN_WIDTH - 50, 50), 30)
-        
-        # Draw clouds
+    
+    def draw_clouds(self):
+        """Draw and move the clouds; returns the rects drawn"""
+        rects = []
         for cloud in self.clouds:
             x, y, width, height, speed = cloud
-            pygame.draw.ellipse(self.screen, (250, 250, 250), (x, y, width, height))
-            pygame.draw.ellipse(self.screen, (250, 250, 250), (x + 10, y - 10, width - 10, height))
-            pygame.draw.ellipse(self.screen, (250, 250, 250), (x + 15, y + 5, width - 15, height))
+            rect = pygame.draw.ellipse(self.screen, (250, 250, 250), (x, y, width, height))
+            rect.union_ip(pygame.draw.ellipse(self.screen, (250, 250, 250), (x + 10, y - 10, width - 10, height)))
+            rect.union_ip(pygame.draw.ellipse(self.screen, (250, 250, 250), (x + 15, y + 5, width - 15, height)))
+            rects.append(rect)
             
             # Move cloud
             cloud[0] -= speed
             if cloud[0] < -100:
                 cloud[0] = SCREEN_WIDTH + 20
                 cloud[1] = random.randint(20, 150)
+        return rects
     
     def draw_ground(self):
         """Draw a grassy ground"""
@@ -235,12 +345,12 @@ class FlappyBirdGame:
         # Rotate and draw bird
         rotated_bird = pygame.transform.rotate(bird_surface, -self.bird.rotation)
         bird_rect = rotated_bird.get_rect(center=(self.bird.x + BIRD_WIDTH//2, 
-                                                 self.bird.y + BIRD_HEIGHT//2))
-        self.screen.blit(rotated_bird, bird_rect.topleft)
+                                                 self.render_y(self.bird) + BIRD_HEIGHT//2))
+        return self.screen.blit(rotated_bird, bird_rect.topleft)
     
     def draw_pipe(self, pipe):
         """Draw a detailed pipe with caps"""
-        top_pipe, bottom_pipe = pipe.get_rects()
+        top_pipe, bottom_pipe = self.render_rects(pipe)
         
         # Draw pipe body
         pygame.draw.rect(self.screen, pipe.top_pipe_color, top_pipe)
@@ -254,13 +364,31 @@ class FlappyBirdGame:
         pygame.draw.rect(self.screen, pipe.cap_color, 
                         (bottom_pipe.x - 3, bottom_pipe.y, 
                          PIPE_WIDTH + 6, cap_height))
+        return top_pipe.union(bottom_pipe).inflate(6, 0)
+    
+    def render_y(self, bird):
+        """Bird height to draw, interpolated between the last two physics steps"""
+        return bird.prev_y + (bird.y - bird.prev_y) * self.interpolation
+    
+    def render_rects(self, pipe):
+        """Pipe rects to draw, interpolated between the last two physics steps"""
+        top_pipe, bottom_pipe = pipe.get_rects()
+        x = round(pipe.prev_x + (pipe.x - pipe.prev_x) * self.interpolation)
+        top_pipe.x = bottom_pipe.x = x
+        return top_pipe, bottom_pipe
+    
+    def draw_frame_stats(self):
+        """Draw p50/p99 update and render times"""
+        if not hasattr(self, "stats_font"):
+            self.stats_font = pygame.font.SysFont("Arial", 12)
+        text = self.stats_font.render(self.frame_stats.overlay_text(), True, (0, 0, 0))
+        return self.screen.blit(text, (10, SCREEN_HEIGHT - 38))
     
     def draw_score(self):
         """Draw the score with shadow effect"""
         score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
         shadow = self.font.render(f"Score: {self.score}", True, (0, 0, 0))
-        self.screen.blit(shadow, (11, 11))
-        self.screen.blit(score_text, (10, 10))
+        return self.screen.blit(shadow, (11, 11)).union(self.screen.blit(score_text, (10, 10)))
     
     def draw_game_over(self):
         """Draw the game over screen"""
@@ -284,6 +412,10 @@ class FlappyBirdGame:
     
     def draw(self):
         """Enhanced draw method"""
+        if self.dirty_rects:
+            self.draw_dirty()
+            return
+        
         self.draw_background()
         
         # Draw pipes
@@ -303,25 +435,167 @@ class FlappyBirdGame:
         if self.game_over:
             self.draw_game_over()
         
+        if self.show_frame_stats and self.frame_stats is not None:
+            self.draw_frame_stats()
+        
         pygame.display.flip()
     
+    def cache_background(self):
+        """Render the static scenery once: sky and sun, and the ground as a transparent layer"""
+        screen = self.screen
+        try:
+            # The draw_* methods paint self.screen, so point it at the cache surfaces
+            self.screen = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.draw_ground()
+            self.ground_layer = self.screen
+            self.screen = pygame.Surface(screen.get_size())
+            self.draw_sky()
+            self.screen.blit(self.ground_layer, (0, 0))
+            self.background = self.screen
+        finally:
+            self.screen = screen
+        self.dirty = None
+    
+    def draw_dirty(self):
+        """
+        Dirty-rect draw: restore last frame's sprite areas from the cached
+        background, redraw the sprites and present only the rects that changed.
+        Game over and resizes repaint and flip the whole screen.
+        Grass is drawn once into the cache, so it does not flicker in this mode.
+        """
+        if self.background is None or self.background.get_size() != self.screen.get_size():
+            self.cache_background()
+        full = self.dirty is None or self.game_over
+        bounds = self.screen.get_rect()
+        if full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.dirty:
+                self.screen.blit(self.background, rect, rect)
+        
+        rects = self.draw_clouds()
+        for pipe in self.pipes:
+            rect = self.draw_pipe(pipe).clip(bounds)
+            # The ground is drawn over the bottom of the pipes
+            self.screen.blit(self.ground_layer, rect, rect)
+            rects.append(rect)
+        rects.append(self.draw_bird())
+        rects.append(self.draw_score())
+        if self.show_frame_stats and self.frame_stats is not None:
+            rects.append(self.draw_frame_stats())
+        rects = [rect.clip(bounds) for rect in rects]
+        
+        if self.game_over:
+            self.draw_game_over()
+            # The overlay covers everything, so the next frame starts from scratch
+            self.dirty = None
+            pygame.display.flip()
+        elif full:
+            self.dirty = rects
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty + rects)
+            self.dirty = rects
+    
+    def snapshot(self):
+        """Copy the simulation state (not the display) into a new GameState"""
+        # Fixed size, so copy_from() between any two snapshots never reallocates
+        state = GameState(array("d", bytes(8 * (len(STATE_FIELDS) + len(PIPE_FIELDS) * PIPE_SLOTS))), None)
+        return self.snapshot_into(state)
+    
+    def snapshot_into(self, state):
+        """Overwrite an existing GameState with the simulation state; returns it"""
+        bird = self.bird
+        if len(self.pipes) > PIPE_SLOTS:
+            raise ValueError(f"More than {PIPE_SLOTS} pipes on screen")
+        values = state.values
+        values[0] = bird.y
+        values[1] = bird.prev_y
+        values[2] = bird.velocity
+        values[3] = bird.rotation
+        values[4] = bird.flap_counter
+        values[5] = bird.animation_counter
+        values[6] = bird.alive
+        values[7] = self.score
+        values[8] = self.game_over
+        values[9] = self.pipe_timer
+        values[10] = self.frame_count
+        values[11] = len(self.pipes)
+        base = len(STATE_FIELDS)
+        for pipe in self.pipes:
+            values[base] = pipe.x
+            values[base + 1] = pipe.prev_x
+            values[base + 2] = pipe.gap_y
+            values[base + 3] = pipe.passed
+            base += len(PIPE_FIELDS)
+        # Unused slots are zeroed so equal games give equal snapshots
+        for i in range(base, len(values)):
+            values[i] = 0.0
+        state.rng_state = self.rng.getstate()
+        return state
+    
+    def restore(self, state):
+        """
+        Put the game back into a snapshotted state. Pipes are refilled from the
+        game's fixed pool of PIPE_SLOTS, so restoring allocates no objects
+        """
+        values = state.values
+        bird = self.bird
+        bird.y = values[0]
+        bird.prev_y = values[1]
+        bird.velocity = values[2]
+        bird.rotation = values[3]
+        bird.flap_counter = int(values[4])
+        bird.animation_counter = values[5]
+        bird.alive = bool(values[6])
+        self.score = int(values[7])
+        self.game_over = bool(values[8])
+        self.pipe_timer = int(values[9])
+        self.frame_count = int(values[10])
+        self.pipes.clear()
+        base = len(STATE_FIELDS)
+        for i in range(int(values[11])):
+            pipe = self.pipe_pool[i]
+            pipe.x = int(values[base])
+            pipe.prev_x = int(values[base + 1])
+            pipe.gap_y = int(values[base + 2])
+            pipe.passed = bool(values[base + 3])
+            self.pipes.append(pipe)
+            base += len(PIPE_FIELDS)
+        self.rng.setstate(state.rng_state)
+    
     def restart_game(self):
         self.bird = Bird()
         self.pipes = []
         self.score = 0
         self.game_over = False
-        self.pipes.append(Pipe())
+        self.pipes.append(Pipe(self.rng))
         self.pipe_timer = 0
+        self.frame_count = 0
         self.generate_clouds()
     
-    def run(self):
-        while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+    def run(self, render_fps=RENDER_FPS, show_frame_stats=True):
+        """
+        Fixed-timestep loop: physics runs at exactly PHYSICS_HZ steps per second of
+        wall time, rendering runs at up to render_fps with interpolated positions
+        """
+        timestep = FixedTimestep()
+        self.frame_stats = FrameTimeStats()
+        self.show_frame_stats = show_frame_stats
+        try:
+            while True:
+                self.handle_events()
+                for _ in range(timestep.advance()):
+                    with self.frame_stats.time("update"):
+                        self.update()
+                self.interpolation = timestep.alpha
+                with self.frame_stats.time("render"):
+                    self.draw()
+                self.clock.tick(render_fps)
+        finally:
+            print(f"Frame times: {self.frame_stats.overlay_text()}")
 
 # For manual play testing
 if __name__ == "__main__":
-    game = FlappyBirdGame()
+    game = FlappyBirdGame(dirty_rects="--dirty-rects" in sys.argv)
     game.run()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Offscreen episode recording to a PNG sequence or an animated GIF.
+
+The game loop only copies each rendered frame's pixels into a bounded queue;
+a background thread does the encoding, so encoding overlaps simulation.
+When the encoder falls behind, the queue fills and the game loop waits
+instead of buffering without limit.
+
+GIFs are written frame by frame as they are encoded (each frame with its own
+palette), so memory stays bounded by the queue however long the episode is,
+and close() only writes the trailer.
+
+PNG sequences use pygame only. Animated GIFs need Pillow (pip install pillow).
+"""
+
+import os
+import queue
+import threading
+import pygame
+
+try:
+    from PIL import Image, GifImagePlugin
+except ImportError:
+    Image = None
+
+FORMATS = ("png", "gif")
+
+class FrameRecorder:
+    """
+    Bounded-queue frame sink with a background encoder thread.
+
+    output: directory for a PNG sequence, or a .gif file path
+    frame_skip: keep every Nth frame offered (the game runs at 60 fps)
+    scale: resize factor applied before encoding
+    """
+    def __init__(self, output, fmt=None, fps=60, frame_skip=2, scale=1.0, queue_size=64):
+        fmt = fmt or ("gif" if output.lower().endswith(".gif") else "png")
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}")
+        if fmt == "gif" and Image is None:
+            raise ImportError("GIF export requires Pillow (pip install pillow)")
+        self.output = output
+        self.fmt = fmt
+        self.frame_skip = max(1, frame_skip)
+        self.frame_duration_ms = 1000 * self.frame_skip / fps
+        self.scale = scale
+        self.frames_offered = 0
+        self.frames_written = 0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self._gif_file = None
+
+        if fmt == "png":
+            os.makedirs(output, exist_ok=True)
+        self.thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+
+    def add_frame(self, surface):
+        """Queue a copy of the surface's pixels; blocks while the queue is full"""
+        if self.error is not None:
+            raise RuntimeError(f"Frame encoder failed: {self.error}")
+        index = self.frames_offered
+        self.frames_offered += 1
+        if index % self.frame_skip:
+            return
+        if self.scale != 1.0:
+            size = (round(surface.get_width() * self.scale), round(surface.get_height() * self.scale))
+            surface = pygame.transform.smoothscale(surface, size)
+        self.queue.put((surface.get_size(), pygame.image.tobytes(surface, "RGB")))
+
+    def _encode_loop(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                if self.error is not None:
+                    continue  # Keep draining so add_frame never blocks forever
+                self._encode(*item)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _encode(self, size, pixels):
+        if self.fmt == "png":
+            path = os.path.join(self.output, f"frame_{self.frames_written:05d}.png")
+            pygame.image.save(pygame.image.frombytes(pixels, size, "RGB"), path)
+        else:
+            # Palette conversion and LZW compression are the expensive part, so they happen here
+            frame = Image.frombytes("RGB", size, pixels).quantize(colors=256)
+            duration = round(self.frame_duration_ms)
+            if self._gif_file is None:
+                self._gif_file = open(self.output, 'wb')
+                header, _ = GifImagePlugin.getheader(frame, info={"loop": 0, "duration": duration})
+                self._gif_file.write(b"".join(header))
+            chunks = GifImagePlugin.getdata(frame, duration=duration, include_color_table=True)
+            self._gif_file.write(b"".join(chunks))
+            self._gif_file.flush()
+        self.frames_written += 1
+
+    def close(self):
+        """Flush the queue, finish encoding and end the GIF; returns frames written"""
+        self.queue.put(None)
+        self.thread.join()
+        if self._gif_file is not None:
+            self._gif_file.write(b";")  # GIF trailer
+            self._gif_file.close()
+            self._gif_file = None
+        if self.error is not None:
+            raise RuntimeError(f"Frame encoder failed: {self.error}")
+        return self.frames_written
@@ -0,0 +1,73 @@
+"""
+Fixed-timestep loop helpers for the rendered game.
+
+Physics always advances in steps of exactly 1 / PHYSICS_HZ seconds of wall
+time, however fast or slow rendering is. Leftover time is exposed as an
+interpolation factor so the renderer can draw positions between the last two
+physics states instead of stuttering.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PHYSICS_HZ = 60
+RENDER_FPS = 120  # Upper bound on rendered frames per second; 0 renders as fast as possible
+MAX_FRAME_TIME = 0.25  # Seconds; longer stalls are dropped rather than replayed
+
+class FixedTimestep:
+    """Accumulates wall time and hands it out as whole physics steps"""
+    def __init__(self, hz=PHYSICS_HZ, max_frame_time=MAX_FRAME_TIME):
+        self.step = 1.0 / hz
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.previous = None
+
+    def advance(self):
+        """Return how many physics steps are due since the last call"""
+        now = time.perf_counter()
+        if self.previous is None:
+            # The first call always runs one step so there is something to draw
+            self.previous = now
+            return 1
+        # Clamping avoids a spiral of catch-up steps after a long stall
+        self.accumulator += min(now - self.previous, self.max_frame_time)
+        self.previous = now
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """How far between the last two physics states the display is, in [0, 1)"""
+        return self.accumulator / self.step
+
+class FrameTimeStats:
+    """Rolling samples of per-frame update and render times in milliseconds"""
+    def __init__(self, window=600):
+        self.samples = {"update": deque(maxlen=window), "render": deque(maxlen=window)}
+
+    @contextmanager
+    def time(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, deque(maxlen=self.samples["update"].maxlen)).append(
+                (time.perf_counter() - start) * 1000)
+
+    def percentile(self, name, q):
+        values = sorted(self.samples.get(name, ()))
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+    def summary(self):
+        """{"update": {"p50": ms, "p99": ms}, "render": {...}}"""
+        return {name: {"p50": self.percentile(name, 50), "p99": self.percentile(name, 99)}
+                for name in self.samples}
+
+    def overlay_text(self):
+        stats = self.summary()
+        return (f"update {stats['update']['p50']:.2f}/{stats['update']['p99']:.2f}ms  "
+                f"render {stats['render']['p50']:.2f}/{stats['render']['p99']:.2f}ms (p50/p99)")
@@ -0,0 +1,170 @@
+"""
+Gym-style vectorized Flappy Bird environment.
+
+Steps N independent games at once with NumPy. Physics, pipe layout, collision
+and scoring match FlappyBirdGame, and a slot reset with seed s sees the same
+pipes as FlappyBirdGame(seed=s).
+
+Every pipe spawns at the right edge every PIPE_SPAWN_INTERVAL frames and
+scrolls at PIPE_SPEED, so which pipe is next, which pipe the bird can touch
+and when a pipe is passed all follow from the episode frame number. Only the
+gap heights need storing, in a small per-slot ring.
+"""
+
+import math
+import random
+import numpy as np
+from game.flappy_bird import (SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, FLAP_POWER, PIPE_SPEED, PIPE_GAP,
+                              BIRD_X, BIRD_WIDTH, BIRD_HEIGHT, PIPE_WIDTH, PIPE_SPAWN_INTERVAL, Pipe)
+
+# A pipe's age in frames decides where it is: x = SCREEN_WIDTH - PIPE_SPEED * age.
+# It can touch the bird while BIRD_X < x + PIPE_WIDTH and x < BIRD_X + BIRD_WIDTH,
+# it is the observed "next pipe" while x + PIPE_WIDTH > BIRD_X, and it is
+# scored on the first frame with x + PIPE_WIDTH < BIRD_X
+_HIT_AGE_MIN = math.floor((SCREEN_WIDTH - (BIRD_X + BIRD_WIDTH)) / PIPE_SPEED) + 1
+_HIT_AGE_MAX = math.ceil((SCREEN_WIDTH + PIPE_WIDTH - BIRD_X) / PIPE_SPEED) - 1
+_NEXT_AGE_MAX = _HIT_AGE_MAX
+_PASS_AGE = math.floor((SCREEN_WIDTH + PIPE_WIDTH - BIRD_X) / PIPE_SPEED) + 1
+GAP_RING = 4
+
+class VectorFlappyBirdEnv:
+    """
+    N parallel headless games with reset(seed) / step(actions).
+
+    Observations are the normalized [bird_y, velocity, pipe_x, gap_y] used by
+    play_game_with_ai, as an (N, 4) float32 array. Rewards are pipes passed
+    this step plus alive_reward for surviving, minus death_penalty on death.
+
+    With auto_reset, finished slots start a new episode immediately and the
+    returned observation is the new episode's first one; the finished
+    episode's score and length are in infos["final_score"] / ["final_frames"].
+    Without it, finished slots stay frozen until the next reset().
+    """
+    def __init__(self, num_envs, auto_reset=True, max_episode_frames=None,
+                 alive_reward=0.0, death_penalty=1.0):
+        self.num_envs = num_envs
+        self.auto_reset = auto_reset
+        self.max_episode_frames = max_episode_frames
+        self.alive_reward = alive_reward
+        self.death_penalty = death_penalty
+
+        self.y = np.zeros(num_envs)
+        self.velocity = np.zeros(num_envs)
+        self.frames = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.gaps = np.zeros((num_envs, GAP_RING), dtype=np.int64)
+        self.finished = np.zeros(num_envs, dtype=bool)
+        self.seeds = np.zeros(num_envs, dtype=np.int64)
+        self.rngs = [None] * num_envs
+        self.next_seed = None
+
+    def reset(self, seed=None):
+        """
+        Start a new episode in every slot
+        seed: int (slot i uses seed + i, later episodes seed + i + k * num_envs),
+              a sequence with one seed per slot, or None for random seeds
+        Returns the first observations
+        """
+        if seed is None:
+            seeds = np.random.randint(0, 2 ** 31 - 1, size=self.num_envs)
+            self.next_seed = None
+        elif np.ndim(seed) == 0:
+            seeds = seed + np.arange(self.num_envs)
+            self.next_seed = seeds + self.num_envs
+        else:
+            seeds = np.asarray(seed, dtype=np.int64)
+            if len(seeds) != self.num_envs:
+                raise ValueError(f"Expected {self.num_envs} seeds, got {len(seeds)}")
+            self.next_seed = seeds + self.num_envs
+        for slot in range(self.num_envs):
+            self._reset_slot(slot, int(seeds[slot]))
+        return self.observe()
+
+    def _reset_slot(self, slot, seed):
+        self.seeds[slot] = seed
+        self.rngs[slot] = random.Random(seed)
+        self.y[slot] = SCREEN_HEIGHT // 2
+        self.velocity[slot] = 0.0
+        self.frames[slot] = 0
+        self.scores[slot] = 0
+        self.finished[slot] = False
+        self.gaps[slot, 0] = Pipe(self.rngs[slot]).gap_y
+
+    def observe(self):
+        """Return the current (N, 4) float32 observations"""
+        # Next pipe is the oldest one still ahead of the bird; one always exists
+        next_pipe = np.maximum(0, -((_NEXT_AGE_MAX - self.frames) // PIPE_SPAWN_INTERVAL))
+        pipe_x = SCREEN_WIDTH - PIPE_SPEED * (self.frames - next_pipe * PIPE_SPAWN_INTERVAL)
+        obs = np.empty((self.num_envs, 4), dtype=np.float32)
+        obs[:, 0] = self.y / 600
+        obs[:, 1] = self.velocity / 10
+        obs[:, 2] = pipe_x / 400
+        obs[:, 3] = self.gaps[np.arange(self.num_envs), next_pipe % GAP_RING] / 600
+        return obs
+
+    def step(self, actions):
+        """
+        Advance every unfinished slot one frame; a truthy action flaps
+        Returns (observations, rewards, dones, infos)
+        """
+        active = ~self.finished
+        flap = np.asarray(actions, dtype=bool) & active
+
+        # Bird physics
+        self.velocity[flap] = FLAP_POWER
+        self.velocity[active] += GRAVITY
+        self.y[active] += self.velocity[active]
+        ceiling = active & (self.y <= 0)
+        self.y[ceiling] = 0.0
+        self.velocity[ceiling] = 0.0
+        self.frames[active] += 1
+        grounded = active & (self.y >= SCREEN_HEIGHT - BIRD_HEIGHT)
+        self.y[grounded] = SCREEN_HEIGHT - BIRD_HEIGHT
+
+        # New pipe gaps, drawn from each slot's own RNG like FlappyBirdGame
+        spawning = np.flatnonzero(active & ~grounded & (self.frames % PIPE_SPAWN_INTERVAL == 0))
+        for slot in spawning:
+            index = self.frames[slot] // PIPE_SPAWN_INTERVAL
+            self.gaps[slot, index % GAP_RING] = Pipe(self.rngs[slot]).gap_y
+
+        # At most one pipe overlaps the bird horizontally at a time
+        hit_age = (self.frames - _HIT_AGE_MIN) % PIPE_SPAWN_INTERVAL + _HIT_AGE_MIN
+        hit_pipe = (self.frames - hit_age) // PIPE_SPAWN_INTERVAL
+        in_range = (hit_age <= _HIT_AGE_MAX) & (hit_pipe >= 0)
+        gap = self.gaps[np.arange(self.num_envs), hit_pipe % GAP_RING]
+        bird_top = self.y.astype(np.int64)
+        hit = active & ~grounded & in_range & (
+            (bird_top < gap) | (bird_top + BIRD_HEIGHT > gap + PIPE_GAP))
+
+        passed = active & ~grounded & ~hit & (self.frames >= _PASS_AGE) & (
+            (self.frames - _PASS_AGE) % PIPE_SPAWN_INTERVAL == 0)
+        self.scores[passed] += 1
+
+        dead = grounded | hit
+        dones = dead.copy()
+        if self.max_episode_frames is not None:
+            dones |= active & (self.frames >= self.max_episode_frames)
+
+        rewards = passed.astype(np.float32)
+        rewards[active & ~dead] += self.alive_reward
+        rewards[dead] -= self.death_penalty
+
+        infos = {
+            "final_score": np.where(dones, self.scores, 0),
+            "final_frames": np.where(dones, self.frames, 0),
+            "truncated": dones & ~dead
+        }
+
+        self.finished |= dones
+        if self.auto_reset:
+            for slot in np.flatnonzero(dones):
+                self._reset_slot(slot, self._next_episode_seed(slot))
+
+        return self.observe(), rewards, dones, infos
+
+    def _next_episode_seed(self, slot):
+        if self.next_seed is None:
+            return random.randrange(2 ** 31 - 1)
+        seed = int(self.next_seed[slot])
+        self.next_seed[slot] += self.num_envs
+        return seed
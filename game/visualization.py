@@ -3,8 +3,8 @@ import sys
 from flappy_bird import FlappyBirdGame, SCREEN_WIDTH, SCREEN_HEIGHT
 
 class FlappyBirdVisualization(FlappyBirdGame):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, dirty_rects=False):
+        super().__init__(dirty_rects=dirty_rects)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Flappy Bird AI Visualization")
         self.clock = pygame.time.Clock()
@@ -46,12 +46,12 @@ class FlappyBirdVisualization(FlappyBirdGame):
         
         # Rotate and draw bird
         rotated_bird = pygame.transform.rotate(bird_surface, -self.bird.rotation)
-        bird_rect = rotated_bird.get_rect(center=(self.bird.x + 15, self.bird.y + 15))
-        self.screen.blit(rotated_bird, bird_rect.topleft)
+        bird_rect = rotated_bird.get_rect(center=(self.bird.x + 15, self.render_y(self.bird) + 15))
+        return self.screen.blit(rotated_bird, bird_rect.topleft)
     
     def draw_pipe(self, pipe):
         """Draw a more detailed pipe with caps and textures"""
-        top_pipe, bottom_pipe = pipe.get_rects()
+        top_pipe, bottom_pipe = self.render_rects(pipe)
         
         # Draw pipe body with texture
         pygame.draw.rect(self.screen, pipe.top_pipe_color, top_pipe)
@@ -76,6 +76,8 @@ class FlappyBirdVisualization(FlappyBirdGame):
             pygame.draw.line(self.screen, (0, 80, 0), 
                             (bottom_pipe.x, bottom_pipe.y + i), 
                             (bottom_pipe.x + 50, bottom_pipe.y + i), 1)
+        
+        return top_pipe.union(bottom_pipe).inflate(6, 0)
     
     def draw_score(self):
         """Draw the score with enhanced styling"""
@@ -88,6 +90,7 @@ class FlappyBirdVisualization(FlappyBirdGame):
         score_rect = pygame.Rect(5, 5, score_text.get_width() + 10, score_text.get_height() + 10)
         pygame.draw.rect(self.screen, (0, 0, 0, 180), score_rect, 2)
         pygame.draw.rect(self.screen, (100, 100, 100, 100), score_rect, 1)
+        return score_rect.union((11, 11, shadow.get_width(), shadow.get_height()))
     
     def draw_game_over(self):
         """Draw an enhanced game over screen"""
@@ -138,5 +141,5 @@ class FlappyBirdVisualization(FlappyBirdGame):
 
 # For visualization
 if __name__ == "__main__":
-    game = FlappyBirdVisualization()
+    game = FlappyBirdVisualization(dirty_rects="--dirty-rects" in sys.argv)
     game.run()
\ No newline at end of file
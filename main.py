@@ -1,75 +1,24 @@
-import pygame
 import sys
 import os
-import torch
-import random
-from game.flappy_bird import FlappyBirdGame, Bird, Pipe, PIPE_GAP
-from ai.neural_network import NeuralNetwork
-from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm as GeneticAlgorithm
 
 # Ensure we can import from subdirectories
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def play_game_with_ai(network, render=False):
-    """
-    Play a game using the provided neural network
-    Returns the score achieved
-    """
-    game = FlappyBirdGame()
-    
-    # If rendering, we need to handle events differently
-    clock = None
-    if render:
-        game.screen = pygame.display.set_mode((400, 600))
-        clock = pygame.time.Clock()
-    
-    while not game.game_over:
-        # Get game state
-        bird_y = game.bird.y / 600  # Normalize
-        bird_velocity = game.bird.velocity / 10  # Normalize
-        
-        # Find the next pipe
-        next_pipe = None
-        for pipe in game.pipes:
-            if pipe.x + 50 > game.bird.x:  # Pipe width is 50
-                next_pipe = pipe
-                break
-        
-        if next_pipe:
-            pipe_x = next_pipe.x / 400  # Normalize
-            pipe_gap_y = next_pipe.gap_y / 600  # Normalize
-        else:
-            pipe_x = 1.0
-            pipe_gap_y = 0.5
-        
-        # Create state vector
-        state = [bird_y, bird_velocity, pipe_x, pipe_gap_y]
-        
-        # Get AI decision
-        flap_probability = network.predict(state)
-        
-        # Apply action based on probability
-        if flap_probability > 0.5:
-            game.bird.flap()
-        
-        # Update game
-        game.update()
-        
-        # Render if requested
-        if render and clock:
-            game.draw()
-            clock.tick(60)
-            
-            # Handle events for closing window
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return game.score
-    
-    return game.score
+# pygame, torch and the AI modules are imported inside the commands that use
+# them, so the usage message starts quickly
+
+def __getattr__(name):
+    """Keep play_game_with_ai importable from here without loading it eagerly"""
+    if name == "play_game_with_ai":
+        from ai.evaluation import play_game_with_ai
+        return play_game_with_ai
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def train_ai():
     """Train the AI using genetic algorithm"""
+    from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm as GeneticAlgorithm
+    from ai.evaluation import play_game_with_ai
+    
     print("Starting AI training...")
     
     # Create genetic algorithm
@@ -119,20 +68,25 @@ def train_ai():
     final_best.save(final_path)
     print(f"Final model saved to {final_path}")
 
-def play_with_ai(model_path):
-    """Play a game with a trained AI model"""
-    print(f"Loading model from {model_path}")
+def play_with_ai(model_path, dirty_rects=False, decision_interval=1):
+    """
+    Play a game with a trained AI model or a compiled decision table (.npz)
+    dirty_rects only repaints the screen regions that change each frame
+    decision_interval should match the interval the model was trained with
+    """
+    import pygame
+    from ai.evaluation import play_episode, load_policy
     
-    # Create network and load model
-    network = NeuralNetwork()
-    network.load(model_path)
+    print(f"Loading model from {model_path}")
+    network = load_policy(model_path)
     
     # Initialize pygame for rendering
     pygame.init()
     
     # Play game with rendering
-    score = play_game_with_ai(network, render=True)
-    print(f"Game ended with score: {score}")
+    game = play_episode(network, render=True, dirty_rects=dirty_rects, decision_interval=decision_interval)
+    print(f"Game ended with score: {game.score}")
+    print(f"Frame times: {game.frame_stats.overlay_text()}")
 
 def main():
     """Main function"""
@@ -140,7 +94,7 @@ def main():
         print("Usage:")
         print("  python main.py train          - Train the AI")
         print("  python main.py train-auto     - Auto train the AI with enhanced logging")
-        print("  python main.py play <model>   - Play with a trained model")
+        print("  python main.py play <model> [--dirty-rects] [--decision-interval K]  - Play with a trained model")
         return
     
     command = sys.argv[1]
@@ -156,7 +110,11 @@ def main():
             print("Please specify model path")
             return
         model_path = sys.argv[2]
-        play_with_ai(model_path)
+        interval = int(sys.argv[sys.argv.index("--decision-interval") + 1] if "--decision-interval" in sys.argv else 1)
+        if interval < 1:
+            print(f"--decision-interval must be at least 1, got {interval}")
+            return
+        play_with_ai(model_path, dirty_rects="--dirty-rects" in sys.argv[3:], decision_interval=interval)
     else:
         print(f"Unknown command: {command}")
 
@@ -6,6 +6,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Combined `python -X importtime` budget for importing main and auto_train
+IMPORT_TIME_BUDGET_MS = 150
+
 def test_game():
     """Test the game module"""
     print("Testing game module...")
@@ -50,6 +53,785 @@ def test_genetic_algorithm():
         print(f"✗ Genetic algorithm module test failed: {e}")
         return False
 
+def test_timestep():
+    """Test the fixed-timestep loop helpers and render interpolation"""
+    print("Testing fixed timestep...")
+    try:
+        import time
+        from game.timestep import FixedTimestep, FrameTimeStats
+        from game.flappy_bird import FlappyBirdGame
+        timestep = FixedTimestep(hz=60, max_frame_time=0.25)
+        assert timestep.advance() == 1
+        timestep.previous = time.perf_counter() - 0.1
+        assert timestep.advance() in (6, 7) and 0 <= timestep.alpha < 1
+        timestep.previous = time.perf_counter() - 10  # A long stall is clamped
+        assert timestep.advance() in (15, 16)
+        
+        stats = FrameTimeStats()
+        for ms in range(100):
+            stats.samples["update"].append(float(ms))
+        assert stats.summary()["update"] == {"p50": 50.0, "p99": 99.0}
+        
+        game = FlappyBirdGame(seed=0)
+        game.update()
+        game.interpolation = 0.0
+        assert game.render_y(game.bird) == game.bird.prev_y != game.bird.y
+        assert game.render_rects(game.pipes[0])[0].x == game.pipes[0].x + 3
+        print("✓ Fixed timestep works")
+        return True
+    except Exception as e:
+        print(f"✗ Fixed timestep test failed: {e}")
+        return False
+
+def test_dirty_rects():
+    """Test that dirty-rect drawing matches full repaints"""
+    print("Testing dirty-rect rendering...")
+    try:
+        import random
+        import pygame
+        from game.flappy_bird import FlappyBirdGame, SCREEN_WIDTH, SCREEN_HEIGHT
+        random.seed(1)
+        game = FlappyBirdGame(seed=0, dirty_rects=True)
+        random.seed(1)
+        reference = FlappyBirdGame(seed=0)  # The normal full draw() path
+        reference.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Full repaints draw new random grass every frame, so compare everything above it
+        # (grass blades are at most 15 px tall on the 20 px ground)
+        above_grass = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT - 40)
+        
+        def pixels(surface):
+            return pygame.image.tobytes(surface.subsurface(above_grass), "RGB")
+        
+        for frame in range(60):
+            if frame % 12 == 0:
+                game.bird.flap()
+                reference.bird.flap()
+            game.update()
+            reference.update()
+            game.draw()
+            reference.draw()
+            assert pixels(game.screen) == pixels(reference.screen), f"frame {frame} differs"
+        assert game.dirty and sum(r.w * r.h for r in game.dirty) < SCREEN_WIDTH * SCREEN_HEIGHT
+        
+        game.game_over = True
+        game.draw()
+        assert game.dirty is None  # Game over flips the whole screen
+        print("✓ Dirty-rect rendering works")
+        return True
+    except Exception as e:
+        print(f"✗ Dirty-rect rendering test failed: {e}")
+        return False
+
+def test_planner():
+    """Test game snapshots and the beam-search planner"""
+    print("Testing snapshot/restore and planner...")
+    try:
+        from game.flappy_bird import FlappyBirdGame, pipe_gap_sequence
+        from ai.planner import BeamSearchPlanner, play_planner
+        
+        planner = BeamSearchPlanner(beam_width=32, depth=50)
+        
+        def play(game, actions):
+            trace = []
+            for flap in actions:
+                if flap:
+                    game.bird.flap()
+                game.update()
+                trace.append((game.bird.y, game.score, [(p.x, p.gap_y) for p in game.pipes]))
+            return trace
+        
+        game = FlappyBirdGame(seed=3)
+        for _ in range(250):
+            if planner.plan(game.snapshot()):
+                game.bird.flap()
+            game.update()
+        state = game.snapshot()
+        copy = state.clone()
+        assert copy.values is not state.values and copy.frame_count == 250 and not game.game_over
+        first, gaps = state.pipe_gaps(300)
+        assert gaps == pipe_gap_sequence(3, first + len(gaps))[first:]
+        actions = [frame % 25 == 0 for frame in range(300)]
+        expected = play(game, actions)
+        state.copy_from(copy)
+        game.restore(state)
+        assert play(game, actions) == expected
+        
+        # Snapshot/restore loops reuse the state array and the game's pipe pool
+        values, pool = state.values, list(game.pipe_pool)
+        for _ in range(3):
+            game.restore(copy)
+            assert game.snapshot_into(state) is state and state.values is values
+            assert state.values == copy.values and state.rng_state == copy.rng_state
+            assert all(any(pipe is slot for slot in pool) for pipe in game.pipes)
+        assert play(game, actions) == expected
+        
+        game = play_planner(planner, seed=0, max_frames=600)
+        assert not game.game_over and game.score >= 5
+        assert planner.stats()["steps_per_decision"] > 1000
+        print(f"✓ Planner works (score {game.score}, {planner.stats()['steps_per_sec']:,.0f} steps/s)")
+        return True
+    except Exception as e:
+        print(f"✗ Planner test failed: {e}")
+        return False
+
+def test_decision_interval():
+    """Test that every evaluation path agrees on the decision interval"""
+    print("Testing decision interval...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.episode_kernel import run_episodes, NUMBA_AVAILABLE
+        from ai.evaluation import play_episode, compare_decision_intervals
+        
+        # Hand-built policy: flap whenever the bird is more than 80px below the top of the gap
+        weights = np.zeros(369, dtype=np.float32)
+        weights[0], weights[3], weights[64] = 600, -600, -80  # W1[0] and b1[0]
+        weights[80] = 1  # W2[0, 0]
+        weights[352], weights[368] = 1, -0.5  # W3[0, 0] and b3
+        network = NeuralNetwork()
+        network.set_flat_weights(weights)
+        
+        seeds = [0, 1, 2]
+        scores, frames, details = run_episodes([network], seeds, 600, use_numba=False, decision_interval=3,
+                                               details=True)
+        games = [play_episode(network, seed=seed, max_frames=600, decision_interval=3) for seed in seeds]
+        assert scores.tolist() == [[game.score for game in games]]
+        assert frames.tolist() == [[game.frame_count for game in games]]
+        assert scores.min() >= 5
+        if NUMBA_AVAILABLE:
+            jit = run_episodes([network], seeds, 600, use_numba=True, decision_interval=3, details=True)
+            assert (jit[0] == scores).all() and (jit[2]["flaps"] == details["flaps"]).all()
+        
+        results = compare_decision_intervals(network, intervals=(1, 4), seeds=seeds, max_frames=600)
+        assert results[0]["queries_per_episode"] == 600 and results[1]["queries_per_episode"] == 150
+        for bad in (0, -2, 1.5):
+            for call in (lambda: play_episode(network, seed=0, max_frames=10, decision_interval=bad),
+                         lambda: run_episodes([network], seeds, 10, use_numba=False, decision_interval=bad)):
+                try:
+                    call()
+                except ValueError:
+                    continue
+                raise AssertionError(f"decision_interval={bad} was accepted")
+        print("✓ Decision interval works")
+        return True
+    except Exception as e:
+        print(f"✗ Decision interval test failed: {e}")
+        return False
+
+def test_memory_tracker():
+    """Test memory tracking, allocation growth diffs and the RSS alarm"""
+    print("Testing memory tracker...")
+    try:
+        import json
+        import tempfile
+        from ai.instrumentation import MemoryTracker, rss_bytes
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracker = MemoryTracker(snapshot_every=1, alarm_mb=1, report_dir=tmpdir)
+            try:
+                first = tracker.check(1)
+                leak = [bytearray(1024) for _ in range(2000)]
+                second = tracker.check(2)
+            finally:
+                tracker.stop()
+            assert second["top_growth"][0]["site"].startswith(__file__)
+            assert second["top_growth"][0]["size_diff_kb"] >= 2000
+            if rss_bytes() is not None:
+                assert first["rss_mb"] > 1
+                # The alarm fires once when the threshold is crossed, not every generation
+                assert "alarm" in first and "alarm" not in second and len(tracker.reports) == 1
+                with open(first["alarm"]) as f:
+                    report = json.load(f)
+                assert report["generation"] == 1 and report["live_objects"]
+            del leak
+        print("✓ Memory tracker works")
+        return True
+    except Exception as e:
+        print(f"✗ Memory tracker test failed: {e}")
+        return False
+
+def test_early_stopping():
+    """Test plateau and budget stopping, and resuming a stopped run from its saved state"""
+    print("Testing early stopping...")
+    try:
+        import json
+        import tempfile
+        import contextlib
+        import io
+        from ai.early_stopping import StoppingCriteria, budget_share
+        from auto_train import auto_train_ai
+        criteria = StoppingCriteria(patience=2, min_delta=0.5)
+        # The best improves only by less than min_delta, so only the mean counts
+        assert criteria.update(1, 0.5) is None and criteria.update(1.2, 1.2) is None
+        assert criteria.update(1.4, 1.3) is None and criteria.update(1.5, 1.4) == "plateau"
+        assert not criteria.improving
+        criteria = StoppingCriteria(frame_budget=100)
+        assert criteria.update(1, 1, 60) is None and criteria.update(2, 2, 60) == "frame_budget"
+        assert criteria.improving
+        assert budget_share(None, 5, 2) is None and budget_share(100, 40, 3) == 20
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.chdir(tmpdir)
+            try:
+                stopping = StoppingCriteria(frame_budget=3000)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, best = auto_train_ai(generations=50, population_size=6, eval_seeds=range(2),
+                                            max_frames=500, use_kernel=True, stopping=stopping)
+                with open("training_log.json") as f:
+                    log = json.load(f)
+                assert log["stop_reason"] == "frame_budget" and len(log["generations"]) < 50
+                assert log["stopping"]["frames"] >= 3000
+
+                resumed = StoppingCriteria(patience=1)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, resumed_best = auto_train_ai(generations=50, population_size=6, eval_seeds=range(2),
+                                                    max_frames=500, use_kernel=True, stopping=resumed,
+                                                    log_file="resumed.json", resume_state=log["state_file"])
+                with open("resumed.json") as f:
+                    resumed_log = json.load(f)
+                assert resumed_log["stop_reason"] == "plateau"
+                assert resumed_best >= best
+                # The resumed run carries on the first run's generation numbers
+                last = log["generations"][-1]["generation"]
+                assert resumed_log["generations"][0]["generation"] == last + 1
+            finally:
+                os.chdir(cwd)
+        print("✓ Early stopping works")
+        return True
+    except Exception as e:
+        print(f"✗ Early stopping test failed: {e}")
+        return False
+
+def test_fitness_cache():
+    """Test the fitness cache"""
+    print("Testing fitness cache module...")
+    try:
+        from ai.neural_network import NeuralNetwork
+        from ai.fitness_cache import FitnessCache, genome_hash
+        net = NeuralNetwork()
+        cache = FitnessCache(max_size=1)
+        key = genome_hash(net)
+        cache.store(key, {1: 5, 2: 7})
+        known, missing = cache.lookup(key, [1, 2, 3])
+        assert known == {1: 5, 2: 7} and missing == [3]
+        cache.store(genome_hash(NeuralNetwork()), {1: 0})
+        assert cache.lookup(key, [1])[1] == [1]  # Evicted
+        print("✓ Fitness cache works")
+        print(f"  Stats: {cache.stats()}")
+        return True
+    except Exception as e:
+        print(f"✗ Fitness cache test failed: {e}")
+        return False
+
+def test_racing():
+    """Test the racing evaluator"""
+    print("Testing racing evaluator module...")
+    try:
+        from ai.racing import RacingEvaluator
+        # Stand-in episodes: a "network" is just its score, and every game lasts 10 frames
+        racing = RacingEvaluator(lambda net, seed: (net, 10), seeds=list(range(8)),
+                                 rounds=(1, 2), keep_fraction=0.5)
+        waiting = []
+        fitness = racing.evaluate([1, 4, 2, 3], progress=waiting.append)
+        assert fitness == [1, 4, 2, 3]
+        assert waiting == [2, 1, 0]  # Two cut after round one, one after round two, then the finalist
+        stats = racing.last_stats
+        assert stats["episodes"] == 4 + 2 + 6 and stats["finalists"] == 1
+        assert stats["frames_saved"] == (32 - 12) * 10
+        
+        # B is cut after A's lucky first seed, so it must rank below A whatever its mean
+        table = {"A": [10, 1, 1], "B": [9, 9, 9]}
+        racing = RacingEvaluator(lambda net, seed: (table[net][seed], 10), seeds=[0, 1, 2],
+                                 rounds=(1, 3), keep_fraction=0.5)
+        fitness = racing.evaluate(["A", "B"])
+        assert fitness[0] == 4.0 and fitness[1] < fitness[0]
+        print("✓ Racing evaluator works")
+        print(f"  Stats: {stats}")
+        return True
+    except Exception as e:
+        print(f"✗ Racing evaluator test failed: {e}")
+        return False
+
+def test_benchmark_compare():
+    """Test regression detection between two benchmark reports"""
+    print("Testing benchmark comparison...")
+    try:
+        import json
+        # benchmark sets SDL_VIDEODRIVER=dummy on import; keep the other tests' environment as it was
+        videodriver = os.environ.get("SDL_VIDEODRIVER")
+        from benchmark import compare_reports
+        if videodriver is None:
+            os.environ.pop("SDL_VIDEODRIVER", None)
+        
+        def report(**values):
+            return json.loads(json.dumps({"results": {
+                name: {"value": value, "unit": "ms" if name.endswith("_ms") else "frames/s",
+                       "higher_is_better": not name.endswith("_ms")}
+                for name, value in values.items()}}))
+        
+        baseline = report(slower_fps=100.0, slightly_slower_fps=100.0, edge_fps=100.0, faster_fps=100.0,
+                          slower_ms=10.0, faster_ms=10.0, removed_fps=50.0)
+        current = report(slower_fps=85.0, slightly_slower_fps=95.0, edge_fps=90.0, faster_fps=150.0,
+                         slower_ms=12.0, faster_ms=5.0)
+        rows = {row[0]: row for row in compare_reports(baseline, current)}
+        assert "removed_fps" not in rows  # Benchmarks missing from the current run are skipped
+        regressed = sorted(name for name, row in rows.items() if row[4])
+        # Lower throughput and higher times are regressions, but only beyond 10%
+        assert regressed == ["slower_fps", "slower_ms"]
+        assert rows["slower_fps"][3] == -0.15 and rows["faster_ms"][3] == -0.5
+        assert [row[0] for row in compare_reports(baseline, current, threshold=0.01) if row[4]] == \
+            ["slower_fps", "slightly_slower_fps", "edge_fps", "slower_ms"]
+        print("✓ Benchmark comparison works")
+        return True
+    except Exception as e:
+        print(f"✗ Benchmark comparison test failed: {e}")
+        return False
+
+def test_metrics_server():
+    """Test the Prometheus-style metrics endpoint"""
+    print("Testing metrics server...")
+    try:
+        import urllib.request
+        import urllib.error
+        from ai.metrics_server import MetricsServer
+        server = MetricsServer(port=0)
+        port = server.start()
+        try:
+            assert port != 0
+            server.update(generation=3, best_fitness=12.5, evaluation_queue_depth=7)
+            server.set("evaluation_queue_depth", 2)
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                text = response.read().decode()
+            assert "# TYPE flappy_generation gauge" in text and "# HELP flappy_best_fitness " in text
+            samples = dict(line.split() for line in text.splitlines() if not line.startswith("#"))
+            assert samples == {"flappy_generation": "3.0", "flappy_best_fitness": "12.5",
+                               "flappy_evaluation_queue_depth": "2.0"}
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+                assert False, "unknown paths should 404"
+            except urllib.error.HTTPError as e:
+                assert e.code == 404
+        finally:
+            server.stop()
+        assert server.server is None
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5)
+            assert False, "server still answering after stop()"
+        except urllib.error.URLError:
+            pass
+        print("✓ Metrics server works")
+        return True
+    except Exception as e:
+        print(f"✗ Metrics server test failed: {e}")
+        return False
+
+def test_instrumentation():
+    """Test the training instrumentation"""
+    print("Testing instrumentation module...")
+    try:
+        from ai.instrumentation import Instrumentation
+        disabled = Instrumentation()
+        with disabled.phase("selection"):
+            disabled.count("frames", 10)
+        assert disabled.report() == {"timers_ms": {}, "counters": {"frames": 10}}
+        enabled = Instrumentation(enabled=True)
+        with enabled.phase("selection"):
+            enabled.count("frames", 10)
+        report = enabled.report()
+        assert "selection" in report["timers_ms"] and report["counters"]["frames"] == 10
+        # Nested phases are reported under their parent instead of being counted twice
+        enabled.reset()
+        with enabled.phase("evolve"):
+            with enabled.phase("selection"):
+                enabled.add_time("inference", 0.5)
+        assert sorted(enabled.report()["timers_ms"]) == ["evolve", "evolve/selection", "evolve/selection/inference"]
+        assert enabled.open_phases == []
+        print("✓ Instrumentation works")
+        print(f"  Report: {report}")
+        return True
+    except Exception as e:
+        print(f"✗ Instrumentation test failed: {e}")
+        return False
+
+def test_episode_kernel():
+    """Test that the batched episode kernel matches the game loop"""
+    print("Testing episode kernel module...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.episode_kernel import run_episodes, NUMBA_AVAILABLE
+        from ai.evaluation import play_episode
+        
+        # Hand-built network that flaps when the bird drops below the gap, so
+        # episodes pass pipes and exercise scoring, plus noisy variants of it
+        rng = np.random.RandomState(0)
+        W1 = np.zeros((16, 4)); W1[0] = [1, 0.05, 0, -1]
+        b1 = np.zeros(16); b1[0] = 0.38
+        W2 = np.zeros((16, 16)); W2[0, 0] = 1
+        W3 = np.zeros((1, 16)); W3[0, 0] = 40
+        base = np.concatenate([W1.ravel(), b1, W2.ravel(), np.zeros(16), W3.ravel(), [-20.0]])
+        networks = []
+        for noise in (0.0, 0.01, 0.1, 1.0):
+            network = NeuralNetwork()
+            network.set_flat_weights(base + rng.randn(base.size) * noise)
+            networks.append(network)
+        
+        seeds, max_frames = [0, 1], 2000
+        expected = [[(game.score, game.frame_count) for game in
+                     (play_episode(network, seed=seed, max_frames=max_frames) for seed in seeds)]
+                    for network in networks]
+        paths = [False, True] if NUMBA_AVAILABLE else [False]
+        for use_numba in paths:
+            scores, frames = run_episodes(networks, seeds, max_frames, use_numba=use_numba)
+            assert np.array_equal(np.stack([scores, frames], axis=-1), np.array(expected))
+        print(f"✓ Episode kernel matches the game loop (numba={NUMBA_AVAILABLE})")
+        print(f"  Scores: {[[score for score, _ in row] for row in expected]}")
+        return True
+    except Exception as e:
+        print(f"✗ Episode kernel test failed: {e}")
+        return False
+
+def test_vector_env():
+    """Test that the vectorized environment matches the game loop"""
+    print("Testing vector environment module...")
+    try:
+        import numpy as np
+        from game.vector_env import VectorFlappyBirdEnv
+        from ai.evaluation import play_episode
+        
+        class GapFollower:
+            """Flaps whenever the bird is below the top of the gap"""
+            def predict(self, state):
+                return 1.0 if state[0] > state[3] + 0.1 else 0.0
+        
+        seeds = [3, 4, 5]
+        expected = [play_episode(GapFollower(), seed=seed, max_frames=1500) for seed in seeds]
+        env = VectorFlappyBirdEnv(len(seeds), auto_reset=False, max_episode_frames=1500)
+        obs = env.reset(seeds)
+        while not env.finished.all():
+            obs, rewards, dones, infos = env.step(obs[:, 0] > obs[:, 3] + 0.1)
+        assert env.scores.tolist() == [game.score for game in expected]
+        assert env.frames.tolist() == [game.frame_count for game in expected]
+        
+        env = VectorFlappyBirdEnv(4)
+        env.reset(0)
+        for _ in range(200):
+            obs, rewards, dones, infos = env.step(np.zeros(4))  # Never flap: all die and reset
+        assert obs.shape == (4, 4) and not env.finished.any()
+        print("✓ Vector environment matches the game loop")
+        print(f"  Scores: {[game.score for game in expected]}")
+        return True
+    except Exception as e:
+        print(f"✗ Vector environment test failed: {e}")
+        return False
+
+def test_decision_table():
+    """Test compiling a network into a decision table"""
+    print("Testing decision table module...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.decision_table import DecisionTable
+        net = NeuralNetwork()
+        table = DecisionTable.from_network(net, bins=(8, 8, 8, 8))
+        assert table.memory_bytes() == 8 ** 4 // 8
+        # Cell centres are exactly where the network was sampled
+        centres = table.low + (np.array([[1, 2, 3, 4], [7, 0, 5, 6]]) + 0.5) * (table.high - table.low) / 8
+        assert table.measure_disagreement(net, centres) == 0.0
+        print("✓ Decision table compiled successfully")
+        print(f"  Prediction: {table.predict(centres[0])}")
+        return True
+    except Exception as e:
+        print(f"✗ Decision table test failed: {e}")
+        return False
+
+def test_quantization():
+    """Test quantized population storage"""
+    print("Testing quantization module...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.quantization import QuantizedPopulation, check_fitness_tolerance
+        from ai.episode_kernel import run_episodes
+        networks = [NeuralNetwork() for _ in range(3)]
+        weights = np.stack([network.get_flat_weights() for network in networks])
+        for dtype, max_error in (("float16", 1e-3), ("int8", 1e-2)):
+            population = QuantizedPopulation(weights, dtype)
+            assert np.abs(population.dequantize() - weights).max() < max_error
+            print(f"  {dtype}: {population.bytes_per_genome()} bytes per genome")
+        
+        # Hand-built policy that passes pipes, so quantization error could show up in scores
+        policy = np.zeros(369, dtype=np.float32)
+        policy[0], policy[3], policy[64] = 600, -600, -80
+        policy[80] = 1
+        policy[352], policy[368] = 1, -0.5
+        networks[0].set_flat_weights(policy)
+        report = check_fitness_tolerance(networks, [0, 1], 1500, "int8", tolerance=0.5)
+        assert report["within_tolerance"] and report["max_deviation"] <= 0.5
+        assert report["bytes_per_genome"] < report["float32_bytes_per_genome"] / 3
+        exact = QuantizedPopulation.from_networks(networks, "float32").evaluate([0, 1], 1500)
+        assert exact[0] > 0 and report["mean_deviation"] >= 0
+        # A negative tolerance can never be met
+        assert not check_fitness_tolerance(networks, [0], 1500, "int8", tolerance=-1)["within_tolerance"]
+        
+        # Chunked runs match one kernel call over the whole population
+        population = QuantizedPopulation(np.stack([n.get_flat_weights() for n in networks]), "float16")
+        chunked = population.run([0, 1], 1500, chunk_size=2, details=True)
+        whole = run_episodes(population.dequantize(), [0, 1], 1500, details=True)
+        assert all(np.array_equal(a, b) for a, b in zip(chunked[:2], whole[:2]))
+        assert np.array_equal(chunked[2]["flaps"], whole[2]["flaps"])
+        print("✓ Quantized populations work")
+        return True
+    except Exception as e:
+        print(f"✗ Quantization test failed: {e}")
+        return False
+
+def test_evolution_strategies():
+    """Test the ES optimizer and its shared noise table"""
+    print("Testing evolution strategies module...")
+    try:
+        import numpy as np
+        from ai.evolution_strategies import ParallelES, SharedNoiseTable, centered_ranks
+        ranks = centered_ranks([3.0, 1.0, 1.0, 2.0])
+        assert np.allclose(ranks, [0.5, -0.5 + 1 / 6, -0.5 + 1 / 6, 1 / 6])
+        
+        noise = SharedNoiseTable(1000, seed=0)
+        attached = SharedNoiseTable(spec=noise.spec())
+        assert np.array_equal(attached.get(10, 5), noise.get(10, 5))
+        attached.close()
+        noise.close()
+        
+        es = ParallelES(pairs=4, workers=0, seeds=[0], max_frames=200, noise_size=10000)
+        theta = es.es.theta.copy()
+        stats = es.step()
+        es.close()
+        assert stats["generation"] == 1
+        assert not np.array_equal(theta, es.es.theta)
+        
+        # Worker processes must match the in-process run: from the second generation on their
+        # fitness is only right if each worker applied the same (offset, weight) updates to its theta
+        runs = []
+        for workers in (0, 2):
+            es = ParallelES(pairs=4, workers=workers, seeds=[0], max_frames=200, noise_size=10000, theta=theta)
+            processes = list(es.processes)
+            try:
+                runs.append(([es.step() for _ in range(3)], es.es.theta.copy()))
+            finally:
+                es.close()
+            assert len(processes) == workers and not any(process.is_alive() for process in processes)
+        assert runs[0][0] == runs[1][0] and np.array_equal(runs[0][1], runs[1][1])
+        print("✓ Evolution strategies work")
+        return True
+    except Exception as e:
+        print(f"✗ Evolution strategies test failed: {e}")
+        return False
+
+def test_steady_state():
+    """Test steady-state breeding and the asynchronous runner"""
+    print("Testing steady-state GA...")
+    try:
+        from game.flappy_bird import FlappyBirdGame
+        from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm
+        from ai.steady_state import SteadyStateRunner
+        ga = EnhancedGeneticAlgorithm(population_size=4, elite_size=1)
+        ga.set_fitness_scores([3, 1, 2, 5])
+        child = ga.breed_child()
+        assert ga.replace_worst(child, 4) == 1
+        assert ga.fitness_scores == [3, 4, 2, 5]
+        
+        # A game in the parent used to deadlock forked workers in pygame.init
+        FlappyBirdGame(seed=1)
+        runner = SteadyStateRunner(EnhancedGeneticAlgorithm(population_size=4), workers=2,
+                                   seeds=[0], max_frames=200)
+        stats = runner.run(10)
+        assert stats["evaluations"] == 10 and len(runner.ga.population) == 4
+        print(f"✓ Steady-state GA works ({stats['evaluations_per_second']:.0f} evals/s)")
+        return True
+    except Exception as e:
+        print(f"✗ Steady-state test failed: {e}")
+        return False
+
+def test_tournament():
+    """Test ranking checkpoints into a leaderboard"""
+    print("Testing checkpoint tournament...")
+    try:
+        import json
+        import tempfile
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.tournament import find_checkpoints, load_flat_weights, run_tournament
+        with tempfile.TemporaryDirectory() as directory:
+            network = NeuralNetwork()
+            network.save(os.path.join(directory, "a.pth"))
+            NeuralNetwork().save(os.path.join(directory, "b.pth"))
+            with open(os.path.join(directory, "broken.pth"), 'w') as f:
+                f.write("not a checkpoint")
+            assert np.array_equal(load_flat_weights(os.path.join(directory, "a.pth")),
+                                  network.get_flat_weights())
+            
+            output = os.path.join(directory, "leaderboard.json")
+            entries = run_tournament(find_checkpoints(directory), seeds=range(3), max_frames=500,
+                                     output=output, workers=1)
+            with open(output) as f:
+                leaderboard = json.load(f)
+            assert len(entries) == 2 and leaderboard["evaluated"] == 2
+            assert list(leaderboard["errors"]) == [os.path.join(directory, "broken.pth")]
+            assert entries[0]["mean"] >= entries[1]["mean"] and "p90" in entries[0]
+        print("✓ Checkpoint tournament works")
+        return True
+    except Exception as e:
+        print(f"✗ Tournament test failed: {e}")
+        return False
+
+def test_recorder():
+    """Test offscreen frame export"""
+    print("Testing frame recorder...")
+    try:
+        import tempfile
+        import pygame
+        from game.recorder import FrameRecorder, Image
+        surface = pygame.Surface((40, 60))
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = FrameRecorder(os.path.join(directory, "frames"), frame_skip=2, queue_size=2)
+            for shade in range(0, 250, 25):
+                surface.fill((shade, 0, 0))
+                recorder.add_frame(surface)
+            assert recorder.close() == 5
+            assert len(os.listdir(os.path.join(directory, "frames"))) == 5
+            
+            if Image is not None:
+                gif_path = os.path.join(directory, "clip.gif")
+                recorder = FrameRecorder(gif_path, frame_skip=1, scale=0.5, queue_size=2)
+                for shade in range(0, 250, 50):
+                    surface.fill((0, shade, 0))
+                    recorder.add_frame(surface)
+                # Frames are written as they are encoded, not buffered until close()
+                recorder.queue.join()
+                streamed = os.path.getsize(gif_path)
+                assert recorder.frames_written == 5 and streamed > 5 * 20 * 30 // 8
+                recorder.close()
+                assert os.path.getsize(gif_path) == streamed + 1  # Only the trailer is left
+                with Image.open(gif_path) as gif:
+                    assert gif.n_frames == 5 and gif.info["loop"] == 0
+                    gif.seek(4)
+                    assert gif.convert("RGB").getpixel((5, 5)) == (0, 200, 0)
+            else:
+                print("  Pillow not installed, skipping GIF export")
+        print("✓ Frame recorder works")
+        return True
+    except Exception as e:
+        print(f"✗ Frame recorder test failed: {e}")
+        return False
+
+def test_shared_population():
+    """Test shared-memory population evaluation on worker processes"""
+    print("Testing shared population evaluator...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.episode_kernel import run_episodes
+        from ai.shared_population import SharedPopulationEvaluator
+        weights = np.stack([NeuralNetwork().get_flat_weights() for _ in range(5)])
+        weights[:, -1] += np.linspace(-3, 3, 5)  # Mix of flapping and falling birds
+        expected, _ = run_episodes(weights, [0, 1], 300)
+        
+        evaluator = SharedPopulationEvaluator(5, weights.shape[1], workers=2, seeds=[0, 1], max_frames=300,
+                                              use_kernel=True)
+        try:
+            fitness, frames = evaluator.evaluate(weights)
+            assert np.array_equal(fitness, expected.mean(axis=1)) and frames.min() > 0
+            fitness, _ = evaluator.evaluate(weights[::-1])
+            assert np.array_equal(fitness, expected.mean(axis=1)[::-1])
+        finally:
+            evaluator.close()
+        
+        # Non-kernel path, with a game already created in the parent (forked
+        # workers used to deadlock in pygame.init)
+        from game.flappy_bird import FlappyBirdGame
+        FlappyBirdGame(seed=0)
+        evaluator = SharedPopulationEvaluator(4, weights.shape[1], workers=2, seeds=[0], max_frames=300)
+        try:
+            fitness, frames = evaluator.evaluate(weights[:4])
+            assert np.array_equal(fitness, expected[:4, 0]) and frames.min() > 0
+        finally:
+            evaluator.close()
+        print("✓ Shared population evaluator works")
+        return True
+    except Exception as e:
+        print(f"✗ Shared population test failed: {e}")
+        return False
+
+def test_novelty():
+    """Test the novelty archive and its grid index"""
+    print("Testing novelty archive...")
+    try:
+        import numpy as np
+        from ai.neural_network import NeuralNetwork
+        from ai.episode_kernel import run_episodes
+        from ai.novelty import GridIndex, NoveltyArchive, behavior_descriptors
+        rng = np.random.default_rng(0)
+        points = np.concatenate([rng.random((2000, 3)), rng.normal(0.3, 0.02, (2000, 3)).clip(0, 1)])
+        index = GridIndex(3, cell_size=0.1, cell_capacity=10 ** 6)
+        for point in points:
+            index.add(point)
+        for query in rng.random((20, 3)):
+            brute = np.sort(np.linalg.norm(points - query, axis=1))[:5]
+            assert np.allclose(index.knn_distances(query, 5), brute)
+        
+        _, frames, details = run_episodes([NeuralNetwork() for _ in range(4)], [0, 1], 300, details=True)
+        descriptors = behavior_descriptors(frames, details, 300)
+        assert descriptors.shape == (4, 3) and (descriptors >= 0).all() and (descriptors <= 1).all()
+        
+        archive = NoveltyArchive(k=3)
+        archive.add(np.full((10, 3), 0.2))
+        novelty = archive.novelty([[0.2, 0.2, 0.2], [0.9, 0.9, 0.9]])
+        assert novelty[0] == 0 and novelty[1] > 1
+        print("✓ Novelty archive works")
+        return True
+    except Exception as e:
+        print(f"✗ Novelty test failed: {e}")
+        return False
+
+def test_surrogate():
+    """Test surrogate fitness models and offspring screening"""
+    print("Testing surrogate screening...")
+    try:
+        import numpy as np
+        from ai.enhanced_genetic_algorithm import EnhancedGeneticAlgorithm
+        from ai.surrogate import KNNSurrogate, RidgeSurrogate, prediction_accuracy
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 10))
+        y = X @ rng.normal(size=10)
+        for model in (KNNSurrogate(min_samples=100), RidgeSurrogate(min_samples=100)):
+            model.add(X[:50], y[:50])
+            assert not model.ready
+            model.add(X[50:], y[50:])
+            accuracy = prediction_accuracy(model.predict(X[:20]), y[:20])
+            assert accuracy["correlation"] > 0.9
+        
+        surrogate = KNNSurrogate(min_samples=1)
+        ga = EnhancedGeneticAlgorithm(population_size=10, elite_size=2, surrogate=surrogate, simulate_fraction=0.5)
+        surrogate.add([network.get_flat_weights() for network in ga.population], list(range(10)))
+        ga.set_fitness_scores(list(range(10)))
+        ga.evolve()
+        # The same 8 children are bred as without a surrogate; only half of them are simulated
+        assert len(ga.population) == 10
+        stats = dict(ga.screening_stats)
+        assert stats.pop("screening_ms") >= 0
+        assert stats == {"children": 8, "simulated": 4, "simulations_avoided": 4}
+        assert ga.predicted_fitness[:2] == [None, None] and None not in ga.predicted_fitness[2:]
+        simulate = ga.simulate_indices()
+        assert len(simulate) == 6 and simulate[:2] == [0, 1] and not set(simulate) & set(ga.skipped)
+        # Skipped children never outrank a simulated genome
+        merged = ga.merge_scores([5.0] * 6)
+        assert all(merged[i] <= 5.0 and merged[i] == min(ga.predicted_fitness[i], 5.0) for i in ga.skipped)
+        print("✓ Surrogate screening works")
+        return True
+    except Exception as e:
+        print(f"✗ Surrogate test failed: {e}")
+        return False
+
 def test_main():
     """Test the main module"""
     print("Testing main module...")
@@ -67,11 +849,45 @@ def test_auto_train():
     try:
         import auto_train
         print("✓ Auto train module imported successfully")
+        # Evaluation options that would silently bypass each other are rejected up front
+        for options in ({"racing_rounds": (1,)}, {"fitness_cache_size": 100}):
+            try:
+                auto_train.auto_train_ai(generations=1, eval_seeds=range(3), max_frames=100, use_kernel=True,
+                                         **options)
+                assert False, f"use_kernel accepted {options}"
+            except ValueError as e:
+                assert "use_kernel" in str(e)
         return True
     except Exception as e:
         print(f"✗ Auto train module test failed: {e}")
         return False
 
+def test_import_time():
+    """Test that the CLI entry points import quickly and without heavy dependencies"""
+    print("Testing entry point import time...")
+    try:
+        import subprocess
+        code = ("import sys, main, auto_train; "
+                "print(','.join(m for m in ('torch', 'pygame', 'numpy') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert result.stdout.strip() == "", f"Heavy modules imported eagerly: {result.stdout.strip()}"
+        
+        # Lines look like "import time: self_us | cumulative_us | package"
+        total_us = 0
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() in ("main", "auto_train"):
+                total_us += int(fields[1])
+        assert total_us / 1000 < IMPORT_TIME_BUDGET_MS, \
+            f"Import took {total_us / 1000:.1f}ms, budget is {IMPORT_TIME_BUDGET_MS}ms"
+        print(f"✓ Entry points import in {total_us / 1000:.1f}ms")
+        return True
+    except Exception as e:
+        print(f"✗ Import time test failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("Running Flappy Bird AI component tests...\n")
@@ -80,8 +896,31 @@ def main():
         test_game,
         test_neural_network,
         test_genetic_algorithm,
+        test_timestep,
+        test_dirty_rects,
+        test_planner,
+        test_decision_interval,
+        test_memory_tracker,
+        test_early_stopping,
+        test_fitness_cache,
+        test_racing,
+        test_benchmark_compare,
+        test_metrics_server,
+        test_instrumentation,
+        test_episode_kernel,
+        test_vector_env,
+        test_decision_table,
+        test_quantization,
+        test_evolution_strategies,
+        test_steady_state,
+        test_tournament,
+        test_recorder,
+        test_shared_population,
+        test_novelty,
+        test_surrogate,
         test_main,
-        test_auto_train
+        test_auto_train,
+        test_import_time
     ]
     
     passed = 0